@@ -0,0 +1,336 @@
+"""
+AgriData Explorer - Analytics HTTP Service
+File: analysis/analytics_service.py
+Purpose: Read-only JSON API over the memory-resident cleaned dataset, with a
+         TTL/LRU response cache, ETags and latency metrics
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from caching import LRUCache
+from query_layer import AgriQueries
+from ranking import top_n
+
+# analysis_queries.sql question -> AgriQueries method
+QUERY_ENDPOINTS = {
+    'q1': 'rice_top_states_by_year',
+    'q2': 'wheat_yield_increase_districts',
+    'q3': 'oilseed_growth_states',
+    'q4': 'area_production_by_district',
+    'q5': 'cotton_yoy_growth',
+    'q6': 'groundnut_top_districts',
+    'q7': 'maize_yield_by_state_year',
+    'q7_national': 'maize_yield_national',
+    'q8': 'oilseed_area_by_state',
+    'q9': 'rice_yield_top_districts',
+    'q10': 'rice_vs_wheat_top_states',
+    'top_states_by_crop': 'top_states_by_crop',
+}
+
+# eda_* chart -> (group keys, columns, aggfunc, filter, top n)
+EDA_ENDPOINTS = {
+    'eda_1': ('state_name', 'rice_production_1000_tons', 'sum', None, 7),
+    'eda_2': ('state_name', 'wheat_production_1000_tons', 'sum', None, 5),
+    'eda_3': ('state_name', 'oilseeds_production_1000_tons', 'sum', None, 5),
+    'eda_4': ('state_name', 'sunflower_production_1000_tons', 'sum', None, 7),
+    'eda_5': ('year', 'sugarcane_production_1000_tons', 'sum', None, None),
+    'eda_6': ('year', ['rice_production_1000_tons', 'wheat_production_1000_tons'],
+              'sum', None, None),
+    'eda_7': ('district_name', 'rice_production_1000_tons', 'sum',
+              {'state_name': 'West Bengal'}, 10),
+    'eda_8': ('year', 'wheat_production_1000_tons', 'sum',
+              {'state_name': 'Uttar Pradesh'}, 10),
+    'eda_9': ('year', ['pearl_millet_production_1000_tons',
+                       'finger_millet_production_1000_tons'], 'sum', None, None),
+    'eda_10': ('state_name', 'sorghum_production_1000_tons', 'sum', None, 8),
+    'eda_11': ('state_name', 'groundnut_production_1000_tons', 'sum', None, 7),
+    'eda_15': ('state_name', ['rice_yield_kg_per_ha', 'wheat_yield_kg_per_ha'],
+               'mean', None, None),
+}
+
+# Aggregations /aggregate accepts for its agg parameter
+AGGREGATE_FUNCS = ('sum', 'count', 'mean', 'median', 'min', 'max', 'std')
+
+# Latency bucket for every path that matches no route
+UNMATCHED_ROUTE = 'unmatched'
+
+STATUS_TEXT = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    """Error with an HTTP status, reported to the client as JSON"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _param(value):
+    """Coerce a query-string value to int/float where it looks numeric"""
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def route_name(path):
+    """Route a request path belongs to, so latency is kept per route, not per URL"""
+    path = path.rstrip('/') or '/'
+    if path in ('/health', '/queries', '/eda', '/aggregate', '/metrics'):
+        return path
+    parts = [p for p in path.split('/') if p]
+    if len(parts) == 2 and parts[1] in {'queries': QUERY_ENDPOINTS,
+                                        'eda': EDA_ENDPOINTS}.get(parts[0], ()):
+        return path
+    return UNMATCHED_ROUTE
+
+
+def to_json(result):
+    """Serialize a query result (frame, series or dict) to JSON bytes"""
+    if isinstance(result, pd.Series):
+        result = result.reset_index()
+    if isinstance(result, pd.DataFrame):
+        return result.to_json(orient='records').encode()
+    return json.dumps(result, default=float).encode()
+
+
+class ResponseCache:
+    """LRU response cache bounded by bytes, with a per-entry time-to-live"""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, ttl=300):
+        self.ttl = ttl
+        self.lru = LRUCache(max_bytes)
+        self.expired = 0
+
+    def get(self, key):
+        entry = self.lru.get(key)
+        if entry is None:
+            return None
+        expires_at, body, etag = entry
+        if time.monotonic() >= expires_at:
+            self.lru.pop(key)
+            self.expired += 1
+            return None
+        return body, etag
+
+    def put(self, key, body):
+        etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self.lru.put(key, (time.monotonic() + self.ttl, body, etag), len(body) + len(etag))
+        return body, etag
+
+    def stats(self):
+        return dict(self.lru.stats(), expired=self.expired, ttl_seconds=self.ttl)
+
+
+class LatencyRecorder:
+    """Rolling window of request latencies per route (see route_name)"""
+
+    def __init__(self, window=10000):
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self.counts = defaultdict(int)
+
+    def record(self, route, seconds):
+        self.samples[route].append(seconds)
+        self.samples['*'].append(seconds)
+        self.counts[route] += 1
+        self.counts['*'] += 1
+
+    def summary(self):
+        report = {}
+        for route, samples in self.samples.items():
+            values = np.fromiter(samples, dtype=np.float64) * 1000
+            report[route] = {
+                'requests': self.counts[route],
+                'p50_ms': round(float(np.percentile(values, 50)), 4),
+                'p99_ms': round(float(np.percentile(values, 99)), 4),
+                'max_ms': round(float(values.max()), 4),
+            }
+        return report
+
+
+class AnalyticsService:
+    """Serve analysis_queries.sql answers and eda_* aggregations as JSON
+
+    Routes (GET only):
+        /health                     liveness and dataset shape
+        /queries                    available query endpoints
+        /queries/<name>?param=...   e.g. /queries/q6?year=2015&n=10
+        /eda                        available EDA aggregations
+        /eda/<name>                 e.g. /eda/eda_7
+        /aggregate?by=...&column=...&agg=sum&n=...&<filter column>=<value>
+        /metrics                    p50/p99 latency and cache statistics
+
+    Computations run on a single worker thread so the shared caches are never
+    touched concurrently, while cached responses are answered directly on the
+    event loop.
+    """
+
+    def __init__(self, data_path, cache_bytes=32 * 1024 * 1024, ttl=300):
+        started = time.perf_counter()
+        self.df = pd.read_csv(data_path)
+        self.queries = AgriQueries(self.df)
+        self.responses = ResponseCache(cache_bytes, ttl)
+        self.latency = LatencyRecorder()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='agri-query')
+        logging.info(f"Loaded {len(self.df):,} rows in {time.perf_counter() - started:.2f}s")
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+    def compute(self, path, params):
+        """Produce the JSON body for a route (runs on the worker thread)"""
+        parts = [p for p in path.split('/') if p]
+        if parts == ['health']:
+            return to_json({'status': 'ok', 'rows': len(self.df), 'columns': len(self.df.columns)})
+        if parts == ['queries']:
+            return to_json(sorted(QUERY_ENDPOINTS))
+        if parts == ['eda']:
+            return to_json(sorted(EDA_ENDPOINTS))
+        if len(parts) == 2 and parts[0] == 'queries':
+            method = QUERY_ENDPOINTS.get(parts[1])
+            if method is None:
+                raise HTTPError(404, f"Unknown query '{parts[1]}'")
+            try:
+                return to_json(getattr(self.queries, method)(**params))
+            except (TypeError, KeyError, ValueError) as e:
+                # Bad parameters: unknown argument, unknown crop (AgriQueries.col)
+                # or a year outside the data (DistrictTimeSeries.year_index)
+                raise HTTPError(400, e.args[0] if isinstance(e, KeyError) and e.args else str(e))
+        if len(parts) == 2 and parts[0] == 'eda':
+            if parts[1] not in EDA_ENDPOINTS:
+                raise HTTPError(404, f"Unknown EDA aggregation '{parts[1]}'")
+            keys, columns, aggfunc, where, n = EDA_ENDPOINTS[parts[1]]
+            return to_json(self._aggregate(keys, columns, aggfunc, where, n))
+        if parts == ['aggregate']:
+            params = dict(params)
+            try:
+                keys = params.pop('by').split(',')
+                columns = params.pop('column').split(',')
+            except KeyError as e:
+                raise HTTPError(400, f"Missing parameter {e}")
+            aggfunc = params.pop('agg', 'sum')
+            if aggfunc not in AGGREGATE_FUNCS:
+                raise HTTPError(400, f"Unknown agg '{aggfunc}', expected one of "
+                                     f"{', '.join(AGGREGATE_FUNCS)}")
+            n = params.pop('n', None)
+            return to_json(self._aggregate(keys, columns, aggfunc, params or None, n))
+        raise HTTPError(404, f"No route for {path}")
+
+    def _aggregate(self, keys, columns, aggfunc, where, n):
+        try:
+            result = self.queries.agg_cache.aggregate(keys, columns, aggfunc, where)
+        except KeyError as e:
+            raise HTTPError(400, f"Unknown column {e}")
+        if n is not None:
+            column = None if isinstance(result, pd.Series) else result.columns[0]
+            result = top_n(result, int(n), column)
+        return result
+
+    async def respond(self, method, target, headers):
+        """Return (status, body, extra headers) for one request"""
+        if method != 'GET':
+            raise HTTPError(405, 'Only GET is supported')
+        url = urlsplit(target)
+        params = {k: _param(v) for k, v in parse_qsl(url.query)}
+        path = url.path.rstrip('/') or '/'
+
+        if path == '/metrics':
+            body = to_json({'latency': self.latency.summary(),
+                            'response_cache': self.responses.stats(),
+                            'aggregation_cache': self.queries.agg_cache.stats()})
+            return 200, body, {}
+
+        key = (path, tuple(sorted(params.items())))
+        cached = self.responses.get(key)
+        if cached is None:
+            loop = asyncio.get_running_loop()
+            body = await loop.run_in_executor(self.executor, self.compute, path, params)
+            cached = self.responses.put(key, body)
+        body, etag = cached
+        if headers.get('if-none-match') == etag:
+            return 304, b'', {'ETag': etag}
+        return 200, body, {'ETag': etag}
+
+    # ------------------------------------------------------------------
+    # HTTP/1.1 plumbing
+    # ------------------------------------------------------------------
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                started = time.perf_counter()
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    status, body, extra = await self.respond(method, target, headers)
+                except HTTPError as e:
+                    status, body, extra = e.status, to_json({'error': str(e)}), {}
+                except Exception as e:
+                    logging.error(f"Error serving {target}: {e}")
+                    status, body, extra = 500, to_json({'error': 'internal error'}), {}
+
+                keep_alive = (version == 'HTTP/1.1'
+                              and headers.get('connection', '').lower() != 'close')
+                head = [f'HTTP/1.1 {status} {STATUS_TEXT.get(status, "")}',
+                        'Content-Type: application/json',
+                        f'Content-Length: {len(body)}',
+                        'Cache-Control: public, max-age=0, must-revalidate',
+                        f'Connection: {"keep-alive" if keep_alive else "close"}']
+                head += [f'{k}: {v}' for k, v in extra.items()]
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+                await writer.drain()
+                self.latency.record(route_name(urlsplit(target).path),
+                                    time.perf_counter() - started)
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8080):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        logging.info(f"Analytics service listening on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+# Main execution
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='AgriData analytics HTTP service')
+    parser.add_argument('--data', default='../data/processed/agri_data_cleaned.csv')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--ttl', type=int, default=300, help='response cache TTL (seconds)')
+    parser.add_argument('--cache-mb', type=int, default=32)
+    args = parser.parse_args()
+
+    service = AnalyticsService(args.data, cache_bytes=args.cache_mb * 1024 * 1024, ttl=args.ttl)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        logging.info("Analytics service stopped")
@@ -0,0 +1,259 @@
+"""
+AgriData Explorer - Aggregation Cache
+File: analysis/caching.py
+Purpose: Byte-bounded LRU memoization for groupby results shared by the
+         EDA module and interactive notebook sessions
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def estimate_nbytes(value):
+    """Approximate memory held by a cached value"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True, index=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, pd.Index):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_nbytes(item) for item in value)
+    return 64
+
+
+class LRUCache:
+    """Least-recently-used cache bounded by the number of bytes it holds"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None, count=True):
+        """Return a cached value and mark it as most recently used
+
+        ``count=False`` leaves the hit/miss counters alone, for internal
+        lookups that should not show up in the hit rate.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += count
+            return default
+        self._entries.move_to_end(key)
+        self.hits += count
+        return entry[0]
+
+    def put(self, key, value, nbytes=None):
+        """Store a value, evicting least-recently-used entries to stay in budget"""
+        nbytes = estimate_nbytes(value) if nbytes is None else nbytes
+        if key in self._entries:
+            self.current_bytes -= self._entries.pop(key)[1]
+        if nbytes > self.max_bytes:
+            # Larger than the whole budget: don't flush everything for it
+            return value
+        self._entries[key] = (value, nbytes)
+        self.current_bytes += nbytes
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_bytes
+            self.evictions += 1
+        return value
+
+    def pop(self, key, default=None):
+        """Remove an entry and return its value"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return default
+        self.current_bytes -= entry[1]
+        return entry[0]
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def stats(self):
+        """Hit rate and memory usage summary"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'bytes_held': self.current_bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+
+def _normalize_keys(keys):
+    return (keys,) if isinstance(keys, str) else tuple(keys)
+
+
+def normalize_where(where):
+    """Turn an equality filter ({column: value}) into a hashable, ordered key"""
+    if not where:
+        return ()
+    items = where.items() if isinstance(where, dict) else where
+    normalized = []
+    for column, value in items:
+        if isinstance(value, (list, tuple, set, frozenset)):
+            value = tuple(sorted(value))
+        normalized.append((column, value))
+    return tuple(sorted(normalized))
+
+
+def _normalize_aggfunc(aggfunc, columns):
+    if isinstance(aggfunc, dict):
+        return tuple((col, aggfunc[col]) for col in columns)
+    return aggfunc
+
+
+class AggregationCache:
+    """Memoize groupby aggregations over one DataFrame
+
+    Results are keyed by (group keys, columns, aggfunc, filter). Each distinct
+    set of group keys is factorized once; every aggregation over those keys
+    reuses the same integer group codes, so sum/count/mean become a single
+    ``np.bincount`` per column instead of a fresh pandas groupby.
+
+    Filters are equality predicates, e.g. ``{'state_name': 'West Bengal'}``;
+    a tuple/list value means "is in". With a ``GeoIndex``, region, state and
+    district predicates resolve to that slice's row positions, so filtered
+    aggregations read only the matching rows.
+    """
+
+    FAST_AGGS = ('sum', 'count', 'mean')
+
+    def __init__(self, df, max_bytes=64 * 1024 * 1024, geo_index=None):
+        self.df = df
+        self.cache = LRUCache(max_bytes)
+        self.geo_index = geo_index
+
+    def group_index(self, keys):
+        """Factorized (codes, group labels) for a tuple of group keys
+
+        Rows with a NaN key belong to no group (pandas' ``dropna=True``) and
+        get code -1.
+        """
+        keys = _normalize_keys(keys)
+        cache_key = ('__group_index__', keys)
+        cached = self.cache.get(cache_key, count=False)
+        if cached is not None:
+            return cached
+
+        grouped = self.df.groupby(list(keys), sort=True)
+        codes = grouped.ngroup().to_numpy(dtype=np.float64, na_value=np.nan)
+        codes = np.where(np.isnan(codes), -1, codes).astype(np.int64)
+        labels = grouped.size().index
+        index = (codes, labels)
+        self.cache.put(cache_key, index, codes.nbytes + estimate_nbytes(labels))
+        return index
+
+    def filter_mask(self, where):
+        """Boolean row mask for a normalized equality filter"""
+        mask = np.ones(len(self.df), dtype=bool)
+        for column, value in where:
+            values = self.df[column]
+            if isinstance(value, tuple):
+                mask &= values.isin(value).to_numpy()
+            else:
+                mask &= (values == value).to_numpy()
+        return mask
+
+    def filter_rows(self, where):
+        """Row positions for a normalized equality filter"""
+        rows, remaining = (None, where) if self.geo_index is None else self.geo_index.lookup(where)
+        if rows is None:
+            return np.flatnonzero(self.filter_mask(where))
+        for column, value in remaining:
+            values = self.df[column].take(rows)
+            keep = values.isin(value) if isinstance(value, tuple) else values == value
+            rows = rows[keep.to_numpy()]
+        return rows
+
+    def aggregate(self, keys, columns, aggfunc='sum', where=None):
+        """Cached equivalent of ``df[filter].groupby(keys)[columns].agg(aggfunc)``
+
+        A single column name returns a Series, a list returns a DataFrame.
+        ``aggfunc`` may be a function name or a {column: name} dict. The
+        returned object is a copy and is safe to modify.
+        """
+        keys = _normalize_keys(keys)
+        single = isinstance(columns, str)
+        cols = (columns,) if single else tuple(columns)
+        where = normalize_where(where)
+        cache_key = (keys, cols, _normalize_aggfunc(aggfunc, cols), where)
+
+        result = self.cache.get(cache_key)
+        if result is None:
+            result = self._compute(keys, cols, aggfunc, where)
+            self.cache.put(cache_key, result)
+
+        result = result.copy()
+        return result[cols[0]] if single else result
+
+    def _compute(self, keys, cols, aggfunc, where):
+        codes, labels = self.group_index(keys)
+        rows = self.filter_rows(where) if where else None
+        if rows is not None:
+            codes = codes[rows]
+        if (codes < 0).any():
+            # Drop rows without a group, as groupby(dropna=True) does
+            grouped = np.flatnonzero(codes >= 0)
+            rows = grouped if rows is None else rows[grouped]
+            codes = codes[grouped]
+
+        n_groups = len(labels)
+        present = np.bincount(codes, minlength=n_groups) > 0
+
+        funcs = aggfunc if isinstance(aggfunc, dict) else dict.fromkeys(cols, aggfunc)
+        out = {}
+        for col in cols:
+            func = funcs[col]
+            column = self.df[col] if rows is None else self.df[col].take(rows)
+            values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+            if func in self.FAST_AGGS:
+                out[col] = self._bincount_agg(values, codes, n_groups, func)
+            else:
+                out[col] = (pd.Series(values).groupby(codes).agg(func)
+                            .reindex(np.arange(n_groups)).to_numpy())
+
+        result = pd.DataFrame(out, index=labels)
+        return result[present]
+
+    @staticmethod
+    def _bincount_agg(values, codes, n_groups, func):
+        valid = ~np.isnan(values)
+        # int64 like pandas' count
+        counts = np.bincount(codes[valid], minlength=n_groups).astype(np.int64)
+        if func == 'count':
+            return counts
+        sums = np.bincount(codes[valid], weights=values[valid], minlength=n_groups)
+        if func == 'sum':
+            return sums
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / counts, np.nan)
+
+    def clear(self):
+        """Drop cached results and group indexes"""
+        self.cache.clear()
+
+    def stats(self):
+        """Hit rate and memory held by results and group indexes"""
+        return self.cache.stats()
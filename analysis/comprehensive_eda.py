@@ -6,32 +6,83 @@ Purpose: Generate all 15 required visualizations
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import argparse
+import functools
 import os
 import warnings
-warnings.filterwarnings('ignore')
+from caching import AggregationCache
+from correlation import CorrelationEngine
+from geo_index import GeoIndex
+from ranking import top_n
+from timeseries import compound_growth
 
 # Configuration
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette("husl")
 OUTPUT_DIR = 'plotly_exports'
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+# rendering module (Agg backend, figure templates), imported by the first
+# chart so aggregation-only use (and the analytics service) never pays for
+# matplotlib/seaborn
+rendering = None
+
+
+def _setup_plotting():
+    """Import the Agg rendering layer and seaborn, apply the chart style and create OUTPUT_DIR"""
+    global rendering
+    if rendering is None:
+        import matplotlib.style
+        import seaborn as sns
+        import rendering as module
+        matplotlib.style.use('seaborn-v0_8-whitegrid')
+        sns.set_palette("husl")
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        rendering = module
+    return rendering
+
+
+def _charting(method):
+    """Load the plotting stack before a chart method runs"""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        _setup_plotting()
+        return method(*args, **kwargs)
+    return wrapper
+
 
 class AgriEDAVisualizer:
     """Generate all required EDA visualizations"""
     
-    def __init__(self, data_path):
-        self.df = pd.read_csv(data_path)
-        print(f"✓ Data loaded: {self.df.shape}")
-        print(f"✓ Years covered: {self.df['year'].min()} - {self.df['year'].max()}")
+    def __init__(self, data_path=None, cache_bytes=64 * 1024 * 1024, source=None,
+                 profiles=('print',)):
+        # PNG output profiles (rendering.PROFILES), all written from one draw per chart
+        self.profiles = tuple(profiles)
+        self._renderer = None
+        if source is not None:
+            # Warehouse mode: aggregations are pushed down as SQL, no frame is loaded
+            self.df = None
+            self.geo = None
+            self.source = source
+            self.columns = list(source.columns)
+            first_year, last_year = source.year_range()
+            print(f"✓ Warehouse source: {source.row_count():,} fact rows")
+        else:
+            self.df = pd.read_csv(data_path)
+            # Region/state/district slices (eda_7, eda_8, ...) read only their own rows
+            self.geo = GeoIndex(self.df)
+            self.source = AggregationCache(self.df, max_bytes=cache_bytes, geo_index=self.geo)
+            self.columns = list(self.df.columns)
+            first_year, last_year = self.df['year'].min(), self.df['year'].max()
+            print(f"✓ Data loaded: {self.df.shape}")
+        print(f"✓ Years covered: {first_year} - {last_year}")
         
         # Auto-detect column names (handle different naming conventions)
         self.col_map = self._detect_columns()
     
+    @classmethod
+    def from_warehouse(cls, url, **kwargs):
+        """Visualizer that aggregates in the SQL warehouse (any SQLAlchemy URL)"""
+        from warehouse_source import WarehouseSource
+        return cls(source=WarehouseSource(url=url, **kwargs))
+    
     def _detect_columns(self):
         """Detect actual column names in the dataset"""
         col_map = {}
@@ -65,7 +116,7 @@ class AgriEDAVisualizer:
         # Find matching columns
         for key, patterns_list in patterns.items():
             for pattern in patterns_list:
-                matching = [col for col in self.df.columns if pattern.lower() in col.lower()]
+                matching = [col for col in self.columns if pattern.lower() in col.lower()]
                 if matching:
                     col_map[key] = matching[0]
                     break
@@ -76,6 +127,47 @@ class AgriEDAVisualizer:
         """Get actual column name from map"""
         return self.col_map.get(key, key)
     
+    def _aggregate(self, keys, columns, aggfunc='sum', where=None):
+        """Memoized groupby shared by all charts (in memory or pushed down to SQL)"""
+        return self.source.aggregate(keys, columns, aggfunc, where)
+    
+    def _top(self, keys, column, n, where=None):
+        """Largest n groups of one summed measure (ranked in SQL in warehouse mode)"""
+        if self.df is None:
+            return self.source.top_n(keys, column, n, where=where)
+        return top_n(self._aggregate(keys, column, where=where), n)
+    
+    def _region_totals(self, column):
+        """Regional sums from the geo index, or pushed down to SQL; None without regions"""
+        if self.df is None:
+            totals = self._aggregate('region', column)
+            totals = totals[totals.index.notna()]
+            return totals if len(totals) else None
+        if 'region' not in self.geo.levels:
+            return None
+        return self.geo.rollup(column, 'region')
+    
+    @property
+    def renderer(self):
+        """ChartRenderer shared by all charts, created with the first one"""
+        if self._renderer is None:
+            self._renderer = _setup_plotting().ChartRenderer(OUTPUT_DIR, self.profiles)
+        return self._renderer
+    
+    def _bar_chart(self, series, filename, color, title, xlabel, ylabel, template='bar',
+                   rotation=45, ha='right'):
+        """Single bar chart of a Series on a reused template ('bar', 'barh' or 'barh_tall')"""
+        figure = self.renderer.figure(template)
+        panel = figure.panel(0, 'bar' if template == 'bar' else 'barh')
+        panel.update(series.index, series.values, color, rotation=rotation, ha=ha)
+        rendering.style_axes(panel.ax, title, xlabel, ylabel)
+        self.renderer.save(figure, filename)
+    
+    def cache_stats(self):
+        """Aggregation cache hit rate and memory held"""
+        return self.source.stats()
+    
+    @_charting
     def eda_1_top7_rice_states(self):
         """EDA 1: Top 7 Rice Production States (Bar Plot)"""
         print("\n" + "="*70)
@@ -83,195 +175,155 @@ class AgriEDAVisualizer:
         print("="*70)
         
         col = self._get_col('rice_production')
-        state_rice = self.df.groupby('state_name')[col].sum()
-        top7 = state_rice.nlargest(7)
+        top7 = self._top('state_name', col, 7)
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        top7.plot(kind='bar', color='#2ecc71', edgecolor='black', ax=ax)
-        ax.set_title('Top 7 Rice Producing States in India', fontsize=16, fontweight='bold')
-        ax.set_xlabel('State', fontsize=12)
-        ax.set_ylabel('Rice Production (1000 tons)', fontsize=12)
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/01_top7_rice_states.png', dpi=300)
-        plt.close()
+        self._bar_chart(top7, '01_top7_rice_states.png', '#2ecc71',
+                        'Top 7 Rice Producing States in India', 'State', 'Rice Production (1000 tons)')
         
         print(top7)
         return top7
     
+    @_charting
     def eda_2_top5_wheat_states(self):
         """EDA 2: Top 5 Wheat Producing States (Bar + Pie Chart)"""
         print("\n" + "="*70)
         print("EDA 2: Top 5 Wheat Producing States")
         print("="*70)
         
-        state_wheat = self.df.groupby('state_name')['wheat_production_1000_tons'].sum()
-        top5 = state_wheat.nlargest(5)
+        top5 = self._top('state_name', 'wheat_production_1000_tons', 5)
         
         # Bar Chart
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-        
-        top5.plot(kind='bar', color='#e74c3c', edgecolor='black', ax=ax1)
-        ax1.set_title('Top 5 Wheat Producing States', fontsize=14, fontweight='bold')
-        ax1.set_xlabel('State', fontsize=12)
-        ax1.set_ylabel('Wheat Production (1000 tons)', fontsize=12)
-        ax1.tick_params(axis='x', rotation=45)
+        figure = self.renderer.figure('pair')
+        bars = figure.panel(0, 'bar').update(top5.index, top5.values, '#e74c3c', rotation=45)
+        rendering.style_axes(bars.ax, 'Top 5 Wheat Producing States', 'State',
+                             'Wheat Production (1000 tons)', title_size=14)
         
         # Pie Chart
+        ax2 = figure.ax(1)
         colors = ['#e74c3c', '#e67e22', '#f39c12', '#f1c40f', '#d35400']
         ax2.pie(top5.values, labels=top5.index, autopct='%1.1f%%', 
-               startangle=90, colors=colors, explode=[0.05]*5)
+               startangle=90, colors=colors, explode=[0.05]*len(top5))
         ax2.set_title('Wheat Production Share (%)', fontsize=14, fontweight='bold')
         
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/02_top5_wheat_states.png', dpi=300)
-        plt.close()
+        self.renderer.save(figure, '02_top5_wheat_states.png')
         
         print(top5)
         return top5
     
+    @_charting
     def eda_3_oilseed_top5_states(self):
         """EDA 3: Oilseed Production by Top 5 States"""
         print("\n" + "="*70)
         print("EDA 3: Oilseed Production by Top 5 States")
         print("="*70)
         
-        state_oil = self.df.groupby('state_name')['oilseeds_production_1000_tons'].sum()
-        top5 = state_oil.nlargest(5)
+        top5 = self._top('state_name', 'oilseeds_production_1000_tons', 5)
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        top5.plot(kind='barh', color='#f39c12', edgecolor='black', ax=ax)
-        ax.set_title('Top 5 Oilseed Producing States', fontsize=16, fontweight='bold')
-        ax.set_xlabel('Oilseed Production (1000 tons)', fontsize=12)
-        ax.set_ylabel('State', fontsize=12)
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/03_top5_oilseed_states.png', dpi=300)
-        plt.close()
+        self._bar_chart(top5, '03_top5_oilseed_states.png', '#f39c12',
+                        'Top 5 Oilseed Producing States', 'Oilseed Production (1000 tons)', 'State',
+                        template='barh')
         
         print(top5)
         return top5
     
+    @_charting
     def eda_4_top7_sunflower_states(self):
         """EDA 4: Top 7 Sunflower Production States"""
         print("\n" + "="*70)
         print("EDA 4: Top 7 Sunflower Production States")
         print("="*70)
         
-        state_sun = self.df.groupby('state_name')['sunflower_production_1000_tons'].sum()
-        top7 = state_sun.nlargest(7)
+        top7 = self._top('state_name', 'sunflower_production_1000_tons', 7)
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        top7.plot(kind='bar', color='#f1c40f', edgecolor='black', ax=ax)
-        ax.set_title('Top 7 Sunflower Producing States', fontsize=16, fontweight='bold')
-        ax.set_xlabel('State', fontsize=12)
-        ax.set_ylabel('Sunflower Production (1000 tons)', fontsize=12)
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/04_top7_sunflower_states.png', dpi=300)
-        plt.close()
+        self._bar_chart(top7, '04_top7_sunflower_states.png', '#f1c40f',
+                        'Top 7 Sunflower Producing States', 'State', 'Sunflower Production (1000 tons)')
         
         print(top7)
         return top7
     
+    @_charting
     def eda_5_sugarcane_50years(self):
         """EDA 5: India's Sugarcane Production (Last 50 Years)"""
         print("\n" + "="*70)
         print("EDA 5: Sugarcane Production Over 50 Years")
         print("="*70)
         
-        yearly = self.df.groupby('year')['sugarcane_production_1000_tons'].sum()
-        
-        fig, ax = plt.subplots(figsize=(14, 7))
-        ax.plot(yearly.index, yearly.values, marker='o', linewidth=2.5, 
-               markersize=6, color='#16a085')
-        ax.fill_between(yearly.index, yearly.values, alpha=0.3, color='#16a085')
-        ax.set_title("India's Sugarcane Production (Last 50 Years)", 
-                    fontsize=16, fontweight='bold')
-        ax.set_xlabel('Year', fontsize=12)
-        ax.set_ylabel('Sugarcane Production (1000 tons)', fontsize=12)
-        ax.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/05_sugarcane_50years.png', dpi=300)
-        plt.close()
+        yearly = self._aggregate('year', 'sugarcane_production_1000_tons')
+        
+        figure = self.renderer.figure('trend')
+        lines = figure.panel(0, 'line').update(
+            yearly.index, [(yearly.values, dict(marker='o', linewidth=2.5, markersize=6,
+                                                color='#16a085'))],
+            fill=dict(alpha=0.3, color='#16a085'))
+        rendering.style_axes(lines.ax, "India's Sugarcane Production (Last 50 Years)",
+                             'Year', 'Sugarcane Production (1000 tons)')
+        self.renderer.save(figure, '05_sugarcane_50years.png')
         
         print(f"Growth: {((yearly.iloc[-1] / yearly.iloc[0]) - 1) * 100:.2f}%")
+        span = yearly.index[-1] - yearly.index[0]
+        print(f"CAGR: {compound_growth(yearly.iloc[0], yearly.iloc[-1], span):.2f}% per year")
         return yearly
     
+    @_charting
     def eda_6_rice_vs_wheat_50years(self):
         """EDA 6: Rice vs Wheat Production (Last 50 Years)"""
         print("\n" + "="*70)
         print("EDA 6: Rice vs Wheat Production Comparison")
         print("="*70)
         
-        yearly = self.df.groupby('year').agg({
-            'rice_production_1000_tons': 'sum',
-            'wheat_production_1000_tons': 'sum'
-        })
-        
-        fig, ax = plt.subplots(figsize=(14, 7))
-        ax.plot(yearly.index, yearly['rice_production_1000_tons'], 
-               marker='o', linewidth=2.5, label='Rice', color='#27ae60')
-        ax.plot(yearly.index, yearly['wheat_production_1000_tons'], 
-               marker='s', linewidth=2.5, label='Wheat', color='#e67e22')
-        ax.set_title('Rice vs Wheat Production in India (50 Years)', 
-                    fontsize=16, fontweight='bold')
-        ax.set_xlabel('Year', fontsize=12)
-        ax.set_ylabel('Production (1000 tons)', fontsize=12)
-        ax.legend(fontsize=12)
-        ax.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/06_rice_vs_wheat_50years.png', dpi=300)
-        plt.close()
+        yearly = self._aggregate('year', [
+            'rice_production_1000_tons',
+            'wheat_production_1000_tons'
+        ])
+        
+        figure = self.renderer.figure('trend')
+        lines = figure.panel(0, 'line').update(yearly.index, [
+            (yearly['rice_production_1000_tons'].values,
+             dict(marker='o', linewidth=2.5, label='Rice', color='#27ae60')),
+            (yearly['wheat_production_1000_tons'].values,
+             dict(marker='s', linewidth=2.5, label='Wheat', color='#e67e22')),
+        ], legend_size=12)
+        rendering.style_axes(lines.ax, 'Rice vs Wheat Production in India (50 Years)',
+                             'Year', 'Production (1000 tons)')
+        self.renderer.save(figure, '06_rice_vs_wheat_50years.png')
         
         return yearly
     
+    @_charting
     def eda_7_wb_districts_rice(self):
         """EDA 7: Rice Production by West Bengal Districts"""
         print("\n" + "="*70)
         print("EDA 7: West Bengal Districts Rice Production")
         print("="*70)
         
-        wb = self.df[self.df['state_name'] == 'West Bengal']
-        dist_rice = wb.groupby('district_name')['rice_production_1000_tons'].sum()
-        top10 = dist_rice.nlargest(10)
+        top10 = self._top('district_name', 'rice_production_1000_tons', 10,
+                          where={'state_name': 'West Bengal'})
         
-        fig, ax = plt.subplots(figsize=(12, 8))
-        top10.plot(kind='barh', color='#3498db', edgecolor='black', ax=ax)
-        ax.set_title('Top 10 Rice Producing Districts in West Bengal', 
-                    fontsize=16, fontweight='bold')
-        ax.set_xlabel('Rice Production (1000 tons)', fontsize=12)
-        ax.set_ylabel('District', fontsize=12)
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/07_wb_districts_rice.png', dpi=300)
-        plt.close()
+        self._bar_chart(top10, '07_wb_districts_rice.png', '#3498db',
+                        'Top 10 Rice Producing Districts in West Bengal',
+                        'Rice Production (1000 tons)', 'District', template='barh_tall')
         
         print(top10)
         return top10
     
+    @_charting
     def eda_8_up_wheat_top10_years(self):
         """EDA 8: Top 10 Wheat Production Years from UP"""
         print("\n" + "="*70)
         print("EDA 8: Top 10 Wheat Production Years in Uttar Pradesh")
         print("="*70)
         
-        up = self.df[self.df['state_name'] == 'Uttar Pradesh']
-        yearly = up.groupby('year')['wheat_production_1000_tons'].sum()
-        top10 = yearly.nlargest(10)
-        
-        fig, ax = plt.subplots(figsize=(12, 6))
-        top10.plot(kind='bar', color='#e74c3c', edgecolor='black', ax=ax)
-        ax.set_title('Top 10 Wheat Production Years in Uttar Pradesh', 
-                    fontsize=16, fontweight='bold')
-        ax.set_xlabel('Year', fontsize=12)
-        ax.set_ylabel('Wheat Production (1000 tons)', fontsize=12)
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/08_up_wheat_top10_years.png', dpi=300)
-        plt.close()
+        top10 = self._top('year', 'wheat_production_1000_tons', 10,
+                          where={'state_name': 'Uttar Pradesh'})
+        
+        self._bar_chart(top10, '08_up_wheat_top10_years.png', '#e74c3c',
+                        'Top 10 Wheat Production Years in Uttar Pradesh',
+                        'Year', 'Wheat Production (1000 tons)', ha='center')
         
         print(top10)
         return top10
     
+    @_charting
     def eda_9_millet_50years(self):
         """EDA 9: Millet Production (Last 50 Years)"""
         print("\n" + "="*70)
@@ -279,74 +331,74 @@ class AgriEDAVisualizer:
         print("="*70)
         
         # Combine all millets
-        yearly = self.df.groupby('year').agg({
-            'pearl_millet_production_1000_tons': 'sum',
-            'finger_millet_production_1000_tons': 'sum'
-        })
+        yearly = self._aggregate('year', [
+            'pearl_millet_production_1000_tons',
+            'finger_millet_production_1000_tons'
+        ])
         yearly['total_millet'] = yearly.sum(axis=1)
         
-        fig, ax = plt.subplots(figsize=(14, 7))
-        ax.plot(yearly.index, yearly['pearl_millet_production_1000_tons'], 
-               marker='o', label='Pearl Millet', linewidth=2)
-        ax.plot(yearly.index, yearly['finger_millet_production_1000_tons'], 
-               marker='s', label='Finger Millet', linewidth=2)
-        ax.plot(yearly.index, yearly['total_millet'], 
-               marker='^', label='Total Millet', linewidth=2.5, color='black')
-        ax.set_title('Millet Production Trends (50 Years)', fontsize=16, fontweight='bold')
-        ax.set_xlabel('Year', fontsize=12)
-        ax.set_ylabel('Production (1000 tons)', fontsize=12)
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/09_millet_50years.png', dpi=300)
-        plt.close()
+        figure = self.renderer.figure('trend')
+        lines = figure.panel(0, 'line').update(yearly.index, [
+            (yearly['pearl_millet_production_1000_tons'].values,
+             dict(marker='o', label='Pearl Millet', linewidth=2)),
+            (yearly['finger_millet_production_1000_tons'].values,
+             dict(marker='s', label='Finger Millet', linewidth=2)),
+            (yearly['total_millet'].values,
+             dict(marker='^', label='Total Millet', linewidth=2.5, color='black')),
+        ], legend_size='medium')
+        rendering.style_axes(lines.ax, 'Millet Production Trends (50 Years)',
+                             'Year', 'Production (1000 tons)')
+        self.renderer.save(figure, '09_millet_50years.png')
         
         return yearly
     
+    @_charting
     def eda_10_sorghum_by_region(self):
         """EDA 10: Sorghum Production by Region"""
         print("\n" + "="*70)
         print("EDA 10: Sorghum Production by Region")
         print("="*70)
         
-        state_sorghum = self.df.groupby('state_name')['sorghum_production_1000_tons'].sum()
-        top8 = state_sorghum.nlargest(8)
+        top8 = self._top('state_name', 'sorghum_production_1000_tons', 8)
+        regions = self._region_totals('sorghum_production_1000_tons')
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        top8.plot(kind='bar', color='#9b59b6', edgecolor='black', ax=ax)
-        ax.set_title('Top 8 Sorghum Producing States', fontsize=16, fontweight='bold')
-        ax.set_xlabel('State', fontsize=12)
-        ax.set_ylabel('Sorghum Production (1000 tons)', fontsize=12)
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/10_sorghum_by_region.png', dpi=300)
-        plt.close()
+        if regions is None:
+            print("⚠️  No region column (re-run clean_ingest.py). Showing states only.")
+            figure = self.renderer.figure('bar')
+            states = figure.panel(0, 'bar')
+        else:
+            figure = self.renderer.figure('split')
+            regions = regions.sort_values(ascending=False)
+            region_bars = figure.panel(0, 'bar').update(regions.index, regions.values, '#8e44ad')
+            rendering.style_axes(region_bars.ax, 'Sorghum Production by Region', 'Region',
+                                 'Sorghum Production (1000 tons)')
+            states = figure.panel(1, 'bar')
+            print(regions)
+        
+        states.update(top8.index, top8.values, '#9b59b6', rotation=45, ha='right')
+        rendering.style_axes(states.ax, 'Top 8 Sorghum Producing States', 'State',
+                             'Sorghum Production (1000 tons)')
+        self.renderer.save(figure, '10_sorghum_by_region.png')
         
         print(top8)
         return top8
     
+    @_charting
     def eda_11_groundnut_top7(self):
         """EDA 11: Top 7 States for Groundnut Production"""
         print("\n" + "="*70)
         print("EDA 11: Top 7 Groundnut Producing States")
         print("="*70)
         
-        state_gnut = self.df.groupby('state_name')['groundnut_production_1000_tons'].sum()
-        top7 = state_gnut.nlargest(7)
+        top7 = self._top('state_name', 'groundnut_production_1000_tons', 7)
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        top7.plot(kind='bar', color='#d35400', edgecolor='black', ax=ax)
-        ax.set_title('Top 7 Groundnut Producing States', fontsize=16, fontweight='bold')
-        ax.set_xlabel('State', fontsize=12)
-        ax.set_ylabel('Groundnut Production (1000 tons)', fontsize=12)
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/11_groundnut_top7.png', dpi=300)
-        plt.close()
+        self._bar_chart(top7, '11_groundnut_top7.png', '#d35400',
+                        'Top 7 Groundnut Producing States', 'State', 'Groundnut Production (1000 tons)')
         
         print(top7)
         return top7
     
+    @_charting
     def eda_12_soybean_top5_yield(self):
         """EDA 12: Soybean Production by Top 5 States and Yield Efficiency"""
         print("\n" + "="*70)
@@ -354,13 +406,13 @@ class AgriEDAVisualizer:
         print("="*70)
         
         # Check if soybean columns exist
-        soy_prod_cols = [c for c in self.df.columns if 'soybean' in c.lower() and 'production' in c.lower()]
-        soy_yield_cols = [c for c in self.df.columns if 'soybean' in c.lower() and 'yield' in c.lower()]
+        soy_prod_cols = [c for c in self.columns if 'soybean' in c.lower() and 'production' in c.lower()]
+        soy_yield_cols = [c for c in self.columns if 'soybean' in c.lower() and 'yield' in c.lower()]
         
         if not soy_prod_cols:
             print("⚠️  Soybean production column not found. Skipping...")
             print("Available oilseed crops:")
-            oilseed_cols = [c for c in self.df.columns if any(x in c.lower() for x in ['groundnut', 'sunflower', 'rapeseed', 'mustard'])]
+            oilseed_cols = [c for c in self.columns if any(x in c.lower() for x in ['groundnut', 'sunflower', 'rapeseed', 'mustard'])]
             for col in oilseed_cols[:5]:
                 print(f"  - {col}")
             return None
@@ -369,40 +421,34 @@ class AgriEDAVisualizer:
         yield_col = soy_yield_cols[0] if soy_yield_cols else None
         
         if yield_col:
-            state_soy = self.df.groupby('state_name').agg({
-                prod_col: 'sum',
-                yield_col: 'mean'
-            })
-            top5 = state_soy.nlargest(5, prod_col)
+            state_soy = self._aggregate('state_name', [prod_col, yield_col],
+                                        {prod_col: 'sum', yield_col: 'mean'})
+            top5 = top_n(state_soy, 5, prod_col)
         else:
-            state_soy = self.df.groupby('state_name')[prod_col].sum()
-            top5 = state_soy.nlargest(5).to_frame()
+            state_soy = self._aggregate('state_name', prod_col)
+            top5 = top_n(state_soy, 5).to_frame()
             top5['avg_yield'] = 0
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-        
-        top5[prod_col].plot(kind='bar', color='#1abc9c', 
-                            edgecolor='black', ax=ax1)
-        ax1.set_title('Top 5 Soybean Producing States', fontsize=14, fontweight='bold')
-        ax1.set_xlabel('State', fontsize=12)
-        ax1.set_ylabel('Production (1000 tons)', fontsize=12)
-        ax1.tick_params(axis='x', rotation=45)
+        figure = self.renderer.figure('pair')
+        production = figure.panel(0, 'bar').update(top5.index, top5[prod_col].values,
+                                                   '#1abc9c', rotation=45)
+        rendering.style_axes(production.ax, 'Top 5 Soybean Producing States', 'State',
+                             'Production (1000 tons)', title_size=14)
         
         if yield_col:
-            top5[yield_col].plot(kind='bar', color='#16a085', 
-                                edgecolor='black', ax=ax2)
-            ax2.set_title('Average Soybean Yield', fontsize=14, fontweight='bold')
-            ax2.set_xlabel('State', fontsize=12)
-            ax2.set_ylabel('Yield (kg/ha)', fontsize=12)
-            ax2.tick_params(axis='x', rotation=45)
+            yields = figure.panel(1, 'bar').update(top5.index, top5[yield_col].values,
+                                                   '#16a085', rotation=45)
+            rendering.style_axes(yields.ax, 'Average Soybean Yield', 'State', 'Yield (kg/ha)',
+                                 title_size=14)
+        else:
+            figure.ax(1)
         
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/12_soybean_top5_yield.png', dpi=300)
-        plt.close()
+        self.renderer.save(figure, '12_soybean_top5_yield.png')
         
         print(top5)
         return top5
     
+    @_charting
     def eda_13_oilseed_major_states(self):
         """EDA 13: Oilseed Production in Major States"""
         print("\n" + "="*70)
@@ -412,7 +458,7 @@ class AgriEDAVisualizer:
         # Find available oilseed columns
         oilseed_crops = {}
         for crop in ['groundnut', 'soybean', 'sunflower', 'rapeseed']:
-            cols = [c for c in self.df.columns if crop in c.lower() and 'production' in c.lower()]
+            cols = [c for c in self.columns if crop in c.lower() and 'production' in c.lower()]
             if cols:
                 oilseed_crops[crop] = cols[0]
         
@@ -420,76 +466,92 @@ class AgriEDAVisualizer:
             print("⚠️  No oilseed columns found. Skipping...")
             return None
         
-        state_oil = self.df.groupby('state_name')[list(oilseed_crops.values())].sum()
-        top5_states = state_oil.sum(axis=1).nlargest(5).index
+        state_oil = self._aggregate('state_name', list(oilseed_crops.values()))
+        top5_states = top_n(state_oil.sum(axis=1), 5).index
         plot_data = state_oil.loc[top5_states]
         
-        fig, ax = plt.subplots(figsize=(14, 7))
+        # Legend sits outside the axes on the right
+        figure = self.renderer.figure('wide', right=0.86)
+        ax = figure.ax()
         plot_data.plot(kind='bar', stacked=True, ax=ax, edgecolor='black')
-        ax.set_title('Oilseed Composition in Major States', fontsize=16, fontweight='bold')
-        ax.set_xlabel('State', fontsize=12)
-        ax.set_ylabel('Production (1000 tons)', fontsize=12)
+        rendering.style_axes(ax, 'Oilseed Composition in Major States', 'State', 'Production (1000 tons)')
         ax.legend(title='Crop', labels=list(oilseed_crops.keys()), bbox_to_anchor=(1.05, 1), loc='upper left')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/13_oilseed_major_states.png', dpi=300)
-        plt.close()
+        ax.set_xticks(ax.get_xticks(), plot_data.index, rotation=45, ha='right')
+        self.renderer.save(figure, '13_oilseed_major_states.png')
         
         print(plot_data)
         return plot_data
     
+    @_charting
     def eda_14_area_vs_production(self):
         """EDA 14: Impact of Area Cultivated on Production (Rice, Wheat, Maize)"""
         print("\n" + "="*70)
         print("EDA 14: Area vs Production Correlation")
         print("="*70)
         
-        fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+        from matplotlib.colors import LinearSegmentedColormap
+        figure = self.renderer.figure('triple')
+        axes = [figure.ax(i) for i in range(3)]
         
         crops = [
-            ('rice_area_1000_ha', 'rice_production_1000_tons', 'Rice', '#27ae60'),
-            ('wheat_area_1000_ha', 'wheat_production_1000_tons', 'Wheat', '#e67e22'),
-            ('maize_area_1000_ha', 'maize_production_1000_tons', 'Maize', '#f39c12')
+            ('rice', 'Rice', '#27ae60'),
+            ('wheat', 'Wheat', '#e67e22'),
+            ('maize', 'Maize', '#f39c12')
         ]
         
-        for idx, (area_col, prod_col, crop_name, color) in enumerate(crops):
-            data = self.df[[area_col, prod_col]].dropna()
-            data = data[(data[area_col] > 0) & (data[prod_col] > 0)]
-            
-            axes[idx].scatter(data[area_col], data[prod_col], alpha=0.5, color=color)
+        # One batched pass for all three correlations
+        crop_names = [crop for crop, _, _ in crops]
+        if self.df is None:
+            correlations = self.source.correlations(crop_names)
+        else:
+            engine = CorrelationEngine(self.df, crops=crop_names)
+            correlations = engine.matrix()
+        
+        for idx, (crop, crop_name, color) in enumerate(crops):
+            # Density-binned instead of drawing every district-year point
+            cmap = LinearSegmentedColormap.from_list(crop, ['white', color])
+            if self.df is None:
+                cells = self.source.density_bins(crop, bins=50)
+                axes[idx].hexbin(cells['x'], cells['y'], C=cells['count'],
+                                 reduce_C_function=np.sum, gridsize=50, bins='log',
+                                 mincnt=1, cmap=cmap)
+            else:
+                area, production = engine.points(crop)
+                axes[idx].hexbin(area, production, gridsize=50, bins='log', mincnt=1, cmap=cmap)
             axes[idx].set_title(f'{crop_name}: Area vs Production', fontsize=14, fontweight='bold')
             axes[idx].set_xlabel('Area (1000 ha)', fontsize=11)
             axes[idx].set_ylabel('Production (1000 tons)', fontsize=11)
             axes[idx].grid(True, alpha=0.3)
             
             # Add correlation
-            corr = data[area_col].corr(data[prod_col])
+            corr = correlations[crop]
             axes[idx].text(0.05, 0.95, f'Corr: {corr:.3f}', 
                           transform=axes[idx].transAxes, fontsize=12,
                           verticalalignment='top', bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
         
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/14_area_vs_production.png', dpi=300)
-        plt.close()
+        self.renderer.save(figure, '14_area_vs_production.png')
         
-        return None
+        print(correlations)
+        return correlations
     
+    @_charting
     def eda_15_rice_wheat_yield_states(self):
         """EDA 15: Rice vs Wheat Yield Across States"""
         print("\n" + "="*70)
         print("EDA 15: Rice vs Wheat Yield Across States")
         print("="*70)
         
-        state_yields = self.df.groupby('state_name').agg({
-            'rice_yield_kg_per_ha': 'mean',
-            'wheat_yield_kg_per_ha': 'mean'
-        }).dropna()
+        state_yields = self._aggregate('state_name', [
+            'rice_yield_kg_per_ha',
+            'wheat_yield_kg_per_ha'
+        ], 'mean').dropna()
         
         # Filter top states
         state_yields['total_yield'] = state_yields.sum(axis=1)
-        top10 = state_yields.nlargest(10, 'total_yield')
+        top10 = top_n(state_yields, 10, 'total_yield')
         
-        fig, ax = plt.subplots(figsize=(14, 7))
+        figure = self.renderer.figure('wide')
+        ax = figure.ax()
         x = np.arange(len(top10))
         width = 0.35
         
@@ -506,13 +568,16 @@ class AgriEDAVisualizer:
         ax.legend()
         ax.grid(axis='y', alpha=0.3)
         
-        plt.tight_layout()
-        plt.savefig(f'{OUTPUT_DIR}/15_rice_wheat_yield_states.png', dpi=300)
-        plt.close()
+        self.renderer.save(figure, '15_rice_wheat_yield_states.png')
         
         print(top10)
         return top10
     
+    def export_interactive(self, output_dir='html_exports', max_points=2000):
+        """Write the 15 charts as Plotly HTML sharing one plotly.js bundle"""
+        from interactive_export import InteractiveExporter
+        return InteractiveExporter(self, output_dir, max_points=max_points).export_all()
+    
     def generate_all_visualizations(self):
         """Generate all 15 required visualizations"""
         print("\n" + "🌾"*35)
@@ -538,15 +603,35 @@ class AgriEDAVisualizer:
         print("\n" + "="*70)
         print("✓ ALL 15 VISUALIZATIONS GENERATED SUCCESSFULLY!")
         print(f"✓ Saved to: {OUTPUT_DIR}/")
+        render = self.renderer.stats()
+        print(f"✓ Rendered {render['charts']} charts ({', '.join(render['profiles'])}): "
+              f"{render['draw_seconds']:.2f}s drawing, {render['encode_seconds']:.2f}s encoding")
+        self.renderer.close()
+        stats = self.cache_stats()
+        print(f"✓ Aggregation cache: {stats['hit_rate']:.0%} hit rate, "
+              f"{stats['entries']} entries, {stats['bytes_held'] / 1024:.1f} KB held")
         print("="*70)
 
 # Main execution
 if __name__ == "__main__":
-    # Path to cleaned data
-    DATA_PATH = '../data/processed/agri_data_cleaned.csv'
+    warnings.filterwarnings('ignore')
+    
+    parser = argparse.ArgumentParser(description='Generate the 15 EDA charts')
+    parser.add_argument('--data', default='../data/processed/agri_data_cleaned.csv',
+                        help='path to cleaned data')
+    parser.add_argument('--profiles', default='print',
+                        help='comma-separated PNG profiles: print, screen, thumbnail')
+    parser.add_argument('--interactive', action='store_true',
+                        help='also export self-contained Plotly HTML charts')
+    parser.add_argument('--html-dir', default='html_exports')
+    parser.add_argument('--max-points', type=int, default=2000,
+                        help='LTTB threshold for interactive line series')
+    args = parser.parse_args()
     
     # Create visualizer and generate all plots
-    visualizer = AgriEDAVisualizer(DATA_PATH)
+    visualizer = AgriEDAVisualizer(args.data, profiles=args.profiles.split(','))
     visualizer.generate_all_visualizations()
+    if args.interactive:
+        visualizer.export_interactive(args.html_dir, args.max_points)
     
     print("\n🎉 Project EDA Complete! Ready for Power BI integration.")
\ No newline at end of file
@@ -0,0 +1,190 @@
+"""
+AgriData Explorer - Correlation Engine
+File: analysis/correlation.py
+Purpose: Batched area-vs-production (and area-vs-yield) Pearson correlations
+         for every crop, nationally and per state/district, plus density-binned
+         scatter data for plots
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+CROP_COLUMN = re.compile(r'^(?P<crop>.+)_(?P<measure>area_1000_ha|production_1000_tons|yield_kg_per_ha)$')
+MEASURES = {'area_1000_ha': 'area', 'production_1000_tons': 'production', 'yield_kg_per_ha': 'yield'}
+
+# Pairs of (x, y) measures the engine correlates
+PAIRS = (('area', 'production'), ('area', 'yield'))
+
+
+def discover_crops(columns, measures=('area', 'production')):
+    """Crops that have a column for every requested measure
+
+    Returns {crop: {measure: column}} in column order.
+    """
+    crops = {}
+    for col in columns:
+        match = CROP_COLUMN.match(col)
+        if match:
+            crop = match.group('crop')
+            crops.setdefault(crop, {})[MEASURES[match.group('measure')]] = col
+    return {crop: cols for crop, cols in crops.items()
+            if all(m in cols for m in measures)}
+
+
+def grouped_moments(x, y, valid, codes, n_groups):
+    """Per-group n, sum x, sum y, sum x^2, sum y^2, sum xy for many series at once
+
+    ``x``, ``y`` and ``valid`` are (rows, k) arrays; invalid cells contribute
+    nothing. All k series and all groups are reduced by one ``np.add.reduceat``
+    over rows sorted by group code. Returns a (6, n_groups, k) array.
+    """
+    k = x.shape[1]
+    w = valid.astype(np.float64)
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+    features = np.concatenate([w, x, y, x * x, y * y, x * y], axis=1)
+
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = (np.cumsum(counts) - counts)[counts > 0]
+    reduced = np.add.reduceat(features[order], starts, axis=0) if len(starts) else \
+        np.zeros((0, features.shape[1]))
+
+    moments = np.zeros((n_groups, features.shape[1]))
+    moments[counts > 0] = reduced
+    return moments.reshape(n_groups, 6, k).transpose(1, 0, 2)
+
+
+def pearson_from_moments(moments, min_count=3):
+    """Pearson r from grouped moments; NaN where undefined or n < min_count"""
+    n, sx, sy, sxx, syy, sxy = moments
+    cov = n * sxy - sx * sy
+    var_x = n * sxx - sx * sx
+    var_y = n * syy - sy * sy
+    with np.errstate(invalid='ignore', divide='ignore'):
+        r = cov / np.sqrt(var_x * var_y)
+    r = np.clip(r, -1.0, 1.0)
+    r[(n < min_count) | (var_x <= 0) | (var_y <= 0)] = np.nan
+    return r
+
+
+class CorrelationEngine:
+    """Correlate area with production and yield for every crop in one pass
+
+    Only rows where both values are positive take part, matching the filter
+    used by the area-vs-production chart. Columns are centred on their global
+    mean first so the sum-of-products formula stays numerically stable.
+    """
+
+    def __init__(self, df, crops=None):
+        self.df = df
+        available = discover_crops(df.columns, measures=('area', 'production', 'yield'))
+        self.crops = {c: available[c] for c in (crops or available) if c in available}
+
+        area = self._matrix('area')
+        self.valid = {}
+        self.x = {}
+        self.y = {}
+        for x_measure, y_measure in PAIRS:
+            other = self._matrix(y_measure)
+            valid = (area > 0) & (other > 0)
+            self.valid[y_measure] = valid
+            self.x[y_measure] = self._centre(area, valid)
+            self.y[y_measure] = self._centre(other, valid)
+
+    def _matrix(self, measure):
+        cols = [self.crops[c][measure] for c in self.crops]
+        return self.df[cols].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    @staticmethod
+    def _centre(values, valid):
+        counts = valid.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(valid, values, 0.0).sum(axis=0) / counts
+        return values - np.nan_to_num(means)
+
+    def correlations(self, by=None, min_count=3):
+        """Long frame of correlations: [by..., crop, pair, n, corr]
+
+        ``by`` is None (national), a column name or a list of columns.
+        """
+        keys = [] if by is None else ([by] if isinstance(by, str) else list(by))
+        if keys:
+            grouped = self.df.groupby(keys, sort=True)
+            codes = grouped.ngroup().to_numpy()
+            labels = grouped.size().index.to_frame(index=False)
+        else:
+            codes = np.zeros(len(self.df), dtype=np.int64)
+            labels = pd.DataFrame(index=[0])
+        n_groups = len(labels)
+
+        # Stack every (x, y) pair side by side so one reduction covers all of them
+        pair_names = [y for _, y in PAIRS]
+        x = np.concatenate([self.x[p] for p in pair_names], axis=1)
+        y = np.concatenate([self.y[p] for p in pair_names], axis=1)
+        valid = np.concatenate([self.valid[p] for p in pair_names], axis=1)
+        moments = grouped_moments(x, y, valid, codes, n_groups)
+        corr = pearson_from_moments(moments, min_count)
+
+        crops = list(self.crops)
+        n_crops = len(crops)
+        group_idx = np.repeat(np.arange(n_groups), n_crops * len(pair_names))
+        result = labels.iloc[group_idx].reset_index(drop=True)
+        result['crop'] = np.tile(crops, n_groups * len(pair_names))
+        result['pair'] = np.tile(np.repeat([f'area_vs_{p}' for p in pair_names], n_crops),
+                                 n_groups)
+        result['n'] = moments[0].ravel().astype(np.int64)
+        result['corr'] = corr.ravel()
+        return result
+
+    def matrix(self, by=None, pair='area_vs_production', min_count=3):
+        """Wide view: one row per group, one column per crop"""
+        keys = [] if by is None else ([by] if isinstance(by, str) else list(by))
+        long = self.correlations(by, min_count)
+        long = long[long['pair'] == pair]
+        if not keys:
+            return long.set_index('crop')['corr']
+        return long.pivot_table(index=keys, columns='crop', values='corr',
+                                dropna=False)[list(self.crops)]
+
+    def all_levels(self, min_count=3):
+        """National, state and district correlations, keyed by level name"""
+        return {
+            'national': self.correlations(None, min_count),
+            'state': self.correlations('state_name', min_count),
+            'district': self.correlations(['state_name', 'district_name'], min_count),
+        }
+
+    def points(self, crop, y_measure='production'):
+        """Raw (x, y) values behind one correlation, filtered like the engine"""
+        cols = self.crops[crop]
+        data = self.df[[cols['area'], cols[y_measure]]].to_numpy(dtype=np.float64)
+        keep = (data[:, 0] > 0) & (data[:, 1] > 0)
+        return data[keep, 0], data[keep, 1]
+
+
+def density_bins(x, y, bins=60, log=False):
+    """Bin a scatter into a 2-D histogram so plots draw cells, not every point
+
+    Returns a frame of non-empty cells with their centre coordinates and point
+    counts. With ``log=True`` the binning is done on log10 axes.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if log:
+        keep = (x > 0) & (y > 0)
+        x, y = np.log10(x[keep]), np.log10(y[keep])
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    ix, iy = np.nonzero(counts)
+    x_centres = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centres = (y_edges[:-1] + y_edges[1:]) / 2
+    cells = pd.DataFrame({
+        'x': x_centres[ix],
+        'y': y_centres[iy],
+        'count': counts[ix, iy].astype(np.int64),
+    })
+    if log:
+        cells[['x', 'y']] = 10 ** cells[['x', 'y']]
+    return cells
@@ -0,0 +1,222 @@
+"""
+AgriData Explorer - Yield Forecasting
+File: analysis/forecast.py
+Purpose: Linear and robust (Huber) trend fits for every district x crop yield
+         series at once, with next-season forecasts and prediction intervals
+"""
+
+import argparse
+import time
+
+import numpy as np
+from scipy.stats import t as student_t
+
+from timeseries import DistrictTimeSeries
+
+METHODS = ('ols', 'huber')
+
+# Huber tuning constant (95% efficiency under normal errors) and the MAD
+# factor that makes the median absolute residual a consistent sigma
+HUBER_K = 1.345
+MAD_SCALE = 0.6745
+
+
+def weighted_trend(y, weights, t):
+    """Weighted least-squares line through every row of ``y`` at once
+
+    ``y`` is (series, years) with missing cells already zeroed, ``weights``
+    the matching (series, years) weights (0 for missing) and ``t`` the
+    centred year offsets. The 2x2 normal equations of all series are formed
+    with two matrix products and solved in closed form. Returns
+    (intercept, slope, sums) where sums = (S0, S1, S2) are the weighted
+    moments of ``t`` needed for prediction variances.
+    """
+    wy = weights * y
+    s0 = weights.sum(axis=1)
+    s1 = weights @ t
+    s2 = weights @ (t * t)
+    sy = wy.sum(axis=1)
+    sty = wy @ t
+    with np.errstate(divide='ignore', invalid='ignore'):
+        det = s0 * s2 - s1 * s1
+        slope = (s0 * sty - s1 * sy) / det
+        intercept = (sy - slope * s1) / s0
+    return intercept, slope, (s0, s1, s2)
+
+
+class YieldForecaster:
+    """Trend models and forecasts for every district x crop yield series
+
+    The yield cube of a ``DistrictTimeSeries`` (zero and sentinel yields are
+    gaps) is flattened to one row per district and crop, and every row is
+    fitted by the same handful of array operations - there is no per-series
+    Python loop. ``method='huber'`` re-weights the fit by iteratively
+    reweighted least squares so drought years and reporting errors pull the
+    trend less; its intervals treat the final weights as fixed and are
+    approximate.
+
+    Series with fewer than ``min_years`` observed years (within the last
+    ``window`` years, if given) are not forecast.
+    """
+
+    def __init__(self, series, method='ols', min_years=5, window=None, horizon=1, level=0.95,
+                 huber_k=HUBER_K, max_iter=50, tol=1e-6):
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r}; expected one of {METHODS}")
+        if min_years < 3:
+            raise ValueError("min_years must be at least 3 for a trend with an interval")
+        self.series = series
+        self.method = method
+        self.min_years = min_years
+        self.window = window
+        self.horizon = horizon
+        self.level = level
+        self.huber_k = huber_k
+        self.max_iter = max_iter
+        self.tol = tol
+        self.iterations = 0
+        self.unconverged = 0
+        self.fitted = None
+
+    @classmethod
+    def from_csv(cls, data_path, crops=None, **kwargs):
+        """Forecaster over the yield columns of a cleaned CSV"""
+        return cls(DistrictTimeSeries.from_csv(data_path, crops=crops, measure='yield',
+                                               positive_only=True), **kwargs)
+
+    def _matrix(self):
+        """(district*crop, years) float64 matrix and the years it covers"""
+        values = self.series.values
+        years = self.series.years
+        if self.window is not None:
+            values, years = values[:, -self.window:], years[-self.window:]
+        n_districts, n_years, n_crops = values.shape
+        y = values.transpose(0, 2, 1).reshape(n_districts * n_crops, n_years)
+        return y.astype(np.float64), years
+
+    def fit(self):
+        """Fit all series; returns self"""
+        y, years = self._matrix()
+        valid = ~np.isnan(y)
+        counts = valid.sum(axis=1)
+        self.fitted = np.flatnonzero(counts >= self.min_years)
+        y, valid, counts = y[self.fitted], valid[self.fitted], counts[self.fitted]
+        y = np.where(valid, y, 0.0)
+
+        # Centre the time axis so the normal equations stay well conditioned
+        self.t_mean = years.mean()
+        t = (years - self.t_mean).astype(np.float64)
+        weights = valid.astype(np.float64)
+        intercept, slope, sums = weighted_trend(y, weights, t)
+
+        self.iterations = self.unconverged = 0
+        if self.method == 'huber':
+            active = np.ones(len(y), dtype=bool)
+            for self.iterations in range(1, self.max_iter + 1):
+                # Only series that have not converged are re-weighted and refitted
+                rows = np.flatnonzero(active)
+                y_a, valid_a = y[rows], valid[rows]
+                resid = np.where(valid_a, y_a - intercept[rows, None] - slope[rows, None] * t, np.nan)
+                scale = np.nanmedian(np.abs(resid), axis=1) / MAD_SCALE
+                # A perfect fit has zero scale; keep unit weights there
+                cutoff = self.huber_k * np.where(scale > 0, scale, np.inf)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    weights[rows] = np.where(valid_a, np.minimum(1.0, cutoff[:, None] / np.abs(resid)), 0.0)
+                new_intercept, new_slope, new_sums = weighted_trend(y_a, weights[rows], t)
+                change = np.maximum(np.abs(new_intercept - intercept[rows]),
+                                    np.abs(new_slope - slope[rows]) * np.abs(t).max())
+                intercept[rows], slope[rows] = new_intercept, new_slope
+                for total, new in zip(sums, new_sums):
+                    total[rows] = new
+                active[rows[change <= self.tol * (1.0 + np.abs(new_intercept))]] = False
+                if not active.any():
+                    break
+            self.unconverged = int(active.sum())
+
+        resid = np.where(valid, y - intercept[:, None] - slope[:, None] * t, 0.0)
+        dof = counts - 2
+        self.sigma = np.sqrt((weights * resid * resid).sum(axis=1) / dof)
+        self.intercept, self.slope, self.sums = intercept, slope, sums
+        self.counts, self.dof = counts, dof
+        self.last_year = years[len(years) - 1 - np.argmax(valid[:, ::-1], axis=1)]
+        self.last_observed_year = int(years[-1])
+        return self
+
+    def predict(self):
+        """(forecast, lower, upper) arrays of shape (fitted series, horizon)"""
+        if self.fitted is None:
+            self.fit()
+        t0 = (np.arange(1, self.horizon + 1) + self.last_observed_year - self.t_mean)[None, :]
+        s0, s1, s2 = (s[:, None] for s in self.sums)
+        forecast = self.intercept[:, None] + self.slope[:, None] * t0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            leverage = (s2 - 2 * t0 * s1 + t0 * t0 * s0) / (s0 * s2 - s1 * s1)
+        se = self.sigma[:, None] * np.sqrt(1.0 + leverage)
+        margin = student_t.ppf((1 + self.level) / 2, self.dof)[:, None] * se
+        # Yields cannot go negative
+        return (np.maximum(forecast, 0.0), np.maximum(forecast - margin, 0.0),
+                np.maximum(forecast + margin, 0.0))
+
+    def to_frame(self):
+        """Long forecast frame, one row per district, crop and forecast year"""
+        forecast, lower, upper = self.predict()
+        n_crops = len(self.series.crops)
+        district = self.fitted // n_crops
+        crop = np.asarray(self.series.crops, dtype=object)[self.fitted % n_crops]
+
+        frame = self.series.districts[district].to_frame(index=False)
+        frame['crop'] = crop
+        frame['n_years'] = self.counts
+        frame['last_year'] = self.last_year
+        frame['trend_kg_per_ha_per_year'] = self.slope.round(4)
+        frame = frame.loc[frame.index.repeat(self.horizon)].reset_index(drop=True)
+        frame['forecast_year'] = np.tile(np.arange(1, self.horizon + 1), len(self.fitted)) \
+            + self.last_observed_year
+        frame['yield_forecast_kg_per_ha'] = forecast.reshape(-1).round(2)
+        frame['yield_lower_kg_per_ha'] = lower.reshape(-1).round(2)
+        frame['yield_upper_kg_per_ha'] = upper.reshape(-1).round(2)
+        frame['method'] = self.method
+        frame['interval_level'] = self.level
+        return frame
+
+    def summary(self):
+        """Counts of fitted and skipped series"""
+        total = len(self.series.districts) * len(self.series.crops)
+        return {
+            'series': total,
+            'fitted': len(self.fitted),
+            'skipped': total - len(self.fitted),
+            'iterations': self.iterations,
+            'unconverged': self.unconverged,
+        }
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='District x crop yield forecasts')
+    parser.add_argument('--data', default='../data/processed/agri_data_cleaned.csv')
+    parser.add_argument('--output', default='../data/processed/yield_forecasts.csv')
+    parser.add_argument('--method', choices=METHODS, default='huber')
+    parser.add_argument('--horizon', type=int, default=1, help='seasons ahead to forecast')
+    parser.add_argument('--window', type=int, default=None, help='fit only the last N years')
+    parser.add_argument('--min-years', type=int, default=5)
+    parser.add_argument('--level', type=float, default=0.95, help='prediction interval level')
+    args = parser.parse_args()
+
+    forecaster = YieldForecaster.from_csv(args.data, method=args.method, min_years=args.min_years,
+                                          window=args.window, horizon=args.horizon,
+                                          level=args.level)
+    started = time.perf_counter()
+    forecasts = forecaster.fit().to_frame()
+    elapsed = time.perf_counter() - started
+    forecasts.to_csv(args.output, index=False)
+
+    summary = forecaster.summary()
+    print("="*60)
+    print(f"YIELD FORECASTS ({args.method.upper()}, {args.level:.0%} intervals)")
+    print("="*60)
+    print(f"Series fitted: {summary['fitted']:,} of {summary['series']:,} "
+          f"({summary['skipped']:,} with fewer than {args.min_years} years)")
+    print(f"Fit and forecast time: {elapsed * 1000:.1f} ms "
+          f"({summary['fitted'] / elapsed:,.0f} series/s)")
+    print(f"Saved {len(forecasts):,} forecasts to {args.output}")
@@ -0,0 +1,156 @@
+"""
+AgriData Explorer - Geographic Hierarchy Index
+File: analysis/geo_index.py
+Purpose: Region -> state -> district index over the cleaned frame so
+         slices at any level read only their own rows, plus rollups
+         from contiguous offset ranges
+"""
+
+import numpy as np
+import pandas as pd
+
+# Hierarchy levels, outermost first, and the frame column behind each
+LEVELS = {
+    'region': 'region',
+    'state': 'state_name',
+    'district': 'district_name',
+}
+
+
+class GeoIndex:
+    """Sorted offset ranges for each region, state and district
+
+    Row positions are sorted once by (region, state, district), with a
+    stable sort so each group keeps the frame's row order. Because the
+    levels nest, every region, state and district is one contiguous range
+    ``[start, stop)`` of that permutation, and a slice is a ``take`` of just
+    those positions instead of a full-frame boolean mask. Districts are
+    keyed by ``(state_name, district_name)`` since district names repeat
+    across states. Without a ``region`` column the index has state and
+    district levels only. Rows with a NaN label at a level (``factorize``
+    code -1) belong to no member of that level or the levels below it.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.levels = [level for level, col in LEVELS.items() if col in df.columns]
+        columns = [LEVELS[level] for level in self.levels]
+
+        codes, self.labels = [], {}
+        for level, col in zip(self.levels, columns):
+            level_codes, uniques = pd.factorize(df[col], sort=True)
+            codes.append(level_codes)
+            self.labels[level] = uniques
+        # np.lexsort sorts by the last key first
+        self.order = np.lexsort(codes[::-1]) if codes else np.arange(len(df))
+
+        self.ranges = {}
+        for depth, level in enumerate(self.levels):
+            path = np.column_stack([c[self.order] for c in codes[:depth + 1]])
+            starts = np.flatnonzero(np.r_[True, (path[1:] != path[:-1]).any(axis=1)])
+            stops = np.r_[starts[1:], len(self.order)]
+            first = path[starts]
+            self.ranges[level] = {self._key(level, first[i]): (int(start), int(stop))
+                                  for i, (start, stop) in enumerate(zip(starts, stops))
+                                  if (first[i] >= 0).all()}
+
+    def _key(self, level, path_codes):
+        """Label for a level from the codes of its path (district -> (state, district))"""
+        if level == 'district':
+            state_depth = self.levels.index('state')
+            return (self.labels['state'][path_codes[state_depth]],
+                    self.labels['district'][path_codes[-1]])
+        return self.labels[level][path_codes[-1]]
+
+    def __len__(self):
+        return len(self.order)
+
+    def members(self, level):
+        """Labels present at a level, in index order"""
+        return list(self.ranges[level])
+
+    def children(self, level, label):
+        """Labels one level down that fall inside ``label``'s range"""
+        start, stop = self.ranges[level][label]
+        child = self.levels[self.levels.index(level) + 1]
+        return [key for key, (s, e) in self.ranges[child].items() if start <= s and e <= stop]
+
+    def rows(self, level, *labels):
+        """Ascending row positions of one or more labels at ``level``"""
+        spans = [self.ranges[level][label] for label in labels if label in self.ranges[level]]
+        if not spans:
+            return np.empty(0, dtype=np.int64)
+        # Each range is in frame order per district; sort so slices keep frame order
+        return np.sort(np.concatenate([self.order[start:stop] for start, stop in spans]))
+
+    def slice(self, level, *labels, columns=None):
+        """Rows of the frame for regions, states or districts (a copy of those rows only)"""
+        frame = self.df if columns is None else self.df[columns]
+        return frame.take(self.rows(level, *labels))
+
+    def lookup(self, where):
+        """Resolve hierarchy predicates of a normalized equality filter to row positions
+
+        ``where`` is a tuple of (column, value) pairs as produced by
+        ``caching.normalize_where``. Returns (positions or None, remaining
+        predicates); the narrowest indexed level is used and the other
+        predicates are left for the caller to apply to those rows.
+        """
+        by_column = dict(where)
+        level = column = None
+        if 'state_name' in by_column and 'state' in self.levels:
+            level, column = 'state', 'state_name'
+            if 'district_name' in by_column:
+                states, districts = by_column['state_name'], by_column['district_name']
+                states = states if isinstance(states, tuple) else (states,)
+                districts = districts if isinstance(districts, tuple) else (districts,)
+                rows = self.rows('district', *[(s, d) for s in states for d in districts])
+                return rows, tuple(p for p in where if p[0] not in ('state_name', 'district_name'))
+        elif 'region' in by_column and 'region' in self.levels:
+            level, column = 'region', 'region'
+        if level is None:
+            return None, where
+        value = by_column[column]
+        rows = self.rows(level, *(value if isinstance(value, tuple) else (value,)))
+        return rows, tuple(p for p in where if p[0] != column)
+
+    def rollup(self, columns, level='region', aggfunc='sum'):
+        """Per-member sum/count/mean of ``columns`` at ``level`` from the offset ranges
+
+        Values are gathered once in index order and reduced with
+        ``np.add.reduceat`` over each member's contiguous range.
+        """
+        single = isinstance(columns, str)
+        cols = [columns] if single else list(columns)
+        spans = self.ranges[level]
+        # Ranges need not be adjacent (NaN-label rows sit between them): reduce
+        # over [start, stop) pairs and keep every other sum
+        bounds = np.array(list(spans.values()), dtype=np.int64).reshape(-1)
+        if level == 'district':
+            index = pd.MultiIndex.from_tuples(list(spans), names=['state_name', 'district_name'])
+        else:
+            index = pd.Index(list(spans), name=LEVELS[level])
+
+        out = {}
+        for col in cols:
+            values = self.df[col].to_numpy(dtype=np.float64, na_value=np.nan)[self.order]
+            valid = ~np.isnan(values)
+            # One padding cell so a range may stop at the end of the frame
+            counts = np.add.reduceat(np.r_[valid.astype(np.float64), 0.0], bounds)[::2]
+            if aggfunc == 'count':
+                out[col] = counts
+                continue
+            sums = np.add.reduceat(np.r_[np.where(valid, values, 0.0), 0.0], bounds)[::2]
+            if aggfunc == 'sum':
+                out[col] = sums
+            elif aggfunc == 'mean':
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    out[col] = np.where(counts > 0, sums / counts, np.nan)
+            else:
+                raise ValueError(f"Unsupported rollup aggfunc: {aggfunc}")
+        result = pd.DataFrame(out, index=index)
+        return result[cols[0]] if single else result
+
+    def nbytes(self):
+        """Memory held by the permutation (the range tables are per-member, not per-row)"""
+        return int(self.order.nbytes)
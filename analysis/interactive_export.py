@@ -0,0 +1,315 @@
+"""
+AgriData Explorer - Interactive Chart Export
+File: analysis/interactive_export.py
+Purpose: Plotly HTML versions of the 15 EDA charts with bounded payloads:
+         long series are LTTB-downsampled, dense scatters density-binned,
+         and all files share one plotly.js bundle
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from correlation import CorrelationEngine, density_bins
+from ranking import top_n
+
+HTML_DIR = 'html_exports'
+BUNDLE = 'plotly.min.js'
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets downsampling of a series sorted by x
+
+    Keeps the first and last points and, from each of ``threshold - 2``
+    equal-count buckets, the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket. Returns the
+    indices of the kept points.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean() if next_stop > stop else x[-1]
+        next_y = y[stop:next_stop].mean() if next_stop > stop else y[-1]
+        px, py = x[previous], y[previous]
+        area = np.abs((px - next_x) * (y[start:stop] - py) - (px - x[start:stop]) * (next_y - py))
+        previous = start + int(np.argmax(area))
+        kept[i + 1] = previous
+    return kept
+
+
+def downsample(series, max_points):
+    """LTTB-downsample a Series indexed by x when it is longer than max_points"""
+    if len(series) <= max_points:
+        return series
+    series = series.dropna().sort_index()
+    return series.iloc[lttb(series.index.to_numpy(), series.to_numpy(), max_points)]
+
+
+class InteractiveExporter:
+    """Write Plotly HTML for each AgriEDAVisualizer chart
+
+    Aggregations go through the visualizer's ``_aggregate`` so they share its
+    cache (or warehouse push-down). Every HTML file references a single
+    ``plotly.min.js`` copied next to them, so the library ships once rather
+    than inlined in all 15 files.
+    """
+
+    def __init__(self, visualizer, output_dir=HTML_DIR, max_points=2000, bins=60,
+                 scatter_mode='density'):
+        self.vis = visualizer
+        self.output_dir = output_dir
+        self.max_points = max_points
+        self.bins = bins
+        self.scatter_mode = scatter_mode
+        self.payloads = {}
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _bar(self, series, title, color, xlabel, ylabel, horizontal=False):
+        if horizontal:
+            trace = go.Bar(x=series.values, y=series.index.astype(str), orientation='h',
+                           marker_color=color)
+        else:
+            trace = go.Bar(x=series.index.astype(str), y=series.values, marker_color=color)
+        fig = go.Figure(trace)
+        fig.update_layout(title=title, xaxis_title=xlabel, yaxis_title=ylabel)
+        if horizontal:
+            fig.update_yaxes(autorange='reversed')
+        return fig
+
+    def _lines(self, frame, names, title, ylabel):
+        fig = go.Figure()
+        for column, (label, color) in names.items():
+            series = downsample(frame[column], self.max_points)
+            fig.add_trace(go.Scatter(x=series.index, y=series.values, mode='lines+markers',
+                                     name=label, line_color=color))
+        fig.update_layout(title=title, xaxis_title='Year', yaxis_title=ylabel)
+        return fig
+
+    def write(self, name, fig):
+        """Write one chart and record its payload size"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f'{name}.html')
+        fig.update_layout(template='plotly_white')
+        fig.write_html(path, include_plotlyjs='directory', full_html=True)
+        self.payloads[name] = os.path.getsize(path)
+        return path
+
+    # ------------------------------------------------------------------
+    # Charts
+    # ------------------------------------------------------------------
+    def charts(self):
+        """(file name, figure builder) for the 15 EDA charts"""
+        return [
+            ('01_top7_rice_states', self.top_states('rice_production_1000_tons', 7,
+                                                    'Top 7 Rice Producing States in India',
+                                                    '#2ecc71', 'Rice')),
+            ('02_top5_wheat_states', self.wheat_bar_pie),
+            ('03_top5_oilseed_states', self.top_states('oilseeds_production_1000_tons', 5,
+                                                       'Top 5 Oilseed Producing States',
+                                                       '#f39c12', 'Oilseed', horizontal=True)),
+            ('04_top7_sunflower_states', self.top_states('sunflower_production_1000_tons', 7,
+                                                         'Top 7 Sunflower Producing States',
+                                                         '#f1c40f', 'Sunflower')),
+            ('05_sugarcane_50years', lambda: self._lines(
+                self.vis._aggregate('year', ['sugarcane_production_1000_tons']),
+                {'sugarcane_production_1000_tons': ('Sugarcane', '#16a085')},
+                "India's Sugarcane Production (Last 50 Years)", 'Production (1000 tons)')),
+            ('06_rice_vs_wheat_50years', lambda: self._lines(
+                self.vis._aggregate('year', ['rice_production_1000_tons',
+                                             'wheat_production_1000_tons']),
+                {'rice_production_1000_tons': ('Rice', '#27ae60'),
+                 'wheat_production_1000_tons': ('Wheat', '#e67e22')},
+                'Rice vs Wheat Production in India (50 Years)', 'Production (1000 tons)')),
+            ('07_wb_districts_rice', lambda: self._bar(
+                top_n(self.vis._aggregate('district_name', 'rice_production_1000_tons',
+                                          where={'state_name': 'West Bengal'}), 10),
+                'Top 10 Rice Producing Districts in West Bengal', '#3498db',
+                'Rice Production (1000 tons)', 'District', horizontal=True)),
+            ('08_up_wheat_top10_years', lambda: self._bar(
+                top_n(self.vis._aggregate('year', 'wheat_production_1000_tons',
+                                          where={'state_name': 'Uttar Pradesh'}), 10),
+                'Top 10 Wheat Production Years in Uttar Pradesh', '#e74c3c',
+                'Year', 'Wheat Production (1000 tons)')),
+            ('09_millet_50years', self.millets),
+            ('10_sorghum_by_region', self.sorghum_by_region),
+            ('11_groundnut_top7', self.top_states('groundnut_production_1000_tons', 7,
+                                                  'Top 7 Groundnut Producing States',
+                                                  '#d35400', 'Groundnut')),
+            ('12_soybean_top5_yield', self.soybean),
+            ('13_oilseed_major_states', self.oilseed_composition),
+            ('14_area_vs_production', self.area_vs_production),
+            ('15_rice_wheat_yield_states', self.rice_wheat_yield),
+        ]
+
+    def top_states(self, column, n, title, color, crop, horizontal=False):
+        def build():
+            series = top_n(self.vis._aggregate('state_name', column), n)
+            label = f'{crop} Production (1000 tons)'
+            if horizontal:
+                return self._bar(series, title, color, label, 'State', horizontal=True)
+            return self._bar(series, title, color, 'State', label)
+        return build
+
+    def sorghum_by_region(self):
+        column = 'sorghum_production_1000_tons'
+        top8 = top_n(self.vis._aggregate('state_name', column), 8)
+        regions = self.vis._region_totals(column)
+        if regions is None:
+            return self._bar(top8, 'Top 8 Sorghum Producing States', '#9b59b6',
+                             'State', 'Sorghum Production (1000 tons)')
+        regions = regions.sort_values(ascending=False)
+        fig = make_subplots(rows=1, cols=2, column_widths=[0.35, 0.65],
+                            subplot_titles=('Sorghum Production by Region',
+                                            'Top 8 Sorghum Producing States'))
+        fig.add_trace(go.Bar(x=regions.index, y=regions.values, marker_color='#8e44ad',
+                             showlegend=False), 1, 1)
+        fig.add_trace(go.Bar(x=top8.index, y=top8.values, marker_color='#9b59b6',
+                             showlegend=False), 1, 2)
+        fig.update_yaxes(title_text='Sorghum Production (1000 tons)', row=1, col=1)
+        return fig
+
+    def wheat_bar_pie(self):
+        top5 = top_n(self.vis._aggregate('state_name', 'wheat_production_1000_tons'), 5)
+        fig = make_subplots(rows=1, cols=2, specs=[[{'type': 'xy'}, {'type': 'domain'}]],
+                            subplot_titles=('Top 5 Wheat Producing States',
+                                            'Wheat Production Share (%)'))
+        fig.add_trace(go.Bar(x=top5.index, y=top5.values, marker_color='#e74c3c',
+                             showlegend=False), 1, 1)
+        fig.add_trace(go.Pie(labels=top5.index, values=top5.values, pull=[0.05] * len(top5),
+                             marker_colors=['#e74c3c', '#e67e22', '#f39c12', '#f1c40f', '#d35400']),
+                      1, 2)
+        return fig
+
+    def millets(self):
+        yearly = self.vis._aggregate('year', ['pearl_millet_production_1000_tons',
+                                              'finger_millet_production_1000_tons'])
+        yearly['total_millet'] = yearly.sum(axis=1)
+        return self._lines(yearly, {
+            'pearl_millet_production_1000_tons': ('Pearl Millet', '#1f77b4'),
+            'finger_millet_production_1000_tons': ('Finger Millet', '#ff7f0e'),
+            'total_millet': ('Total Millet', 'black'),
+        }, 'Millet Production Trends (50 Years)', 'Production (1000 tons)')
+
+    def soybean(self):
+        prod = [c for c in self.vis.columns if 'soybean' in c and 'production' in c]
+        yld = [c for c in self.vis.columns if 'soybean' in c and 'yield' in c]
+        if not prod or not yld:
+            return None
+        state = self.vis._aggregate('state_name', [prod[0], yld[0]],
+                                    {prod[0]: 'sum', yld[0]: 'mean'})
+        top5 = top_n(state, 5, prod[0])
+        fig = make_subplots(rows=1, cols=2, subplot_titles=('Top 5 Soybean Producing States',
+                                                            'Average Soybean Yield'))
+        fig.add_trace(go.Bar(x=top5.index, y=top5[prod[0]], marker_color='#1abc9c',
+                             name='Production (1000 tons)'), 1, 1)
+        fig.add_trace(go.Bar(x=top5.index, y=top5[yld[0]], marker_color='#16a085',
+                             name='Yield (kg/ha)'), 1, 2)
+        return fig
+
+    def oilseed_composition(self):
+        crops = {}
+        for crop in ['groundnut', 'soybean', 'sunflower', 'rapeseed']:
+            cols = [c for c in self.vis.columns if crop in c and 'production' in c]
+            if cols:
+                crops[crop] = cols[0]
+        if not crops:
+            return None
+        state = self.vis._aggregate('state_name', list(crops.values()))
+        data = state.loc[top_n(state.sum(axis=1), 5).index]
+        fig = go.Figure([go.Bar(x=data.index, y=data[col], name=crop) for crop, col in crops.items()])
+        fig.update_layout(barmode='stack', title='Oilseed Composition in Major States',
+                          xaxis_title='State', yaxis_title='Production (1000 tons)')
+        return fig
+
+    def area_vs_production(self):
+        crops = [('rice', 'Rice', '#27ae60'), ('wheat', 'Wheat', '#e67e22'),
+                 ('maize', 'Maize', '#f39c12')]
+        names = [crop for crop, _, _ in crops]
+        if self.vis.df is None:
+            correlations, engine = self.vis.source.correlations(names), None
+        else:
+            engine = CorrelationEngine(self.vis.df, crops=names)
+            correlations = engine.matrix()
+
+        fig = make_subplots(rows=1, cols=3, subplot_titles=[
+            f'{label}: Area vs Production (corr {correlations[crop]:.3f})'
+            for crop, label, _ in crops])
+        for i, (crop, label, color) in enumerate(crops, start=1):
+            if engine is not None and self.scatter_mode == 'lttb':
+                area, production = engine.points(crop)
+                order = np.argsort(area, kind='stable')
+                kept = order[lttb(area[order], production[order], self.max_points)]
+                trace = go.Scattergl(x=area[kept], y=production[kept], mode='markers',
+                                     marker=dict(color=color, size=4), name=label)
+            else:
+                if engine is None:
+                    cells = self.vis.source.density_bins(crop, bins=self.bins)
+                else:
+                    cells = density_bins(*engine.points(crop), bins=self.bins)
+                # One marker per occupied cell, shaded by log point count
+                trace = go.Scattergl(
+                    x=cells['x'], y=cells['y'], mode='markers', name=label,
+                    text=cells['count'], hovertemplate='area %{x:.1f}<br>production %{y:.1f}'
+                                                       '<br>%{text} district-years',
+                    marker=dict(color=np.log10(cells['count'].to_numpy(np.float64)),
+                                colorscale=[[0, 'white'], [1, color]], size=6, symbol='square'))
+            fig.add_trace(trace, 1, i)
+            fig.update_xaxes(title_text='Area (1000 ha)', row=1, col=i)
+            fig.update_yaxes(title_text='Production (1000 tons)', row=1, col=i)
+        fig.update_layout(showlegend=False)
+        return fig
+
+    def rice_wheat_yield(self):
+        yields = self.vis._aggregate('state_name', ['rice_yield_kg_per_ha',
+                                                    'wheat_yield_kg_per_ha'], 'mean').dropna()
+        yields['total_yield'] = yields.sum(axis=1)
+        top10 = top_n(yields, 10, 'total_yield')
+        fig = go.Figure([
+            go.Bar(x=top10.index, y=top10['rice_yield_kg_per_ha'], name='Rice', marker_color='#27ae60'),
+            go.Bar(x=top10.index, y=top10['wheat_yield_kg_per_ha'], name='Wheat', marker_color='#e67e22'),
+        ])
+        fig.update_layout(barmode='group', title='Rice vs Wheat Yield: Top 10 States',
+                          xaxis_title='State', yaxis_title='Yield (kg/ha)')
+        return fig
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    def export_all(self):
+        """Write every chart and print per-chart payload bytes"""
+        for name, build in self.charts():
+            fig = build()
+            if fig is None:
+                print(f"⚠️  {name}: required columns not found. Skipping...")
+                continue
+            self.write(name, fig)
+        self.report()
+        return self.payloads
+
+    def report(self):
+        bundle = os.path.join(self.output_dir, BUNDLE)
+        bundle_bytes = os.path.getsize(bundle) if os.path.exists(bundle) else 0
+        total = sum(self.payloads.values())
+        print("\n" + "="*70)
+        print("INTERACTIVE EXPORT PAYLOADS")
+        print("="*70)
+        for name, nbytes in self.payloads.items():
+            print(f"{name:32s} {nbytes / 1024:>10,.1f} KB")
+        print(f"{'charts total':32s} {total / 1024:>10,.1f} KB")
+        print(f"{'shared ' + BUNDLE:32s} {bundle_bytes / 1024:>10,.1f} KB (once, not per chart)")
+        print(f"✓ Saved to: {self.output_dir}/")
@@ -0,0 +1,264 @@
+"""
+AgriData Explorer - Out-of-Core Aggregation
+File: analysis/out_of_core.py
+Purpose: Grouped sum/count/min/max/mean over inputs larger than memory,
+         streamed from CSV chunks or Parquet row batches with compact
+         per-group accumulators that spill to disk past a memory budget
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+STATS = ('sum', 'count', 'min', 'max', 'mean')
+
+# Standard grouping levels of the cleaned dataset
+GROUPINGS = {
+    'state': ['state_name'],
+    'district': ['state_name', 'district_name'],
+    'year': ['year'],
+    'decade': ['decade'],
+}
+
+
+def iter_chunks(path, columns=None, chunk_size=200000):
+    """Yield DataFrame chunks from a CSV file or a Parquet file/directory"""
+    if path.endswith('.parquet') or os.path.isdir(path):
+        try:
+            import pyarrow.dataset as ds
+        except ImportError:
+            raise ImportError("Reading Parquet requires pyarrow: pip install pyarrow")
+        dataset = ds.dataset(path, format='parquet')
+        for batch in dataset.to_batches(columns=columns, batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_size)
+
+
+class GroupAccumulator:
+    """Running sum/count/min/max per group for a fixed set of value columns
+
+    Groups are assigned dense slots as they are first seen, and each slot
+    holds float64 sum/min/max and int64 count arrays. Every chunk is
+    reduced with a vectorized groupby before it is merged, so the work per
+    chunk scales with its group count, not its row count. When the
+    accumulators exceed ``memory_budget`` bytes they are hash-partitioned
+    by key into ``spill_dir`` and reset. ``result()`` then combines each
+    partition separately, so at most one partition's groups are held in
+    memory at a time.
+
+    Counts, minima and maxima match an in-memory groupby exactly. Sums are
+    merged with compensated (TwoSum) addition, so sums and means agree with
+    pandas to the last bit or two of float64 whatever the chunking.
+    """
+
+    def __init__(self, keys, columns, memory_budget=256 * 1024 * 1024, spill_dir=None,
+                 partitions=16):
+        self.keys = list(keys)
+        self.columns = list(columns)
+        self.memory_budget = memory_budget
+        self.partitions = partitions
+        self.spill_dir = spill_dir
+        self.spills = 0
+        self.rows = 0
+        self._reset()
+
+    def _reset(self):
+        k = len(self.columns)
+        self.index = None
+        self.sums = np.zeros((0, k))
+        self.comps = np.zeros((0, k))
+        self.counts = np.zeros((0, k), dtype=np.int64)
+        self.mins = np.zeros((0, k))
+        self.maxs = np.zeros((0, k))
+
+    @property
+    def n_groups(self):
+        return 0 if self.index is None else len(self.index)
+
+    def nbytes(self):
+        index_bytes = 0 if self.index is None else int(self.index.memory_usage(deep=True))
+        return (self.sums.nbytes + self.comps.nbytes + self.counts.nbytes + self.mins.nbytes
+                + self.maxs.nbytes + index_bytes)
+
+    def update(self, chunk):
+        """Fold one chunk into the accumulators"""
+        self.rows += len(chunk)
+        grouped = chunk.groupby(self.keys, sort=False)[self.columns]
+        partial = grouped.agg(['sum', 'count', 'min', 'max'])
+        if partial.empty:
+            return
+        self._merge(partial.index,
+                    partial.xs('sum', axis=1, level=1).to_numpy(np.float64),
+                    partial.xs('count', axis=1, level=1).to_numpy(np.int64),
+                    partial.xs('min', axis=1, level=1).to_numpy(np.float64),
+                    partial.xs('max', axis=1, level=1).to_numpy(np.float64))
+        if self.nbytes() > self.memory_budget:
+            self.spill()
+
+    def _merge(self, index, sums, counts, mins, maxs, comps=None):
+        comps = np.zeros_like(sums) if comps is None else comps
+        if self.index is None:
+            self.index = index
+            self.sums, self.comps, self.mins, self.maxs = (
+                np.array(values, dtype=np.float64) for values in (sums, comps, mins, maxs))
+            self.counts = np.array(counts, dtype=np.int64)
+            return
+
+        slots = self.index.get_indexer(index)
+        new = slots < 0
+        if new.any():
+            slots[new] = np.arange(len(self.index), len(self.index) + new.sum())
+            self.index = self.index.append(index[new])
+            k = len(self.columns)
+            self.sums = np.vstack([self.sums, np.zeros((new.sum(), k))])
+            self.comps = np.vstack([self.comps, np.zeros((new.sum(), k))])
+            self.counts = np.vstack([self.counts, np.zeros((new.sum(), k), dtype=np.int64)])
+            self.mins = np.vstack([self.mins, np.full((new.sum(), k), np.nan)])
+            self.maxs = np.vstack([self.maxs, np.full((new.sum(), k), np.nan)])
+
+        # Slots within one partial are unique, so fancy-index updates are safe.
+        # Sums use TwoSum so the rounding error of each merge is carried in comps
+        # rather than lost, keeping totals independent of the chunking.
+        a = self.sums[slots]
+        total = a + sums
+        b_virtual = total - a
+        error = (a - (total - b_virtual)) + (sums - b_virtual)
+        self.sums[slots] = total
+        self.comps[slots] += error + comps
+        self.counts[slots] += counts
+        self.mins[slots] = np.fmin(self.mins[slots], mins)
+        self.maxs[slots] = np.fmax(self.maxs[slots], maxs)
+
+    def _frame(self):
+        """Accumulators as a frame with (column, stat) columns"""
+        parts = {'sum': self.sums, 'comp': self.comps, 'count': self.counts,
+                 'min': self.mins, 'max': self.maxs}
+        frames = [pd.DataFrame(values, index=self.index, columns=self.columns)
+                  for values in parts.values()]
+        return pd.concat(frames, axis=1, keys=list(parts)).swaplevel(axis=1)
+
+    def spill(self):
+        """Write the accumulators to hash partitions on disk and start over"""
+        if self.index is None:
+            return
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix='agri_ooc_')
+        frame = self._frame()
+        part = pd.util.hash_pandas_object(frame.index, index=False).to_numpy() % self.partitions
+        for p in np.unique(part):
+            path = os.path.join(self.spill_dir, f'part{p:03d}_{self.spills:05d}.pkl')
+            frame[part == p].to_pickle(path)
+        self.spills += 1
+        self._reset()
+
+    def _finalize(self, frame, stats):
+        out = {}
+        for column in self.columns:
+            total = frame[(column, 'sum')] + frame[(column, 'comp')]
+            count = frame[(column, 'count')].astype(np.int64)
+            values = {'sum': total, 'count': count, 'min': frame[(column, 'min')],
+                      'max': frame[(column, 'max')],
+                      'mean': total / count.where(count > 0)}
+            for stat in stats:
+                out[(column, stat)] = values[stat]
+        result = pd.DataFrame(out, index=frame.index)
+        result.index.names = self.keys
+        return result
+
+    def result(self, stats=STATS):
+        """Final aggregates, sorted by key like ``groupby(keys).agg(stats)``"""
+        if not self.spills:
+            if self.index is None:
+                return pd.DataFrame(columns=pd.MultiIndex.from_product([self.columns, stats]))
+            return self._finalize(self._frame(), stats).sort_index()
+
+        self.spill()
+        pieces = []
+        for p in range(self.partitions):
+            files = sorted(f for f in os.listdir(self.spill_dir) if f.startswith(f'part{p:03d}_'))
+            if not files:
+                continue
+            # Fold the spilled pieces back through _merge so partition totals
+            # get the same compensated summation as the in-memory path
+            for f in files:
+                piece = pd.read_pickle(os.path.join(self.spill_dir, f))
+                self._merge(piece.index, *(piece.xs(stat, axis=1, level=1).to_numpy()
+                                           for stat in ('sum', 'count', 'min', 'max', 'comp')))
+            combined = self._frame()
+            self._reset()
+            pieces.append(self._finalize(combined, stats))
+        return pd.concat(pieces).sort_index()
+
+    def cleanup(self):
+        """Remove spill files"""
+        if self.spill_dir and os.path.isdir(self.spill_dir):
+            shutil.rmtree(self.spill_dir)
+        self.spill_dir = None
+        self.spills = 0
+
+
+def aggregate_file(path, columns, groupings=None, memory_budget=256 * 1024 * 1024,
+                   chunk_size=200000, spill_dir=None, stats=STATS):
+    """Aggregate value columns at several grouping levels in one pass over ``path``
+
+    ``groupings`` maps a name to its key columns (default: state, district,
+    year and decade). A missing ``decade`` column is derived from ``year``.
+    The memory budget is shared equally between the groupings.
+    """
+    groupings = groupings or GROUPINGS
+    columns = list(columns)
+    keys = sorted({k for ks in groupings.values() for k in ks})
+    derive_decade = 'decade' in keys
+    needed = sorted(set(keys + columns + (['year'] if derive_decade else [])) - {'decade'})
+
+    accumulators = {
+        name: GroupAccumulator(ks, columns, memory_budget // len(groupings),
+                               os.path.join(spill_dir, name) if spill_dir else None)
+        for name, ks in groupings.items()
+    }
+    try:
+        for chunk in iter_chunks(path, needed, chunk_size):
+            if derive_decade:
+                chunk['decade'] = (chunk['year'] // 10) * 10
+            for accumulator in accumulators.values():
+                accumulator.update(chunk)
+        return {name: acc.result(stats) for name, acc in accumulators.items()}
+    finally:
+        for accumulator in accumulators.values():
+            accumulator.cleanup()
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Out-of-core grouped aggregation')
+    parser.add_argument('path', nargs='?', default='../data/processed/agri_data_cleaned.csv',
+                        help='CSV file, .parquet file or Parquet directory')
+    parser.add_argument('--columns', default='rice_production_1000_tons,wheat_production_1000_tons')
+    parser.add_argument('--budget-mb', type=float, default=256)
+    parser.add_argument('--chunk-size', type=int, default=200000)
+    parser.add_argument('--verify', action='store_true',
+                        help='compare against in-memory groupbys (input must fit in RAM)')
+    args = parser.parse_args()
+
+    columns = args.columns.split(',')
+    started = time.perf_counter()
+    results = aggregate_file(args.path, columns, memory_budget=int(args.budget_mb * 1024 * 1024),
+                             chunk_size=args.chunk_size)
+    print(f"Aggregated in {time.perf_counter() - started:.2f}s")
+    for name, frame in results.items():
+        print(f"\n{name}: {len(frame):,} groups")
+        print(frame.head())
+
+    if args.verify:
+        df = pd.read_csv(args.path)
+        df['decade'] = (df['year'] // 10) * 10
+        for name, keys in GROUPINGS.items():
+            expected = df.groupby(keys)[columns].agg(list(STATS))
+            pd.testing.assert_frame_equal(results[name], expected, check_dtype=False, rtol=1e-12)
+            print(f"{name}: matches in-memory groupby")
@@ -0,0 +1,320 @@
+"""
+AgriData Explorer - Query Gateway
+File: analysis/query_gateway.py
+Purpose: Run the analysis_queries.sql questions and the top-states-by-crop
+         query against the warehouse, caching results per data version with
+         single-flight deduplication and hit-rate metrics
+"""
+
+import argparse
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import DBAPIError
+
+from caching import LRUCache, estimate_nbytes, normalize_where
+
+QUERIES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            'sql', 'analysis_queries.sql')
+
+# Written by AgriDataLoader.bump_data_version after every successful load
+DATA_VERSION_TABLE = 'etl_data_version'
+
+DATA_VERSION_QUERY = f"SELECT version FROM {DATA_VERSION_TABLE} WHERE id = 1"
+
+SECTION = re.compile(r'^-- (?:QUERY (?P<number>\d+)|(?P<bonus>BONUS)): (?P<title>.+)$')
+
+# Dynamic SQL of the sp_top_states_by_crop procedure; the crop is checked
+# against fact_production's columns before it is formatted in
+TOP_STATES_BY_CROP = """
+    SELECT s.state_name,
+           SUM(f.{crop}_production) AS total_production,
+           AVG(f.{crop}_yield) AS avg_yield
+    FROM fact_production f
+    JOIN dim_district d ON f.district_id = d.district_id
+    JOIN dim_state s ON d.state_id = s.state_id
+    WHERE f.year_id BETWEEN :start_year AND :end_year
+    GROUP BY s.state_name
+    ORDER BY total_production DESC
+    LIMIT :top_n
+"""
+
+
+def load_queries(path=QUERIES_PATH):
+    """Parse analysis_queries.sql into {name: (title, sql)}
+
+    Sections are ``-- QUERY N: title`` blocks; a section's first statement
+    is ``qN`` and any further ones ``qN_2``, ``qN_3`` (Query 7's national
+    summary is ``q7_2``). Statements under the BONUS header are ``bonus_1``,
+    ``bonus_2``, ... A comment line directly above a statement becomes its
+    title. ``USE`` statements are skipped.
+    """
+    queries = OrderedDict()
+    section = title = note = None
+    lines, count = [], 0
+
+    def flush():
+        nonlocal lines, count, note
+        statement = '\n'.join(lines).strip()
+        lines = []
+        if not statement or statement.upper().startswith('USE ') or section is None:
+            return
+        count += 1
+        if section == 'bonus':
+            name = f'bonus_{count}'
+        else:
+            name = section if count == 1 else f'{section}_{count}'
+        queries[name] = (note or title, statement)
+        note = None
+
+    with open(path, encoding='utf-8') as f:
+        for raw in f:
+            line = raw.rstrip()
+            match = SECTION.match(line)
+            if match:
+                flush()
+                section = 'bonus' if match.group('bonus') else f"q{match.group('number')}"
+                title, note, count = match.group('title').strip(), None, 0
+            elif line.startswith('--'):
+                comment = line.lstrip('-').strip()
+                if comment.strip('=') and not lines:
+                    note = comment
+            elif line.strip():
+                head, sep, _ = line.partition(';')
+                lines.append(head)
+                if sep:
+                    flush()
+    flush()
+    return queries
+
+
+class _Flight:
+    """One in-progress execution that identical concurrent requests wait on"""
+
+    def __init__(self, version):
+        self.version = version
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class QueryGateway:
+    """Cached, deduplicated access to the warehouse's analysis queries
+
+    Results are keyed by (query name, parameters, data version). The data
+    version is the ``etl_data_version`` counter the loader bumps after each
+    successful load; it is re-read at most every ``version_ttl`` seconds, and
+    when it changes the entries of older versions are dropped, so a cached
+    answer is never older than the last load plus ``version_ttl``. If the
+    version cannot be read (e.g. a dropped connection) the last known one
+    is kept, so an outage does not empty the cache.
+
+    The result cache is an LRU bounded by ``cache_bytes``. Concurrent
+    requests for the same key share one execution (single flight): the
+    first caller runs the query and the rest wait for its result, which is
+    only cached if the data version has not changed meanwhile. Callers
+    receive copies, so mutating a result never changes the cache.
+    """
+
+    def __init__(self, engine=None, url=None, pool_size=5, queries_path=QUERIES_PATH,
+                 cache_bytes=64 * 1024 * 1024, version_ttl=5.0):
+        if engine is None:
+            engine = create_engine(url, pool_size=pool_size, pool_pre_ping=True)
+        self.engine = engine
+        self.queries = load_queries(queries_path)
+        self.cache = LRUCache(cache_bytes)
+        self.version_ttl = version_ttl
+
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._version = None
+        self._version_read_at = 0.0
+        self._fact_columns = None
+
+        self.requests = 0
+        self.coalesced = 0
+        self.executions = 0
+        self.failures = 0
+        self.query_seconds = 0.0
+        self.invalidations = 0
+        self.version_errors = 0
+
+    @classmethod
+    def from_loader(cls, loader, **kwargs):
+        """Reuse an AgriDataLoader's MySQL credentials"""
+        url = (f"mysql+mysqlconnector://{loader.user}:{loader.password}"
+               f"@{loader.host}/{loader.database}")
+        return cls(url=url, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Data version
+    # ------------------------------------------------------------------
+    def _read_version(self):
+        with self.engine.connect() as connection:
+            if not inspect(connection).has_table(DATA_VERSION_TABLE):
+                # Warehouse loaded before versioning existed
+                return 0
+            version = connection.execute(text(DATA_VERSION_QUERY)).scalar()
+        return int(version or 0)
+
+    def data_version(self, refresh=False):
+        """Current data version, re-read from the warehouse at most every version_ttl seconds"""
+        now = time.monotonic()
+        with self._lock:
+            if (not refresh and self._version is not None
+                    and now - self._version_read_at < self.version_ttl):
+                return self._version
+        try:
+            version = self._read_version()
+        except DBAPIError:
+            with self._lock:
+                self.version_errors += 1
+                if self._version is None:
+                    raise
+                # Retry after version_ttl; until then serve the last known version
+                self._version_read_at = now
+                return self._version
+        with self._lock:
+            if self._version is not None and version != self._version:
+                # Results of earlier versions can never be requested again
+                self.cache.clear()
+                self.invalidations += 1
+            self._version = version
+            self._version_read_at = now
+        return version
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+    def _execute(self, sql, params):
+        started = time.perf_counter()
+        with self.engine.connect() as connection:
+            result = pd.read_sql(text(sql), connection, params=params)
+        with self._lock:
+            self.executions += 1
+            self.query_seconds += time.perf_counter() - started
+        return result
+
+    def _fetch(self, name, sql, params):
+        """Serve one request from the cache, an in-flight execution or the warehouse"""
+        params = dict(params or {})
+        version = self.data_version()
+        key = (name, normalize_where(params), version)
+        with self._lock:
+            self.requests += 1
+            result = self.cache.get(key)
+            if result is not None:
+                return result.copy()
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight(version)
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result.copy()
+
+        try:
+            flight.result = self._execute(sql, params)
+            with self._lock:
+                # A load finished while the query ran: the cache was cleared
+                # for the new version, so don't store an answer from the old one
+                if self._version == flight.version:
+                    self.cache.put(key, flight.result, estimate_nbytes(flight.result))
+            return flight.result.copy()
+        except Exception as e:
+            flight.error = e
+            with self._lock:
+                self.failures += 1
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def run(self, name, **params):
+        """Result of one analysis_queries.sql statement, e.g. run('q6')"""
+        if name not in self.queries:
+            raise KeyError(f"Unknown query '{name}' (available: {', '.join(self.queries)})")
+        return self._fetch(name, self.queries[name][1], params)
+
+    def top_states_by_crop(self, crop_name, top_n, start_year, end_year):
+        """Python counterpart of the sp_top_states_by_crop stored procedure"""
+        if self._fact_columns is None:
+            self._fact_columns = {c['name'] for c in inspect(self.engine).get_columns('fact_production')}
+        if not {f'{crop_name}_production', f'{crop_name}_yield'} <= self._fact_columns:
+            raise KeyError(f"Unknown crop '{crop_name}'")
+        return self._fetch(f'top_states_by_crop:{crop_name}',
+                           TOP_STATES_BY_CROP.format(crop=crop_name),
+                           {'top_n': int(top_n), 'start_year': int(start_year),
+                            'end_year': int(end_year)})
+
+    def clear(self):
+        """Drop cached results (counters are kept)"""
+        with self._lock:
+            self.cache.clear()
+
+    def stats(self):
+        """Hit rate, deduplication and warehouse time"""
+        with self._lock:
+            cache = self.cache.stats()
+            served = cache['hits'] + self.coalesced
+            return {
+                'requests': self.requests,
+                'hits': cache['hits'],
+                'coalesced': self.coalesced,
+                'executions': self.executions,
+                'failures': self.failures,
+                'hit_rate': cache['hits'] / self.requests if self.requests else 0.0,
+                'served_without_query': served / self.requests if self.requests else 0.0,
+                'query_seconds': round(self.query_seconds, 4),
+                'data_version': self._version,
+                'invalidations': self.invalidations,
+                'version_errors': self.version_errors,
+                'entries': cache['entries'],
+                'evictions': cache['evictions'],
+                'bytes_held': cache['bytes_held'],
+                'max_bytes': cache['max_bytes'],
+            }
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run cached warehouse analysis queries')
+    parser.add_argument('queries', nargs='*', help='query names (default: all)')
+    parser.add_argument('--url', default='mysql+mysqlconnector://root@localhost/agridata_db',
+                        help='SQLAlchemy URL of the warehouse')
+    parser.add_argument('--repeat', type=int, default=2)
+    parser.add_argument('--list', action='store_true', help='list query names and exit')
+    args = parser.parse_args()
+
+    gateway = QueryGateway(url=args.url)
+    if args.list:
+        for name, (title, _) in gateway.queries.items():
+            print(f"{name:<10} {title}")
+        raise SystemExit(0)
+
+    for _ in range(args.repeat):
+        for name in args.queries or gateway.queries:
+            started = time.perf_counter()
+            try:
+                result = gateway.run(name)
+            except pd.errors.DatabaseError as e:
+                print(f"{name:<10} failed: {str(e.__cause__ or e).splitlines()[0]}")
+                continue
+            print(f"{name:<10} {len(result):>6,} rows  {(time.perf_counter() - started) * 1000:>8.1f} ms")
+
+    print("\n" + "="*60)
+    print("QUERY GATEWAY STATS")
+    print("="*60)
+    for key, value in gateway.stats().items():
+        print(f"{key}: {value}")
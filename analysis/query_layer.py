@@ -0,0 +1,337 @@
+"""
+AgriData Explorer - In-Python Query Layer
+File: analysis/query_layer.py
+Purpose: Answer the 10 business questions from sql/analysis_queries.sql
+         directly from the cleaned dataset (no database required)
+"""
+
+import numpy as np
+import pandas as pd
+
+from caching import AggregationCache
+from correlation import CorrelationEngine
+from geo_index import GeoIndex
+from ranking import top_n, top_n_per_group
+from timeseries import DistrictTimeSeries
+
+# Crops whose column prefix differs between ICRISAT exports
+CROP_ALIASES = {
+    'soybean': ['soybean', 'soyabean'],
+    'rapeseed_mustard': ['rapeseed_mustard', 'rapeseed_and_mustard'],
+}
+
+MEASURE_SUFFIXES = {
+    'area': 'area_1000_ha',
+    'production': 'production_1000_tons',
+    'yield': 'yield_kg_per_ha',
+}
+
+
+class AgriQueries:
+    """Pandas equivalents of the analysis_queries.sql business questions
+
+    Every method returns a DataFrame with the same columns as its SQL
+    counterpart (Query 4 additionally carries real per-district
+    correlations). Ranking steps (RANK() OVER / ORDER BY ... LIMIT) go through
+    the vectorized top-N engine in ranking.py.
+    """
+
+    def __init__(self, df, agg_cache=None):
+        self.df = df
+        self.agg_cache = agg_cache or AggregationCache(df, geo_index=GeoIndex(df))
+        self.max_year = int(df['year'].max())
+        self._series = {}
+
+    @classmethod
+    def from_csv(cls, data_path):
+        """Build the query layer from the cleaned CSV"""
+        return cls(pd.read_csv(data_path))
+
+    def col(self, crop, measure):
+        """Cleaned column name for a crop measure (area/production/yield)"""
+        suffix = MEASURE_SUFFIXES[measure]
+        for prefix in CROP_ALIASES.get(crop, [crop]):
+            name = f'{prefix}_{suffix}'
+            if name in self.df.columns:
+                return name
+        raise KeyError(f"No {measure} column for crop '{crop}'")
+
+    def _has(self, crop, measure):
+        try:
+            self.col(crop, measure)
+            return True
+        except KeyError:
+            return False
+
+    def _aggregate(self, keys, columns, aggfunc='sum', where=None):
+        return self.agg_cache.aggregate(keys, columns, aggfunc, where)
+
+    def _timeseries(self, crop, measure, positive_only=False):
+        """District x year cube for one crop, built once per query layer
+
+        Kept in float64 so query results match the SQL versions to the digit.
+        """
+        prefix = self.col(crop, measure)[:-len(MEASURE_SUFFIXES[measure]) - 1]
+        key = (prefix, measure, positive_only)
+        if key not in self._series:
+            self._series[key] = DistrictTimeSeries(self.df, crops=[prefix], measure=measure,
+                                                   positive_only=positive_only, dtype=np.float64)
+        return self._series[key]
+
+    # ------------------------------------------------------------------
+    # QUERY 1: Year-wise trend of rice production across states (top 3)
+    # ------------------------------------------------------------------
+    def rice_top_states_by_year(self, n=3, crops=('rice',)):
+        """Top n states per year; pass several crops to rank them all at once"""
+        cols = [self.col(crop, 'production') for crop in crops]
+        yearly = self._aggregate(['year', 'state_name'], cols).reset_index()
+        ranked = top_n_per_group(yearly, 'year', cols, n)
+        result = ranked[['state_name', 'year', 'measure', 'value', 'rank']].rename(
+            columns={'value': 'total_production', 'rank': 'state_rank'})
+        if len(crops) == 1:
+            result = result.drop(columns='measure').rename(
+                columns={'total_production': f'total_{crops[0]}_production'})
+        return result.reset_index(drop=True)
+
+    # ------------------------------------------------------------------
+    # QUERY 2: Top 5 districts by wheat yield increase over the last 5 years
+    # ------------------------------------------------------------------
+    def wheat_yield_increase_districts(self, years=5, n=5):
+        """Districts with the largest wheat yield gain between max_year-years and max_year
+
+        Empty when max_year-years is before the first year of data.
+        """
+        ts = self._timeseries('wheat', 'yield', positive_only=True)
+        current = ts.values[:, ts.year_index(self.max_year), 0]
+        try:
+            past = ts.values[:, ts.year_index(self.max_year - years), 0]
+        except KeyError:
+            past = np.full(len(ts.districts), np.nan, dtype=ts.dtype)
+
+        pivot = ts.districts.to_frame(index=False)[['district_name', 'state_name']]
+        pivot['current_yield'] = current.astype(np.float64)
+        pivot['past_yield'] = past.astype(np.float64)
+        pivot = pivot.dropna()
+        pivot['yield_increase'] = pivot['current_yield'] - pivot['past_yield']
+        pivot['pct_increase'] = (pivot['yield_increase'] / pivot['past_yield'] * 100).round(2)
+        return top_n(pivot, n, 'yield_increase').reset_index(drop=True)
+
+    # ------------------------------------------------------------------
+    # QUERY 3: States with highest growth in oilseed production (5-year)
+    # ------------------------------------------------------------------
+    def oilseed_growth_states(self, window=5, n=10):
+        """Compare the latest window-year total against the preceding window
+
+        The cube drops ICRISAT's -1 sentinels, which a SQL SUM over raw
+        data would add in; cleaned data has them repaired to 0 already.
+        """
+        ts = self._timeseries('oilseeds', 'production')
+        states, totals = ts.state_totals()
+        end = self.max_year
+        recent = ts.window_total(end - window + 1, end, values=totals)[:, 0]
+        previous = ts.window_total(end - 2 * window + 1, end - window, values=totals)[:, 0]
+
+        growth = pd.DataFrame({
+            'recent_5yr_production': recent,
+            'previous_5yr_production': previous,
+        }, index=states).dropna()
+        growth = growth[(growth['recent_5yr_production'] > 0)
+                        & (growth['previous_5yr_production'] > 0)]
+        growth['growth_rate_pct'] = ((growth['recent_5yr_production']
+                                      - growth['previous_5yr_production'])
+                                     / growth['previous_5yr_production'] * 100).round(2)
+        growth = growth.rename_axis('state_name').reset_index()
+        return top_n(growth, n, 'growth_rate_pct').reset_index(drop=True)
+
+    # ------------------------------------------------------------------
+    # QUERY 4: District-wise area vs production for major crops
+    # ------------------------------------------------------------------
+    def area_production_by_district(self, years=10, crops=('rice', 'wheat', 'maize')):
+        """Average area/production/yield, efficiency and area-production correlation per district"""
+        recent_years = tuple(range(self.max_year - years, self.max_year + 1))
+        cols = [self.col(crop, m) for crop in crops for m in ('area', 'production', 'yield')]
+        means = self._aggregate(['state_name', 'district_name'], cols, 'mean',
+                                where={'year': recent_years})
+
+        result = pd.DataFrame(index=means.index)
+        for crop in crops:
+            area = means[self.col(crop, 'area')]
+            prod = means[self.col(crop, 'production')]
+            result[f'avg_{crop}_area'] = area
+            result[f'avg_{crop}_production'] = prod
+            result[f'avg_{crop}_yield'] = means[self.col(crop, 'yield')].round(2)
+        for crop in crops:
+            area = result[f'avg_{crop}_area']
+            result[f'{crop}_efficiency'] = (result[f'avg_{crop}_production']
+                                            / area.where(area != 0)).round(2)
+
+        # The SQL version can only approximate correlation with averages; here
+        # the real per-district Pearson r comes from one batched pass
+        recent = self.df[self.df['year'].isin(recent_years)]
+        keys = ['state_name', 'district_name']
+        corr = CorrelationEngine(recent, crops=list(crops)).matrix(keys)
+        for crop in crops:
+            result[f'{crop}_area_production_corr'] = corr[crop].reindex(result.index)
+
+        any_area = np.logical_or.reduce([result[f'avg_{crop}_area'] > 0 for crop in crops])
+        return result[any_area].reset_index()
+
+    # ------------------------------------------------------------------
+    # QUERY 5: Yearly cotton production growth in top 5 cotton states
+    # ------------------------------------------------------------------
+    def cotton_yoy_growth(self, n=5):
+        """Year-over-year cotton growth for the n largest cotton states
+
+        Like the SQL LAG(), prev_year_production is the state's previous
+        year that has data, so a gap year does not blank the growth after
+        it. The cube drops -1 sentinels before summing (see Query 3).
+        """
+        ts = self._timeseries('cotton', 'production')
+        states, totals = ts.state_totals()
+        top = top_n(pd.Series(np.nansum(totals[:, :, 0], axis=1), index=states), n).index
+        yearly = totals[states.get_indexer(top), :, 0]
+
+        # Position of the latest earlier year with data, -1 if there is none
+        has_data = ~np.isnan(yearly)
+        last_seen = np.where(has_data, np.arange(len(ts.years)), -1)
+        np.maximum.accumulate(last_seen, axis=1, out=last_seen)
+        prev_idx = np.full_like(last_seen, -1)
+        prev_idx[:, 1:] = last_seen[:, :-1]
+        previous = np.where(prev_idx >= 0,
+                            np.take_along_axis(yearly, np.maximum(prev_idx, 0), axis=1), np.nan)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            growth = np.where(previous != 0, (yearly - previous) / previous * 100, np.nan)
+
+        result = pd.DataFrame({
+            'state_name': np.repeat(top, len(ts.years)),
+            'year': np.tile(ts.years, len(top)),
+            'total_cotton_production': yearly.ravel(),
+            'prev_year_production': previous.ravel(),
+            'yoy_growth_pct': growth.ravel().round(2),
+        })
+        return (result[has_data.ravel()]
+                .sort_values(['state_name', 'year']).reset_index(drop=True))
+
+    # ------------------------------------------------------------------
+    # QUERY 6: Districts with the highest groundnut production in a year
+    # ------------------------------------------------------------------
+    def groundnut_top_districts(self, year=2020, n=20):
+        """Top n groundnut districts for one year
+
+        Like the SQL RANK() ... LIMIT n: equal productions share a rank and
+        the cut stays at n rows.
+        """
+        cols = [self.col('groundnut', m) for m in ('area', 'production', 'yield')]
+        prod = cols[1]
+        sub = self.df.loc[(self.df['year'] == year) & (self.df[prod] > 0),
+                          ['state_name', 'district_name'] + cols]
+        result = top_n(sub, n, prod).reset_index(drop=True)
+        result.columns = ['state_name', 'district_name', 'groundnut_area',
+                          'groundnut_production', 'groundnut_yield']
+        # Rows are in descending order, so only rows inside the cut can outrank one
+        result['production_rank'] = (result['groundnut_production']
+                                     .rank(method='min', ascending=False).astype(np.int64))
+        return result
+
+    # ------------------------------------------------------------------
+    # QUERY 7: Annual average maize yield across all states
+    # ------------------------------------------------------------------
+    def maize_yield_by_state_year(self):
+        """Average maize yield, totals and district count per state and year"""
+        area, prod, yld = (self.col('maize', m) for m in ('area', 'production', 'yield'))
+        sub = self.df[self.df[yld] > 0]
+        result = sub.groupby(['year', 'state_name']).agg(
+            avg_maize_yield=(yld, 'mean'),
+            total_maize_area=(area, 'sum'),
+            total_maize_production=(prod, 'sum'),
+            num_districts=('district_name', 'nunique'),
+        ).reset_index()
+        result['avg_maize_yield'] = result['avg_maize_yield'].round(2)
+        return result
+
+    def maize_yield_national(self):
+        """National maize summary per year (second statement of Query 7)"""
+        area, prod, yld = (self.col('maize', m) for m in ('area', 'production', 'yield'))
+        sub = self.df[self.df[yld] > 0]
+        result = sub.groupby('year').agg(
+            national_avg_yield=(yld, 'mean'),
+            total_national_area=(area, 'sum'),
+            total_national_production=(prod, 'sum'),
+        ).reset_index()
+        result['national_avg_yield'] = result['national_avg_yield'].round(2)
+        return result
+
+    # ------------------------------------------------------------------
+    # QUERY 8: Total area cultivated for oilseeds in each state
+    # ------------------------------------------------------------------
+    def oilseed_area_by_state(self):
+        """Oilseed area totals by state, with the crop breakdown where available"""
+        crops = [c for c in ('oilseeds', 'groundnut', 'soybean', 'sunflower', 'rapeseed_mustard')
+                 if self._has(c, 'area')]
+        cols = [self.col(c, 'area') for c in crops]
+        totals = self._aggregate('state_name', cols)
+        totals.columns = [f'total_{c}_area' for c in crops]
+        totals['years_of_data'] = self.df.groupby('state_name')['year'].nunique()
+        totals['avg_annual_oilseeds_area'] = self._aggregate(
+            'state_name', self.col('oilseeds', 'area'), 'mean').round(2)
+        return totals.sort_values('total_oilseeds_area', ascending=False).reset_index()
+
+    # ------------------------------------------------------------------
+    # QUERY 9: Districts with the highest rice yield
+    # ------------------------------------------------------------------
+    def rice_yield_top_districts(self, years=10, n=20, min_years=5):
+        """Best average rice yield over the last `years` years"""
+        area, prod, yld = (self.col('rice', m) for m in ('area', 'production', 'yield'))
+        sub = self.df[(self.df[yld] > 0) & (self.df['year'] >= self.max_year - years)]
+        result = sub.groupby(['state_name', 'district_name']).agg(
+            avg_rice_yield=(yld, 'mean'),
+            avg_rice_area=(area, 'mean'),
+            avg_rice_production=(prod, 'mean'),
+            years_cultivated=('year', 'count'),
+        ).reset_index()
+        result = result[result['years_cultivated'] >= min_years]
+        result['avg_rice_yield'] = result['avg_rice_yield'].round(2)
+        return top_n(result, n, 'avg_rice_yield').reset_index(drop=True)
+
+    # ------------------------------------------------------------------
+    # QUERY 10: Rice vs wheat for the top 5 states over 10 years
+    # ------------------------------------------------------------------
+    def rice_vs_wheat_top_states(self, years=10, n=5):
+        """Rice and wheat area/production/yield for the n largest combined producers"""
+        rice = {m: self.col('rice', m) for m in ('area', 'production', 'yield')}
+        wheat = {m: self.col('wheat', m) for m in ('area', 'production', 'yield')}
+        recent_years = tuple(range(self.max_year - years, self.max_year + 1))
+        totals = self._aggregate('state_name', [rice['production'], wheat['production']],
+                                 where={'year': recent_years}).sum(axis=1)
+        states = tuple(top_n(totals, n).index)
+
+        where = {'year': recent_years, 'state_name': states}
+        keys = ['state_name', 'year']
+        sums = self._aggregate(keys, [rice['area'], rice['production'],
+                                      wheat['area'], wheat['production']], where=where)
+        means = self._aggregate(keys, [rice['yield'], wheat['yield']], 'mean', where=where)
+
+        result = pd.DataFrame({
+            'rice_area': sums[rice['area']],
+            'rice_production': sums[rice['production']],
+            'avg_rice_yield': means[rice['yield']].round(2),
+            'wheat_area': sums[wheat['area']],
+            'wheat_production': sums[wheat['production']],
+            'avg_wheat_yield': means[wheat['yield']].round(2),
+        })
+        wheat_prod = result['wheat_production']
+        result['rice_to_wheat_ratio'] = (result['rice_production']
+                                         / wheat_prod.where(wheat_prod != 0)).round(2)
+        return result.reset_index()
+
+    # ------------------------------------------------------------------
+    # sp_top_states_by_crop
+    # ------------------------------------------------------------------
+    def top_states_by_crop(self, crop_name, top_n_states, start_year, end_year):
+        """Python counterpart of the sp_top_states_by_crop stored procedure"""
+        prod, yld = self.col(crop_name, 'production'), self.col(crop_name, 'yield')
+        years = tuple(range(start_year, end_year + 1))
+        stats = self._aggregate('state_name', [prod, yld], {prod: 'sum', yld: 'mean'},
+                                where={'year': years})
+        stats.columns = ['total_production', 'avg_yield']
+        return top_n(stats, top_n_states, 'total_production').reset_index()
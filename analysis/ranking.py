@@ -0,0 +1,177 @@
+"""
+AgriData Explorer - Ranking Engine
+File: analysis/ranking.py
+Purpose: Vectorized top-N-per-group selection used by the EDA charts and the
+         in-Python query layer
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# The dense (groups, max_group_size) block is used while it holds at most
+# this many cells per input row; skewed group sizes switch to a sort
+DENSE_BLOCK_RATIO = 4
+
+
+def top_n_positions(values, codes, n, n_groups=None):
+    """Row positions of the n largest values within every group
+
+    ``values`` is a (rows,) or (rows, k) array - one column per measure, so
+    several crops are ranked in a single call. ``codes`` holds integer group
+    codes in [0, n_groups). Rows are scattered into a dense
+    (groups, max_group_size, k) block and ``np.argpartition`` picks the top n
+    of each group; only those n candidates are sorted, never whole groups.
+    When one large group would make that block more than
+    ``DENSE_BLOCK_RATIO`` times the input, rows are sorted by
+    (group, value) instead.
+
+    Returns an int array of shape (n_groups, n, k) (or (n_groups, n) for 1-D
+    input) ordered by descending value. Slots beyond a group's size, and NaN
+    values, are -1. Ties are broken by row position, like ROW_NUMBER().
+    """
+    values = np.asarray(values, dtype=np.float64)
+    one_dim = values.ndim == 1
+    if one_dim:
+        values = values[:, None]
+    codes = np.asarray(codes, dtype=np.int64)
+    if n_groups is None:
+        n_groups = int(codes.max()) + 1 if len(codes) else 0
+    n_measures = values.shape[1]
+
+    if n_groups == 0 or n <= 0:
+        shape = (n_groups, max(n, 0)) + (() if one_dim else (n_measures,))
+        return np.full(shape, -1, dtype=np.int64)
+
+    counts = np.bincount(codes, minlength=n_groups)
+    width = int(counts.max())
+    if n_groups * width > DENSE_BLOCK_RATIO * len(codes):
+        positions = _sorted_top_n(values, codes, n, n_groups, counts)
+    else:
+        positions = _dense_top_n(values, codes, n, n_groups, counts, width)
+    return positions[:, :, 0] if one_dim else positions
+
+
+def _dense_top_n(values, codes, n, n_groups, counts, width):
+    """top_n_positions via a dense block and argpartition"""
+    n_measures = values.shape[1]
+
+    # Counting-sort rows by group, then give each row its slot inside the group
+    order = np.argsort(codes, kind='stable')
+    starts = np.cumsum(counts) - counts
+    sorted_codes = codes[order]
+    slots = np.arange(len(order)) - starts[sorted_codes]
+
+    dense = np.full((n_groups, width, n_measures), -np.inf)
+    dense[sorted_codes, slots] = values[order]
+    dense[np.isnan(dense)] = -np.inf
+    row_of_slot = np.full((n_groups, width), -1, dtype=np.int64)
+    row_of_slot[sorted_codes, slots] = order
+
+    k = min(n, width)
+    if k < width:
+        # argpartition finds the k-th value; among rows tied with it keep the
+        # earliest slots (= earliest rows) so the cut matches a stable sort
+        kth = -np.partition(-dense, k - 1, axis=1)[:, k - 1:k, :]
+        above = dense > kth
+        tied = dense == kth
+        chosen = above | (tied & (np.cumsum(tied, axis=1)
+                                  <= k - above.sum(axis=1, keepdims=True)))
+        candidates = np.nonzero(chosen.transpose(0, 2, 1))[2].reshape(
+            n_groups, n_measures, k).transpose(0, 2, 1)
+    else:
+        candidates = np.broadcast_to(
+            np.arange(width)[None, :, None], (n_groups, width, n_measures))
+
+    cand_values = np.take_along_axis(dense, candidates, axis=1)
+    cand_rows = np.take_along_axis(
+        np.broadcast_to(row_of_slot[:, :, None], dense.shape), candidates, axis=1)
+    # Descending value, ascending row position for ties
+    ranked = np.lexsort((cand_rows, -cand_values), axis=1)
+    positions = np.take_along_axis(cand_rows, ranked, axis=1)
+    positions[np.take_along_axis(cand_values, ranked, axis=1) == -np.inf] = -1
+
+    if k < n:
+        pad = np.full((n_groups, n - k, n_measures), -1, dtype=np.int64)
+        positions = np.concatenate([positions, pad], axis=1)
+    return positions
+
+
+def _sorted_top_n(values, codes, n, n_groups, counts):
+    """top_n_positions by sorting each measure on (group, -value, row); memory O(rows)"""
+    rows = np.arange(len(codes))
+    starts = np.cumsum(counts) - counts
+    positions = np.full((n_groups, n, values.shape[1]), -1, dtype=np.int64)
+    for j in range(values.shape[1]):
+        column = np.where(np.isnan(values[:, j]), -np.inf, values[:, j])
+        order = np.lexsort((rows, -column, codes))
+        sorted_codes = codes[order]
+        slots = rows - starts[sorted_codes]
+        keep = (slots < n) & (column[order] > -np.inf)
+        positions[sorted_codes[keep], slots[keep], j] = order[keep]
+    return positions
+
+
+def top_n_per_group(df, group_cols, value_cols, n):
+    """Top n rows of ``df`` for each group, ranked separately per value column
+
+    Equivalent to ``RANK() OVER (PARTITION BY group_cols ORDER BY value DESC)
+    <= n`` evaluated for every column in ``value_cols`` at once: equal values
+    share a rank, and rows tied with the n-th value are all kept. Returns a
+    long frame with one row per (group, measure, ranked row); the ``measure``
+    column names the value column the row was ranked on and ``value`` holds
+    its value. All other columns of the winning row are carried along.
+    """
+    group_cols = [group_cols] if isinstance(group_cols, str) else list(group_cols)
+    value_cols = [value_cols] if isinstance(value_cols, str) else list(value_cols)
+    if df.empty or n <= 0:
+        return pd.DataFrame(columns=list(df.columns) + ['measure', 'rank', 'value'])
+
+    codes = df.groupby(group_cols, sort=True).ngroup().to_numpy()
+    values = df[value_cols].to_numpy(dtype=np.float64)
+    positions = top_n_positions(values, codes, n)
+    n_groups, _, n_measures = positions.shape
+    measure_of = np.arange(n_measures)[None, None, :]
+
+    # RANK(): a slot takes the rank of the first slot holding the same value
+    slot_values = np.where(positions >= 0, values[np.maximum(positions, 0), measure_of], np.nan)
+    first = np.ones(positions.shape, dtype=bool)
+    first[:, 1:] = slot_values[:, 1:] != slot_values[:, :-1]
+    rank = np.where(first, np.arange(1, n + 1)[None, :, None], 0)
+    np.maximum.accumulate(rank, axis=1, out=rank)
+
+    group = np.broadcast_to(np.arange(n_groups)[:, None, None], positions.shape)
+    measure = np.broadcast_to(measure_of, positions.shape)
+    keep = positions >= 0
+    parts = [(group[keep], measure[keep], rank[keep], positions[keep])]
+
+    # Rows outside the first n that tie with the n-th value share its rank
+    selected = np.zeros(values.shape, dtype=bool)
+    selected[positions[keep], measure[keep]] = True
+    full = positions[:, -1, :] >= 0
+    threshold = slot_values[:, -1, :]
+    tied = full[codes] & (values == threshold[codes]) & ~selected
+    tied_rows, tied_measures = np.nonzero(tied)
+    parts.append((codes[tied_rows], tied_measures, rank[codes[tied_rows], -1, tied_measures],
+                  tied_rows))
+
+    group, measure, rank, flat = (np.concatenate(arrays) for arrays in zip(*parts))
+    order = np.lexsort((flat, rank, measure, group))
+    measure, rank, flat = measure[order], rank[order], flat[order]
+
+    rows = df.iloc[flat].reset_index(drop=True)
+    rows['measure'] = np.asarray(value_cols, dtype=object)[measure]
+    rows['rank'] = rank
+    rows['value'] = values[flat, measure]
+    return rows
+
+
+def top_n(obj, n, column=None):
+    """Drop-in for ``Series.nlargest(n)`` / ``DataFrame.nlargest(n, column)``
+
+    Uses a single argpartition instead of sorting the whole input.
+    """
+    values = obj[column] if column is not None else obj
+    positions = top_n_positions(values.to_numpy(dtype=np.float64),
+                                np.zeros(len(values), dtype=np.int64), n, n_groups=1)[0]
+    return obj.iloc[positions[positions >= 0]]
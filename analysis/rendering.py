@@ -0,0 +1,265 @@
+"""
+AgriData Explorer - Chart Rendering
+File: analysis/rendering.py
+Purpose: Agg-only rendering for the EDA charts: pre-styled figure templates
+         reused chart after chart, bar and line artists updated in place, and
+         one draw per chart rasterized to print, screen and thumbnail PNGs
+"""
+
+import os
+import time
+
+import matplotlib
+
+# Headless raster output only; set before anything imports pyplot
+matplotlib.use('Agg')
+
+import numpy as np  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+from matplotlib.patches import Rectangle  # noqa: E402
+from PIL import Image  # noqa: E402
+
+# Output profile -> DPI. Lower profiles divide the highest one requested, so
+# they are box-reduced from its raster instead of drawn again
+PROFILES = {'print': 300, 'screen': 100, 'thumbnail': 50}
+
+# zlib level for the PNGs: within a few percent of the default level 6 in
+# size for these flat-colour charts, in about half the encode time
+PNG_COMPRESS_LEVEL = 3
+
+# Figure size, axes grid and subplot margins of each template. The fixed
+# margins leave room for 45-degree state names and replace a tight_layout
+# pass per chart; a chart can override them for one draw.
+TEMPLATES = {
+    'bar': {'figsize': (12, 6),
+            'margins': dict(left=0.08, right=0.98, bottom=0.25, top=0.92)},
+    'barh': {'figsize': (12, 6),
+             'margins': dict(left=0.16, right=0.97, bottom=0.1, top=0.92)},
+    'barh_tall': {'figsize': (12, 8),
+                  'margins': dict(left=0.16, right=0.97, bottom=0.08, top=0.94)},
+    'trend': {'figsize': (14, 7),
+              'margins': dict(left=0.08, right=0.98, bottom=0.09, top=0.93)},
+    'wide': {'figsize': (14, 7),
+             'margins': dict(left=0.08, right=0.98, bottom=0.22, top=0.93)},
+    'pair': {'figsize': (16, 6), 'ncols': 2,
+             'margins': dict(left=0.06, right=0.98, bottom=0.25, top=0.92, wspace=0.2)},
+    'split': {'figsize': (18, 6), 'ncols': 2, 'width_ratios': [1, 2],
+              'margins': dict(left=0.06, right=0.99, bottom=0.25, top=0.92, wspace=0.15)},
+    'triple': {'figsize': (18, 5), 'ncols': 3,
+               'margins': dict(left=0.05, right=0.99, bottom=0.12, top=0.9, wspace=0.22)},
+}
+
+
+def style_axes(ax, title, xlabel=None, ylabel=None, title_size=16, label_size=12):
+    """Bold title and axis labels, updating the axes' existing text artists"""
+    ax.set_title(title, fontsize=title_size, fontweight='bold')
+    if xlabel is not None:
+        ax.set_xlabel(xlabel, fontsize=label_size)
+    if ylabel is not None:
+        ax.set_ylabel(ylabel, fontsize=label_size)
+
+
+class BarPanel:
+    """Bars of one axes, resized and relabelled in place for the next chart
+
+    Matches ``Series.plot(kind='bar'/'barh')``: bars at 0..n-1, width 0.5,
+    limits from -0.5 to n-0.5. Rectangles are only added or removed when
+    the bar count changes.
+    """
+
+    def __init__(self, ax, horizontal=False):
+        self.ax = ax
+        self.horizontal = horizontal
+        self.bars = []
+
+    def update(self, labels, values, color, edgecolor='black', width=0.5, rotation=0, ha='center'):
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        while len(self.bars) < n:
+            self.bars.append(self.ax.add_patch(Rectangle((0, 0), 0, 0)))
+        for bar in self.bars[n:]:
+            bar.remove()
+        del self.bars[n:]
+
+        for i, (bar, value) in enumerate(zip(self.bars, values)):
+            if self.horizontal:
+                bar.set_bounds(0, i - width / 2, value, width)
+            else:
+                bar.set_bounds(i - width / 2, 0, width, value)
+            bar.set_facecolor(color)
+            bar.set_edgecolor(edgecolor)
+
+        ticks, labels = np.arange(n), [str(label) for label in labels]
+        low, high = min(0.0, values.min(initial=0.0)), max(0.0, values.max(initial=0.0))
+        pad = (high - low) * 0.05
+        value_limits = (low - pad if low < 0 else 0.0, high + pad if high > 0 else 0.0)
+        if self.horizontal:
+            self.ax.set_yticks(ticks, labels)
+            self.ax.set_ylim(-0.5, n - 0.5)
+            self.ax.set_xlim(*value_limits)
+        else:
+            self.ax.set_xticks(ticks, labels, rotation=rotation, ha=ha)
+            self.ax.set_xlim(-0.5, n - 0.5)
+            self.ax.set_ylim(*value_limits)
+        return self
+
+
+class LinePanel:
+    """Line2D artists of one axes re-pointed at new data for the next chart
+
+    ``series`` is a list of (y, style) pairs; a style without a colour
+    keeps the colour the line took from the axes' colour cycle.
+    """
+
+    def __init__(self, ax):
+        self.ax = ax
+        self.lines = []
+        self.cycle_colors = []
+        self.fill = None
+
+    def update(self, x, series, fill=None, legend_size=None):
+        while len(self.lines) < len(series):
+            line, = self.ax.plot([], [])
+            self.lines.append(line)
+            self.cycle_colors.append(line.get_color())
+        for line in self.lines[len(series):]:
+            line.remove()
+        del self.lines[len(series):], self.cycle_colors[len(series):]
+
+        for line, default_color, (y, style) in zip(self.lines, self.cycle_colors, series):
+            line.set_data(x, y)
+            line.set(**{'label': '_nolegend_', 'marker': 'None', 'color': default_color,
+                        'linewidth': matplotlib.rcParams['lines.linewidth'],
+                        'markersize': matplotlib.rcParams['lines.markersize'], **style})
+
+        if self.fill is not None:
+            self.fill.remove()
+            self.fill = None
+        self.ax.relim()
+        if fill is not None:
+            fill = dict(fill)
+            y = series[fill.pop('series', 0)][0]
+            self.fill = self.ax.fill_between(x, y, **fill)
+            # relim skips collections; keep the filled area's zero baseline in view
+            self.ax.update_datalim([(x[0], 0), (x[-1], 0)])
+        self.ax.autoscale_view()
+
+        if self.ax.get_legend() is not None:
+            self.ax.get_legend().remove()
+        if legend_size is not None:
+            self.ax.legend(fontsize=legend_size)
+        self.ax.grid(True, alpha=0.3)
+        return self
+
+
+PANELS = {
+    'bar': BarPanel,
+    'barh': lambda ax: BarPanel(ax, horizontal=True),
+    'line': LinePanel,
+}
+
+
+class FigureTemplate:
+    """A styled figure and axes grid kept alive and reused chart after chart"""
+
+    def __init__(self, figsize, ncols=1, width_ratios=None, margins=None):
+        self.figure = Figure(figsize=figsize)
+        self.canvas = FigureCanvasAgg(self.figure)
+        gridspec = {'width_ratios': width_ratios} if width_ratios else None
+        self.axes = list(self.figure.subplots(1, ncols, squeeze=False, gridspec_kw=gridspec).flat)
+        self.margins = margins or {}
+        self.panels = [None] * len(self.axes)
+        self.used = [False] * len(self.axes)
+
+    def layout(self, **overrides):
+        """Apply the template margins, with per-chart overrides"""
+        self.figure.subplots_adjust(**{**self.margins, **overrides})
+        return self
+
+    def ax(self, index=0):
+        """Empty axes for free-form drawing (cleared if an earlier chart used it)"""
+        if self.used[index]:
+            ax = self.axes[index]
+            ax.clear()
+            # clear() keeps the equal aspect and hidden frame a pie chart sets
+            ax.set_aspect('auto')
+            ax.set_frame_on(True)
+            ax.set_autoscale_on(True)
+        self.used[index] = True
+        self.panels[index] = None
+        return self.axes[index]
+
+    def panel(self, index, kind):
+        """The 'bar', 'barh' or 'line' panel of an axes, reused while the kind stays the same"""
+        if self.panels[index] is None or self.panels[index][0] != kind:
+            panel = PANELS[kind](self.ax(index))
+            self.panels[index] = (kind, panel)
+        return self.panels[index][1]
+
+
+class ChartRenderer:
+    """Draw each chart once and write it for every requested output profile
+
+    The chart is rasterized at the highest DPI among ``profiles``; the other
+    profiles are downscaled from that raster with PIL. Print-profile files
+    go to ``output_dir`` and the others to ``output_dir/<profile>/``.
+    """
+
+    def __init__(self, output_dir, profiles=('print',), compress_level=PNG_COMPRESS_LEVEL):
+        unknown = [p for p in profiles if p not in PROFILES]
+        if unknown or not profiles:
+            raise ValueError(f"Unknown output profiles {unknown}; expected some of {list(PROFILES)}")
+        self.output_dir = output_dir
+        self.profiles = list(profiles)
+        self.compress_level = compress_level
+        self.templates = {}
+        self.timings = {}
+
+    def figure(self, name, **margins):
+        """Template ``name`` laid out for the next chart"""
+        template = self.templates.get(name)
+        if template is None:
+            template = self.templates[name] = FigureTemplate(**TEMPLATES[name])
+        return template.layout(**margins)
+
+    def _path(self, profile, filename):
+        directory = self.output_dir if profile == 'print' else os.path.join(self.output_dir, profile)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, filename)
+
+    def save(self, template, filename):
+        """Draw the template once and write one PNG per profile; returns {profile: path}"""
+        dpi = max(PROFILES[p] for p in self.profiles)
+        started = time.perf_counter()
+        template.figure.set_dpi(dpi)
+        template.canvas.draw()
+        image = Image.fromarray(np.asarray(template.canvas.buffer_rgba())).convert('RGB')
+        drawn = time.perf_counter()
+
+        paths = {}
+        for profile in self.profiles:
+            scale = dpi / PROFILES[profile]
+            if scale == 1:
+                scaled = image
+            elif scale.is_integer():
+                scaled = image.reduce(int(scale))
+            else:
+                size = (round(image.width / scale), round(image.height / scale))
+                scaled = image.resize(size, Image.LANCZOS)
+            paths[profile] = self._path(profile, filename)
+            scaled.save(paths[profile], dpi=(PROFILES[profile],) * 2,
+                        compress_level=self.compress_level)
+        self.timings[filename] = (drawn - started, time.perf_counter() - drawn)
+        return paths
+
+    def close(self):
+        """Release the template figures and their raster buffers"""
+        self.templates.clear()
+
+    def stats(self):
+        """Total draw and encode seconds over the charts saved so far"""
+        draw = sum(d for d, _ in self.timings.values())
+        encode = sum(e for _, e in self.timings.values())
+        return {'charts': len(self.timings), 'draw_seconds': draw, 'encode_seconds': encode,
+                'profiles': list(self.profiles)}
@@ -0,0 +1,238 @@
+"""
+AgriData Explorer - District Time-Series Engine
+File: analysis/timeseries.py
+Purpose: Dense district x year x crop arrays with vectorized rolling means,
+         CAGR, year-over-year deltas and gap-aware interpolation
+"""
+
+import numpy as np
+import pandas as pd
+
+from correlation import discover_crops
+
+MEASURE_SUFFIXES = {
+    'area': 'area_1000_ha',
+    'production': 'production_1000_tons',
+    'yield': 'yield_kg_per_ha',
+}
+
+# Cube-sized arrays held during an operation: the cube and the result
+RESIDENT_COPIES = 2
+
+# Peak bytes of temporaries per cube cell (measured with tracemalloc on
+# float32 and float64 input); operations run over blocks of districts
+# small enough for these to fit in what the budget leaves after
+# RESIDENT_COPIES
+TEMP_BYTES_PER_CELL = {
+    'rolling_mean': 48,
+    'yoy_delta': 24,
+    'interpolate': 80,
+    'state_totals': 24,
+}
+
+
+def compound_growth(start, end, periods):
+    """Compound annual growth rate in percent (NaN where undefined)"""
+    start = np.asarray(start, dtype=np.float64)
+    end = np.asarray(end, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rate = (np.power(end / start, 1.0 / periods) - 1.0) * 100
+    return np.where((start > 0) & (end >= 0) & (periods > 0), rate, np.nan)
+
+
+class DistrictTimeSeries:
+    """District x year x crop cube for one measure
+
+    Missing district-years and ICRISAT's negative sentinels (-1) become NaN,
+    so every operation is gap-aware. The cube is float32. ``memory_budget``
+    bounds the working set: the constructor refuses a cube whose
+    ``RESIDENT_COPIES`` alone would exceed it, and rolling means, deltas,
+    interpolation and state totals process districts in blocks sized so
+    their temporaries (``TEMP_BYTES_PER_CELL``) fit in the rest.
+    """
+
+    def __init__(self, df, crops=None, measure='production', memory_budget=512 * 1024 * 1024,
+                 positive_only=False, dtype=np.float32):
+        self.measure = measure
+        suffix = MEASURE_SUFFIXES[measure]
+        available = list(discover_crops(df.columns, measures=(measure,)))
+        self.crops = [c for c in (crops or available) if c in available]
+        if not self.crops:
+            raise ValueError(f"No {measure} columns found for crops {crops}")
+
+        grouped = df.groupby(['state_name', 'district_name'], sort=True)
+        district_idx = grouped.ngroup().to_numpy()
+        self.districts = grouped.size().index
+        years = df['year'].to_numpy()
+        self.first_year = int(years.min())
+        self.years = np.arange(self.first_year, int(years.max()) + 1)
+
+        shape = (len(self.districts), len(self.years), len(self.crops))
+        self.dtype = np.dtype(dtype)
+        row_cells = shape[1] * shape[2]
+        needed = (int(np.prod(shape)) * self.dtype.itemsize * RESIDENT_COPIES
+                  + row_cells * max(TEMP_BYTES_PER_CELL.values()))
+        if needed > memory_budget:
+            raise MemoryError(
+                f"District cube {shape} needs ~{needed / 1e6:.0f} MB of working memory, "
+                f"budget is {memory_budget / 1e6:.0f} MB; select fewer crops")
+        self.memory_budget = memory_budget
+
+        cols = [f'{crop}_{suffix}' for crop in self.crops]
+        values = df[cols].to_numpy(dtype=self.dtype, na_value=np.nan, copy=True)
+        invalid = values <= 0 if positive_only else values < 0
+        values[invalid] = np.nan
+
+        self.values = np.full(shape, np.nan, dtype=self.dtype)
+        self.values[district_idx, years - self.first_year] = values
+
+    @classmethod
+    def from_csv(cls, data_path, crops=None, measure='production', **kwargs):
+        """Build the cube reading only the key and measure columns"""
+        suffix = MEASURE_SUFFIXES[measure]
+        header = pd.read_csv(data_path, nrows=0).columns
+        keep = ['state_name', 'district_name', 'year']
+        keep += [c for c in header if c.endswith(suffix)
+                 and (crops is None or c[:-len(suffix) - 1] in crops)]
+        return cls(pd.read_csv(data_path, usecols=keep), crops, measure, **kwargs)
+
+    def year_index(self, year):
+        """Position of a calendar year on the year axis"""
+        idx = int(year) - self.first_year
+        if not 0 <= idx < len(self.years):
+            raise KeyError(f"Year {year} outside {self.years[0]}-{self.years[-1]}")
+        return idx
+
+    def _blocks(self, values, operation, result_nbytes=None):
+        """Slices of the first axis whose temporaries for `operation` fit in the budget"""
+        resident = self.values.nbytes + (values.nbytes if result_nbytes is None else result_nbytes)
+        row_bytes = max(1, values[:1].size) * TEMP_BYTES_PER_CELL[operation]
+        rows = max(1, (self.memory_budget - resident) // row_bytes)
+        for start in range(0, len(values), rows):
+            yield slice(start, start + rows)
+
+    # ------------------------------------------------------------------
+    # Vectorized operations (all districts and crops at once)
+    # ------------------------------------------------------------------
+    def rolling_mean(self, window, min_periods=1, values=None):
+        """Trailing `window`-year mean ignoring gaps; NaN below min_periods"""
+        values = self.values if values is None else values
+        result = np.empty(values.shape, dtype=self.dtype)
+        for block in self._blocks(values, 'rolling_mean', result.nbytes):
+            part = values[block]
+            valid = ~np.isnan(part)
+            sums = np.cumsum(np.where(valid, part, 0), axis=1, dtype=np.float64)
+            counts = np.cumsum(valid, axis=1, dtype=np.int32)
+            sums[:, window:] -= sums[:, :-window].copy()
+            counts[:, window:] -= counts[:, :-window].copy()
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = sums / counts
+            mean[counts < min_periods] = np.nan
+            result[block] = mean
+        return result
+
+    def yoy_delta(self, pct=False, lag=1, values=None):
+        """Change versus `lag` years earlier (absolute or percent)"""
+        values = self.values if values is None else values
+        delta = np.full_like(values, np.nan)
+        for block in self._blocks(values, 'yoy_delta'):
+            current, previous = values[block, lag:], values[block, :-lag]
+            if pct:
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    delta[block, lag:] = np.where(previous != 0,
+                                                  (current - previous) / previous * 100, np.nan)
+            else:
+                delta[block, lag:] = current - previous
+        return delta
+
+    def cagr(self, start_year=None, end_year=None, window=None, values=None):
+        """Compound annual growth (%) between two years, or over the last `window` years"""
+        values = self.values if values is None else values
+        end = self.year_index(end_year if end_year is not None else self.years[-1])
+        if window is not None:
+            start = end - int(window)
+            if window < 1 or start < 0:
+                raise ValueError(f"CAGR window {window} does not fit in "
+                                 f"{self.years[0]}-{self.years[-1]} ending {self.years[end]}")
+        else:
+            start = self.year_index(start_year if start_year is not None else self.years[0])
+        return compound_growth(values[:, start], values[:, end], end - start)
+
+    def window_total(self, start_year, end_year, values=None, min_count=1):
+        """Sum over an inclusive year window, NaN if fewer than min_count values"""
+        values = self.values if values is None else values
+        window = values[:, self.year_index(start_year):self.year_index(end_year) + 1]
+        total = np.nansum(window, axis=1, dtype=np.float64)
+        total[np.sum(~np.isnan(window), axis=1) < min_count] = np.nan
+        return total
+
+    def interpolate(self, max_gap=None, values=None):
+        """Linear interpolation of interior gaps up to `max_gap` years long
+
+        Leading and trailing gaps are left as NaN: a series is never
+        extrapolated.
+        """
+        values = self.values if values is None else values
+        n_years = values.shape[1]
+        positions = np.arange(n_years).reshape(1, -1, 1)
+        result = values.copy()
+        for block in self._blocks(values, 'interpolate'):
+            part = values[block]
+            valid = ~np.isnan(part)
+
+            prev_idx = np.where(valid, positions, -1)
+            np.maximum.accumulate(prev_idx, axis=1, out=prev_idx)
+            next_idx = np.where(valid, positions, n_years)
+            next_idx = np.minimum.accumulate(next_idx[:, ::-1], axis=1)[:, ::-1]
+
+            fill = ~valid & (prev_idx >= 0) & (next_idx < n_years)
+            if max_gap is not None:
+                fill &= (next_idx - prev_idx - 1) <= max_gap
+
+            prev_val = np.take_along_axis(part, np.clip(prev_idx, 0, n_years - 1), axis=1)
+            next_val = np.take_along_axis(part, np.clip(next_idx, 0, n_years - 1), axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                frac = (positions - prev_idx) / (next_idx - prev_idx)
+            result[block][fill] = (prev_val + (next_val - prev_val) * frac)[fill]
+        return result
+
+    # ------------------------------------------------------------------
+    # Roll-ups and conversion
+    # ------------------------------------------------------------------
+    def state_totals(self):
+        """(states, years, crops) sums of the district cube; all-gap cells stay NaN"""
+        states = self.districts.get_level_values('state_name')
+        codes, labels = pd.factorize(states, sort=True)
+        totals = np.zeros((len(labels),) + self.values.shape[1:], dtype=np.float64)
+        counts = np.zeros(totals.shape, dtype=np.int32)
+        for block in self._blocks(self.values, 'state_totals', totals.nbytes + counts.nbytes):
+            part, block_codes = self.values[block], codes[block]
+            # Districts are sorted by state, so each state is a run within the block
+            starts = np.flatnonzero(np.r_[True, block_codes[1:] != block_codes[:-1]])
+            valid = ~np.isnan(part)
+            totals[block_codes[starts]] += np.add.reduceat(np.where(valid, part, 0), starts,
+                                                           axis=0, dtype=np.float64)
+            counts[block_codes[starts]] += np.add.reduceat(valid, starts, axis=0, dtype=np.int32)
+        totals[counts == 0] = np.nan
+        return pd.Index(labels, name='state_name'), totals
+
+    def to_frame(self, values=None, name='value', index=None):
+        """Long frame [index levels..., year, crop, name] without NaN cells"""
+        values = self.values if values is None else values
+        index = self.districts if index is None else index
+        if values.ndim == 2:
+            frame = pd.DataFrame(values, index=index, columns=self.crops)
+            return (frame.rename_axis(columns='crop').stack().rename(name).reset_index())
+        n_rows, n_years, n_crops = values.shape
+        flat = values.reshape(-1)
+        keep = ~np.isnan(flat)
+        row = np.repeat(np.arange(n_rows), n_years * n_crops)[keep]
+        frame = index.to_frame(index=False).iloc[row].reset_index(drop=True)
+        frame['year'] = np.tile(np.repeat(self.years, n_crops), n_rows)[keep]
+        frame['crop'] = np.tile(self.crops, n_rows * n_years)[keep]
+        frame[name] = flat[keep]
+        return frame
+
+    def nbytes(self):
+        """Memory held by the cube"""
+        return self.values.nbytes
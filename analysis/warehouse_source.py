@@ -0,0 +1,309 @@
+"""
+AgriData Explorer - Warehouse Data Source
+File: analysis/warehouse_source.py
+Purpose: Push EDA groupby/filter/top-N work down to the SQL warehouse and
+         fetch only the aggregated result set
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, create_engine, inspect, text
+
+from caching import LRUCache, normalize_where
+from correlation import pearson_from_moments
+
+# Cleaned-CSV measure suffixes are dropped in fact_production column names
+MEASURE_SUFFIX = re.compile(r'_(1000_ha|1000_tons|kg_per_ha)$')
+
+# Cleaned-CSV crop prefixes that differ from the warehouse column names
+CROP_ALIASES = {
+    'soyabean': 'soybean',
+    'rapeseed_and_mustard': 'rapeseed_mustard',
+}
+
+# Group/filter keys and the joined column that answers them
+DIMENSION_COLUMNS = {
+    'state_name': 's.state_name',
+    'state_code': 's.state_code',
+    'region': 's.region',
+    'district_name': 'd.district_name',
+    'district_code': 'd.district_code',
+    'year': 'f.year_id',
+    'decade': 'y.decade',
+    'is_recent': 'y.is_recent',
+}
+
+SQL_AGGREGATES = {'sum': 'SUM', 'mean': 'AVG', 'count': 'COUNT', 'min': 'MIN', 'max': 'MAX'}
+
+# Optional pre-aggregated tables: table -> grain. A rollup holds one row per
+# grain with SUMs of the fact measures under their fact column names.
+DEFAULT_ROLLUPS = {
+    'agg_state_year': ('state_name', 'year'),
+    'agg_state_decade': ('state_name', 'decade'),
+}
+
+FACT_FROM = """
+    FROM fact_production f
+    JOIN dim_district d ON f.district_id = d.district_id
+    JOIN dim_state s ON d.state_id = s.state_id
+    JOIN dim_year y ON f.year_id = y.year_id
+"""
+
+
+def fact_column(cleaned_name):
+    """fact_production column for a cleaned-CSV measure column"""
+    name = MEASURE_SUFFIX.sub('', cleaned_name)
+    for cleaned, warehouse in CROP_ALIASES.items():
+        if name.startswith(cleaned + '_'):
+            name = warehouse + name[len(cleaned):]
+    return name
+
+
+class WarehouseSource:
+    """Answer AgriEDAVisualizer aggregations with SQL against the star schema
+
+    ``aggregate`` has the same contract as ``AggregationCache.aggregate``
+    (cleaned column names in, pandas object out) so the visualizer can use
+    either. Each call becomes one ``SELECT ... GROUP BY`` against
+    ``fact_production`` and its dimensions - or against a rollup table when
+    one covers the request - and results are memoized in a byte-bounded LRU.
+
+    Connections come from the SQLAlchemy engine's pool. Any SQLAlchemy URL
+    works; ``sqlite:///warehouse.db`` is the local stand-in for MySQL.
+    """
+
+    def __init__(self, engine=None, url=None, pool_size=5, rollups=None,
+                 cache_bytes=16 * 1024 * 1024):
+        if engine is None:
+            engine = create_engine(url, pool_size=pool_size, pool_pre_ping=True)
+        self.engine = engine
+        self.dialect = engine.dialect.name
+        self.cache = LRUCache(cache_bytes)
+
+        inspector = inspect(engine)
+        tables = set(inspector.get_table_names())
+        self.rollups = {name: grain for name, grain in (rollups or DEFAULT_ROLLUPS).items()
+                        if name in tables}
+        self._rollup_columns = {name: {c['name'] for c in inspector.get_columns(name)}
+                                for name in self.rollups}
+        self._fact_columns = [c['name'] for c in inspector.get_columns('fact_production')]
+
+    @classmethod
+    def from_loader(cls, loader, **kwargs):
+        """Reuse an AgriDataLoader's MySQL credentials"""
+        url = (f"mysql+mysqlconnector://{loader.user}:{loader.password}"
+               f"@{loader.host}/{loader.database}")
+        return cls(url=url, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Schema helpers
+    # ------------------------------------------------------------------
+    @property
+    def columns(self):
+        """Cleaned-style column names available from the warehouse"""
+        suffixes = {'area': '_1000_ha', 'production': '_1000_tons', 'yield': '_kg_per_ha'}
+        names = list(DIMENSION_COLUMNS)
+        for col in self._fact_columns:
+            measure = col.rsplit('_', 1)[-1]
+            if measure in suffixes:
+                names.append(f'{col}{suffixes[measure]}')
+        return names
+
+    def _measure(self, column, alias='f'):
+        name = fact_column(column)
+        if name not in self._fact_columns:
+            raise KeyError(f"Column '{column}' has no fact_production counterpart ({name})")
+        return f'{alias}.{name}' if alias else name
+
+    @staticmethod
+    def _dimension(key):
+        if key not in DIMENSION_COLUMNS:
+            raise KeyError(f"Cannot group or filter on '{key}' in the warehouse")
+        return DIMENSION_COLUMNS[key]
+
+    @staticmethod
+    def _where(where, column_of):
+        """WHERE clause and bind parameters for an equality/IN filter"""
+        clauses, params = [], {}
+        for i, (column, value) in enumerate(normalize_where(where)):
+            name = f'w{i}'
+            op = 'IN' if isinstance(value, tuple) else '='
+            clauses.append(f'{column_of(column)} {op} :{name}')
+            params[name] = list(value) if isinstance(value, tuple) else value
+        sql = ' WHERE ' + ' AND '.join(clauses) if clauses else ''
+        return sql, params
+
+    def _floor(self, expr):
+        # SQLite builds without math functions lack FLOOR; CAST truncates,
+        # which equals floor for the non-negative bin offsets used here
+        return f'CAST({expr} AS INTEGER)' if self.dialect == 'sqlite' else f'FLOOR({expr})'
+
+    def _rollup_for(self, keys, funcs, where):
+        if any(func != 'sum' for func in funcs.values()):
+            return None
+        needed = set(keys) | set(where or {})
+        measures = {fact_column(c) for c in funcs}
+        for table, grain in self.rollups.items():
+            if needed <= set(grain) and measures <= self._rollup_columns[table]:
+                return table
+        return None
+
+    def read_sql(self, sql, params=None):
+        """Run a query on a pooled connection and return a DataFrame"""
+        params = params or {}
+        statement = text(sql).bindparams(*(
+            bindparam(name, expanding=True) for name, value in params.items()
+            if isinstance(value, list)))
+        with self.engine.connect() as conn:
+            return pd.read_sql(statement, conn, params=params)
+
+    # ------------------------------------------------------------------
+    # Push-down operations
+    # ------------------------------------------------------------------
+    def aggregate(self, keys, columns, aggfunc='sum', where=None):
+        """SQL equivalent of ``df[filter].groupby(keys)[columns].agg(aggfunc)``"""
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        single = isinstance(columns, str)
+        cols = [columns] if single else list(columns)
+        funcs = aggfunc if isinstance(aggfunc, dict) else dict.fromkeys(cols, aggfunc)
+
+        cache_key = (tuple(keys), tuple(cols), tuple(funcs[c] for c in cols),
+                     normalize_where(where))
+        result = self.cache.get(cache_key)
+        if result is None:
+            result = self._aggregate(keys, cols, funcs, where)
+            self.cache.put(cache_key, result)
+        result = result.copy()
+        return result[cols[0]] if single else result
+
+    def _aggregate(self, keys, cols, funcs, where):
+        rollup = self._rollup_for(keys, funcs, where)
+        if rollup:
+            select_keys = [f'r.{k}' for k in keys]
+            measures = [f'SUM(r.{fact_column(c)}) AS "{c}"' for c in cols]
+            from_sql = f' FROM {rollup} r'
+            where_sql, params = self._where(where, lambda k: f'r.{k}')
+        else:
+            select_keys = [self._dimension(k) for k in keys]
+            measures = [f'{SQL_AGGREGATES[funcs[c]]}({self._measure(c)}) AS "{c}"' for c in cols]
+            from_sql = FACT_FROM
+            where_sql, params = self._where(where, self._dimension)
+
+        key_aliases = [f'{expr} AS "{key}"' for expr, key in zip(select_keys, keys)]
+        group_sql = ', '.join(select_keys)
+        sql = (f"SELECT {', '.join(key_aliases + measures)}{from_sql}{where_sql}"
+               f" GROUP BY {group_sql} ORDER BY {group_sql}")
+        frame = self.read_sql(sql, params)
+        frame[cols] = frame[cols].astype(np.float64)
+        return frame.set_index(keys)
+
+    def top_n(self, keys, column, n, aggfunc='sum', where=None):
+        """Largest n groups by one aggregated measure, ranked in SQL
+
+        Same result as ``ranking.top_n(aggregate(...), n)``: ties go to the
+        group that sorts first.
+        """
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        cache_key = ('top_n', tuple(keys), column, aggfunc, int(n), normalize_where(where))
+        result = self.cache.get(cache_key)
+        if result is None:
+            select_keys = [self._dimension(k) for k in keys]
+            measure = f'{SQL_AGGREGATES[aggfunc]}({self._measure(column)})'
+            where_sql, params = self._where(where, self._dimension)
+            key_aliases = [f'{expr} AS "{key}"' for expr, key in zip(select_keys, keys)]
+            group_sql = ', '.join(select_keys)
+            sql = (f"SELECT {', '.join(key_aliases)}, {measure} AS value{FACT_FROM}{where_sql}"
+                   f" GROUP BY {group_sql} ORDER BY value DESC, {group_sql} LIMIT {int(n)}")
+            frame = self.read_sql(sql, params)
+            result = frame.set_index(keys)['value'].astype(np.float64).rename(column)
+            self.cache.put(cache_key, result)
+        return result.copy()
+
+    def _valid_means(self, crops):
+        """Global mean area and production per crop over rows where both are positive"""
+        selects = []
+        for crop in crops:
+            area, prod = f'f.{crop}_area', f'f.{crop}_production'
+            valid = f'{area} > 0 AND {prod} > 0'
+            selects += [f'AVG(CASE WHEN {valid} THEN {area} END) AS {crop}__x',
+                        f'AVG(CASE WHEN {valid} THEN {prod} END) AS {crop}__y']
+        row = self.read_sql(f"SELECT {', '.join(selects)} FROM fact_production f").iloc[0]
+        return {crop: (float(np.nan_to_num(row[f'{crop}__x'])), float(np.nan_to_num(row[f'{crop}__y'])))
+                for crop in crops}
+
+    def correlations(self, crops, by=None, min_count=3):
+        """Area-vs-production Pearson r per crop from SQL-side moment sums
+
+        Values are centred on their global mean before the products are
+        summed, as in CorrelationEngine, so large magnitudes do not cancel
+        out of the variance.
+        """
+        keys = [] if by is None else ([by] if isinstance(by, str) else list(by))
+        means = self._valid_means(crops)
+        selects, names = [], []
+        for crop in crops:
+            area, prod = f'f.{crop}_area', f'f.{crop}_production'
+            valid = f'{area} > 0 AND {prod} > 0'
+            mean_x, mean_y = means[crop]
+            x, y = f'({area} - {mean_x!r})', f'({prod} - {mean_y!r})'
+            for name, expr in (('n', '1'), ('sx', x), ('sy', y), ('sxx', f'{x} * {x}'),
+                               ('syy', f'{y} * {y}'), ('sxy', f'{x} * {y}')):
+                selects.append(f'SUM(CASE WHEN {valid} THEN {expr} ELSE 0 END) AS {crop}__{name}')
+            names.append(crop)
+
+        key_sql = [f'{self._dimension(k)} AS "{k}"' for k in keys]
+        sql = f"SELECT {', '.join(key_sql + selects)}{FACT_FROM}"
+        if keys:
+            sql += ' GROUP BY ' + ', '.join(self._dimension(k) for k in keys)
+        frame = self.read_sql(sql)
+
+        moments = np.stack([
+            frame[[f'{crop}__{m}' for crop in names]].to_numpy(dtype=np.float64)
+            for m in ('n', 'sx', 'sy', 'sxx', 'syy', 'sxy')
+        ])
+        corr = pd.DataFrame(pearson_from_moments(moments, min_count), columns=names)
+        if not keys:
+            return corr.iloc[0].rename('corr')
+        corr.index = pd.MultiIndex.from_frame(frame[keys]) if len(keys) > 1 \
+            else pd.Index(frame[keys[0]])
+        return corr
+
+    def density_bins(self, crop, bins=60):
+        """Area-vs-production scatter binned in SQL (same shape as correlation.density_bins)"""
+        area, prod = f'f.{crop}_area', f'f.{crop}_production'
+        valid = f' WHERE {area} > 0 AND {prod} > 0'
+        bounds = self.read_sql(f"SELECT MIN({area}) AS x0, MAX({area}) AS x1, "
+                               f"MIN({prod}) AS y0, MAX({prod}) AS y1 FROM fact_production f{valid}")
+        if bounds.iloc[0].isna().any():
+            return pd.DataFrame(columns=['x', 'y', 'count'])
+        x0, x1, y0, y1 = (float(v) for v in bounds.iloc[0])
+        x_width = (x1 - x0) / bins or 1.0
+        y_width = (y1 - y0) / bins or 1.0
+
+        def bin_of(expr, low, width):
+            raw = self._floor(f'({expr} - {low!r}) / {width!r}')
+            return f'CASE WHEN {raw} >= {bins} THEN {bins - 1} ELSE {raw} END'
+
+        bx, by = bin_of(area, x0, x_width), bin_of(prod, y0, y_width)
+        cells = self.read_sql(f"SELECT {bx} AS bin_x, {by} AS bin_y, COUNT(*) AS n "
+                              f"FROM fact_production f{valid} GROUP BY bin_x, bin_y")
+        return pd.DataFrame({
+            'x': x0 + (cells['bin_x'].to_numpy(dtype=np.float64) + 0.5) * x_width,
+            'y': y0 + (cells['bin_y'].to_numpy(dtype=np.float64) + 0.5) * y_width,
+            'count': cells['n'].astype(np.int64),
+        })
+
+    def year_range(self):
+        """(first, last) year present in the fact table"""
+        bounds = self.read_sql("SELECT MIN(year_id) AS y0, MAX(year_id) AS y1 FROM fact_production")
+        return int(bounds.iloc[0, 0]), int(bounds.iloc[0, 1])
+
+    def row_count(self):
+        """Number of fact rows (for the visualizer's load banner)"""
+        return int(self.read_sql("SELECT COUNT(*) AS n FROM fact_production").iloc[0, 0])
+
+    def stats(self):
+        """Result-cache hit rate and memory held"""
+        return self.cache.stats()
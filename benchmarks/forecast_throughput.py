@@ -0,0 +1,90 @@
+"""
+AgriData Explorer - Forecast Throughput Benchmark
+File: benchmarks/forecast_throughput.py
+Purpose: Series fitted per second by the batched trend fits in
+         analysis/forecast.py versus fitting each district x crop series
+         in a Python loop
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'analysis'))
+
+from forecast import HUBER_K, MAD_SCALE, YieldForecaster  # noqa: E402
+from timeseries import DistrictTimeSeries  # noqa: E402
+
+
+def fit_loop(y, years, method, max_iter=50, tol=1e-6):
+    """Per-series reference fit: np.polyfit (plus IRLS for Huber) on each row"""
+    t_all = years - years.mean()
+    coefs = np.full((len(y), 2), np.nan)
+    for i, row in enumerate(y):
+        valid = ~np.isnan(row)
+        t, values = t_all[valid], row[valid]
+        slope, intercept = np.polyfit(t, values, 1)
+        if method == 'huber':
+            for _ in range(max_iter):
+                resid = values - intercept - slope * t
+                scale = np.median(np.abs(resid)) / MAD_SCALE
+                if scale == 0:
+                    break
+                weights = np.minimum(1.0, HUBER_K * scale / np.maximum(np.abs(resid), 1e-12))
+                new_slope, new_intercept = np.polyfit(t, values, 1, w=np.sqrt(weights))
+                done = max(abs(new_intercept - intercept), abs(new_slope - slope) * np.abs(t).max()) \
+                    <= tol * (1.0 + abs(new_intercept))
+                slope, intercept = new_slope, new_intercept
+                if done:
+                    break
+        coefs[i] = intercept, slope
+    return coefs
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Yield forecast throughput benchmark')
+    parser.add_argument('path', nargs='?', default='data/processed/agri_data_cleaned.csv',
+                        help='cleaned CSV')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--loop-sample', type=int, default=1000,
+                        help='series fitted by the Python loop (it is timed on a sample)')
+    args = parser.parse_args()
+
+    series = DistrictTimeSeries.from_csv(args.path, measure='yield', positive_only=True)
+    print("="*60)
+    print(f"FORECAST THROUGHPUT ({len(series.districts):,} districts x {len(series.crops)} crops "
+          f"x {len(series.years)} years, best of {args.repeat})")
+    print("="*60)
+
+    for method in ('ols', 'huber'):
+        fit_times, total_times = [], []
+        for _ in range(args.repeat):
+            forecaster = YieldForecaster(series, method=method)
+            started = time.perf_counter()
+            forecaster.fit()
+            fitted = time.perf_counter()
+            forecaster.to_frame()
+            fit_times.append(fitted - started)
+            total_times.append(time.perf_counter() - started)
+        n_series = len(forecaster.fitted)
+
+        y, years = forecaster._matrix()
+        sample = forecaster.fitted[:args.loop_sample]
+        started = time.perf_counter()
+        coefs = fit_loop(y[sample], years, method)
+        loop_rate = len(sample) / (time.perf_counter() - started)
+        batched = np.column_stack([forecaster.intercept, forecaster.slope])[:len(sample)]
+        max_diff = np.nanmax(np.abs(coefs - batched))
+
+        fit_rate = n_series / min(fit_times)
+        print(f"\n{method.upper()} ({n_series:,} series, {forecaster.iterations} iterations)")
+        print(f"  Batched fit:            {min(fit_times) * 1000:>8.1f} ms  {fit_rate:>12,.0f} series/s")
+        print(f"  Batched fit + forecast: {min(total_times) * 1000:>8.1f} ms  "
+              f"{n_series / min(total_times):>12,.0f} series/s")
+        print(f"  Python loop:            {len(sample) / loop_rate * 1000:>8.1f} ms  "
+              f"{loop_rate:>12,.0f} series/s (on {len(sample):,} series)")
+        print(f"  Speedup: {fit_rate / loop_rate:,.0f}x, max coefficient difference {max_diff:.2e}")
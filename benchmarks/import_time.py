@@ -0,0 +1,103 @@
+"""
+AgriData Explorer - Import Time Benchmark
+File: benchmarks/import_time.py
+Purpose: Measure cold-start cost of the analysis and ETL modules with
+         python -X importtime and check that plotting/DB libraries are
+         only loaded by the code paths that need them
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ['matplotlib', 'seaborn', 'plotly', 'sqlalchemy', 'mysql']
+
+# name -> (working directory, snippet run in a fresh interpreter)
+SCENARIOS = {
+    'aggregation': ('analysis', (
+        "import pandas as pd\n"
+        "import comprehensive_eda\n"
+        "from caching import AggregationCache\n"
+        "df = pd.DataFrame({'state_name': ['A', 'B', 'A'], 'rice_production_1000_tons': [1.0, 2.0, 3.0]})\n"
+        "AggregationCache(df).aggregate('state_name', 'rice_production_1000_tons')\n"
+    )),
+    'cleaning': ('etl', (
+        "import pandas as pd\n"
+        "import run_etl\n"
+        "from clean_ingest import AgriDataCleaner\n"
+        "cleaner = AgriDataCleaner.__new__(AgriDataCleaner)\n"
+        "cleaner.cleaning_report = {}\n"
+        "cleaner.df_raw = pd.DataFrame({'Year': [2000], 'State Name': ['A'], 'Dist Name': ['B'],\n"
+        "                               'RICE AREA (1000 ha)': [1.0]})\n"
+        "cleaner.standardize_columns().handle_missing_values().validate_data_types()\n"
+    )),
+    'charting': ('analysis', (
+        "import comprehensive_eda\n"
+        "comprehensive_eda._setup_plotting()\n"
+    )),
+}
+
+REPORT = "import sys\nprint('LOADED=' + ','.join(m for m in {heavy!r} if m in sys.modules))\n"
+
+
+def parse_importtime(stderr):
+    """Top-level modules and their cumulative import time (us) from -X importtime"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented past the single separator space; only
+        # top-level entries add up to the total
+        if not name[1:].startswith(' '):
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def run_scenario(name, repeat=3):
+    """Best-of-`repeat` wall time, import time and heavy modules for one scenario"""
+    workdir, snippet = SCENARIOS[name]
+    code = snippet + REPORT.format(heavy=HEAVY_MODULES)
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                              cwd=os.path.join(PROJECT_ROOT, workdir),
+                              capture_output=True, text=True)
+        wall = time.perf_counter() - started
+        if proc.returncode != 0:
+            raise RuntimeError(f"{name} failed:\n{proc.stderr[-2000:]}")
+        if best is None or wall < best['wall_seconds']:
+            loaded = [line for line in proc.stdout.splitlines() if line.startswith('LOADED=')]
+            best = {
+                'wall_seconds': wall,
+                'modules': parse_importtime(proc.stderr),
+                'heavy_loaded': [m for m in loaded[-1][len('LOADED='):].split(',') if m],
+            }
+    best['import_seconds'] = sum(best['modules'].values()) / 1e6
+    return best
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Import-time benchmark')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=5, help='slowest top-level imports to list')
+    args = parser.parse_args()
+
+    print("="*70)
+    print("IMPORT TIME (python -X importtime, best of %d)" % args.repeat)
+    print("="*70)
+    for name in args.scenarios.split(','):
+        result = run_scenario(name, args.repeat)
+        heavy = ', '.join(result['heavy_loaded']) or 'none'
+        print(f"\n{name}: {result['wall_seconds']:.2f}s wall, "
+              f"{result['import_seconds']:.2f}s importing; heavy libraries loaded: {heavy}")
+        slowest = sorted(result['modules'].items(), key=lambda item: -item[1])[:args.top]
+        for module, micros in slowest:
+            print(f"  {module:30s} {micros / 1000:>8,.1f} ms")
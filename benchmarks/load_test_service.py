@@ -0,0 +1,95 @@
+"""
+AgriData Explorer - Analytics Service Load Test
+File: benchmarks/load_test_service.py
+Purpose: Drive analysis/analytics_service.py locally over keep-alive
+         connections and report throughput and latency percentiles
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+DEFAULT_PATHS = [
+    '/queries/q1', '/queries/q3', '/queries/q6?year=2015', '/queries/q9',
+    '/eda/eda_1', '/eda/eda_7', '/eda/eda_15',
+    '/aggregate?by=state_name&column=rice_production_1000_tons&n=5',
+]
+
+
+async def worker(host, port, paths, requests, latencies, etags, use_etag):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(requests):
+            path = paths[i % len(paths)]
+            lines = [f'GET {path} HTTP/1.1', f'Host: {host}']
+            if use_etag and path in etags:
+                lines.append(f'If-None-Match: {etags[path]}')
+            started = time.perf_counter()
+            writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode())
+            await writer.drain()
+
+            await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode().partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+                elif name.lower() == 'etag':
+                    etags[path] = value.strip()
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+
+
+async def fetch_json(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n'.encode())
+    raw = await reader.read()
+    writer.close()
+    return json.loads(raw.split(b'\r\n\r\n', 1)[1])
+
+
+async def run(args):
+    paths = args.paths or DEFAULT_PATHS
+    latencies, etags = [], {}
+
+    # Warm-up pass so the run measures the cached path
+    await worker(args.host, args.port, paths, len(paths), [], etags, False)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(args.host, args.port, paths, args.requests, latencies,
+                                  etags, args.etag) for _ in range(args.connections)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total = len(latencies)
+    print("\n" + "="*60)
+    print("ANALYTICS SERVICE LOAD TEST")
+    print("="*60)
+    print(f"Requests:    {total:,} over {args.connections} connections")
+    print(f"Throughput:  {total / elapsed:,.0f} req/s")
+    print(f"Client p50:  {latencies[total // 2] * 1000:.3f} ms")
+    print(f"Client p99:  {latencies[int(total * 0.99) - 1] * 1000:.3f} ms")
+
+    metrics = await fetch_json(args.host, args.port, '/metrics')
+    overall = metrics['latency'].get('*', {})
+    print(f"Server p50:  {overall.get('p50_ms')} ms")
+    print(f"Server p99:  {overall.get('p99_ms')} ms")
+    print(f"Cache hit rate: {metrics['response_cache']['hit_rate']:.1%}")
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Load-test the analytics service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=500, help='requests per connection')
+    parser.add_argument('--etag', action='store_true', help='send If-None-Match (304 path)')
+    parser.add_argument('paths', nargs='*', help='paths to request (default: a mixed set)')
+    asyncio.run(run(parser.parse_args()))
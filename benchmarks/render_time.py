@@ -0,0 +1,101 @@
+"""
+AgriData Explorer - Chart Render Time Benchmark
+File: benchmarks/render_time.py
+Purpose: Per-chart render time of the EDA charts on the reusable figure
+         templates in analysis/rendering.py versus the pyplot version of
+         comprehensive_eda.py they replaced
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'analysis'))
+
+import comprehensive_eda  # noqa: E402
+
+CHARTS = sorted((name for name in dir(comprehensive_eda.AgriEDAVisualizer) if name.startswith('eda_')),
+                key=lambda name: int(name.split('_')[1]))
+
+
+def baseline_revision():
+    """Revision of comprehensive_eda.py just before the rendering layer (HEAD if not committed yet)"""
+    commits = subprocess.run(
+        ['git', 'log', '--format=%H', '-S', 'ChartRenderer', '--', 'analysis/comprehensive_eda.py'],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True).stdout.split()
+    return f'{commits[-1]}^' if commits else 'HEAD'
+
+
+def load_baseline(revision, directory):
+    """Import comprehensive_eda.py as of ``revision`` under another module name"""
+    source = subprocess.run(['git', 'show', f'{revision}:analysis/comprehensive_eda.py'],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True).stdout
+    path = os.path.join(directory, 'comprehensive_eda_baseline.py')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location('comprehensive_eda_baseline', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def time_charts(module, data_path, output_dir, repeat, **kwargs):
+    """Best-of-``repeat`` seconds per chart, after one warm-up pass that fills the aggregation cache"""
+    module.OUTPUT_DIR = output_dir
+    with contextlib.redirect_stdout(io.StringIO()):
+        visualizer = module.AgriEDAVisualizer(data_path, **kwargs)
+        for name in CHARTS:
+            getattr(visualizer, name)()
+        timings = {}
+        for name in CHARTS:
+            runs = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                getattr(visualizer, name)()
+                runs.append(time.perf_counter() - started)
+            timings[name] = min(runs)
+    return timings
+
+
+# Main execution
+if __name__ == "__main__":
+    warnings.filterwarnings('ignore')
+
+    parser = argparse.ArgumentParser(description='EDA chart render time benchmark')
+    parser.add_argument('path', nargs='?', default='data/processed/agri_data_cleaned.csv',
+                        help='cleaned CSV')
+    parser.add_argument('--baseline', default=None,
+                        help='git revision of the pyplot version (default: just before rendering.py)')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    revision = args.baseline or baseline_revision()
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = load_baseline(revision, tmp)
+        results = {
+            'pyplot': time_charts(baseline, args.path, os.path.join(tmp, 'pyplot'), args.repeat),
+            'templates': time_charts(comprehensive_eda, args.path, os.path.join(tmp, 'print'),
+                                     args.repeat),
+            '+screen+thumb': time_charts(comprehensive_eda, args.path, os.path.join(tmp, 'all'),
+                                         args.repeat,
+                                         profiles=('print', 'screen', 'thumbnail')),
+        }
+
+    print("="*60)
+    print(f"CHART RENDER TIME (ms, best of {args.repeat}; baseline {revision[:12]})")
+    print("="*60)
+    print(f"{'chart':<34}" + ''.join(f"{name:>14}" for name in results))
+    for chart in CHARTS:
+        print(f"{chart:<34}" + ''.join(f"{r[chart] * 1000:>14.1f}" for r in results.values()))
+    totals = {name: sum(r.values()) for name, r in results.items()}
+    print(f"{'total':<34}" + ''.join(f"{t * 1000:>14.1f}" for t in totals.values()))
+    print(f"\nSpeedup (print only): {totals['pyplot'] / totals['templates']:.2f}x; "
+          f"screen and thumbnail PNGs add {(totals['+screen+thumb'] / totals['templates'] - 1):.0%}")
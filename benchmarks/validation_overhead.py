@@ -0,0 +1,75 @@
+"""
+AgriData Explorer - Validation Overhead Benchmark
+File: benchmarks/validation_overhead.py
+Purpose: Time the cleaning pipeline with and without the data-quality
+         rules (end to end and in-memory stages only) and report the share
+         added by validation
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'etl'))
+
+from clean_ingest import AgriDataCleaner  # noqa: E402
+
+
+def clean_once(raw, output_dir, validate):
+    """Run the cleaning stages on a copy of `raw`; return (seconds, validation seconds)"""
+    cleaner = AgriDataCleaner(None, output_dir, validate=validate)
+    cleaner.df_raw = raw.copy()
+    started = time.perf_counter()
+    cleaner.standardize_columns().handle_missing_values().remove_duplicates().validate_data_types()
+    validation_started = time.perf_counter()
+    cleaner.validate_records()
+    validation = time.perf_counter() - validation_started
+    cleaner.add_derived_columns().filter_invalid_records().finalize_cleaning()
+    return time.perf_counter() - started, validation
+
+
+def pipeline_once(path, output_dir, validate):
+    """Seconds for a full run_pipeline (read, clean, write CSV and report)"""
+    started = time.perf_counter()
+    AgriDataCleaner(path, output_dir, validate=validate).run_pipeline()
+    return time.perf_counter() - started
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Validation overhead benchmark')
+    parser.add_argument('path', nargs='?', default='data/raw/icrisat_district_data.csv',
+                        help='raw ICRISAT CSV')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    raw = pd.read_csv(args.path, encoding='utf-8')
+    with tempfile.TemporaryDirectory() as output_dir:
+        # Alternate the two modes so drift in machine load affects both equally
+        stages = {False: [], True: []}
+        end_to_end = {False: [], True: []}
+        for _ in range(args.repeat):
+            for validate in (False, True):
+                stages[validate].append(clean_once(raw, output_dir, validate))
+                end_to_end[validate].append(pipeline_once(args.path, output_dir, validate))
+    end_to_end = {validate: min(times) for validate, times in end_to_end.items()}
+    baseline = min(total for total, _ in stages[False])
+    validated = min(total for total, _ in stages[True])
+    rules = min(validation for _, validation in stages[True])
+
+    print("="*60)
+    print(f"VALIDATION OVERHEAD ({len(raw):,} rows x {len(raw.columns)} columns, best of {args.repeat})")
+    print("="*60)
+    print(f"run_pipeline without rules: {end_to_end[False] * 1000:>8.1f} ms")
+    print(f"run_pipeline with rules:    {end_to_end[True] * 1000:>8.1f} ms "
+          f"(+{end_to_end[True] / end_to_end[False] - 1:.1%})")
+    print(f"Stages without rules:       {baseline * 1000:>8.1f} ms (in memory, no I/O)")
+    print(f"Stages with rules:          {validated * 1000:>8.1f} ms "
+          f"(+{validated / baseline - 1:.1%})")
+    print(f"validate_records():         {rules * 1000:>8.1f} ms")
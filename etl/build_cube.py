@@ -0,0 +1,215 @@
+"""
+AgriData Explorer - Pre-aggregated Cube Export
+File: etl/build_cube.py
+Purpose: Aggregate the cleaned data to national x year, state x year,
+         state x decade and district x decade grains for Power BI and
+         dashboards, written as Parquet (CSV fallback) with a manifest
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+CROP_MEASURE = re.compile(r'^(?P<crop>.+)_(?P<measure>area_1000_ha|production_1000_tons)$')
+
+# Finest grains are accumulated from the data; the others roll up from them
+BASE_GRAINS = {
+    'state_year': ['state_name', 'year'],
+    'district_decade': ['state_name', 'district_name', 'decade'],
+}
+
+# Output grain -> (keys, base grain it rolls up from, parent grain for shares)
+GRAINS = {
+    'national_year': (['year'], 'state_year', None),
+    'state_year': (['state_name', 'year'], 'state_year', 'national_year'),
+    'state_decade': (['state_name', 'decade'], 'district_decade', 'national_decade'),
+    'district_decade': (['state_name', 'district_name', 'decade'], 'district_decade', 'state_decade'),
+}
+
+# Warehouse rollup tables read by analysis/warehouse_source.py
+ROLLUP_GRAINS = {
+    'agg_state_year': ['state_name', 'year'],
+    'agg_state_decade': ['state_name', 'decade'],
+}
+
+
+def measure_columns(columns):
+    """Additive crop measures (area and production) in the cleaned data"""
+    return [c for c in columns if CROP_MEASURE.match(c)]
+
+
+def crops_of(columns):
+    return sorted({CROP_MEASURE.match(c).group('crop') for c in measure_columns(columns)})
+
+
+class CubeBuilder:
+    """Accumulate additive crop measures chunk by chunk and derive the cube
+
+    Only sums are accumulated, so cleaned chunks can be folded in as they
+    stream through the ETL and the builder holds one row per base-grain
+    group rather than the dataset. Yields are recomputed from the summed
+    production and area (area-weighted), and each grain gets every crop's
+    percentage share of its parent grain's production.
+    """
+
+    def __init__(self, collapse_every=16):
+        self.partials = {name: [] for name in BASE_GRAINS}
+        self.collapse_every = collapse_every
+        self.source_rows = 0
+        self.measures = None
+
+    def update(self, chunk):
+        """Fold one cleaned chunk into the base-grain sums"""
+        if self.measures is None:
+            self.measures = measure_columns(chunk.columns)
+        if 'decade' not in chunk.columns:
+            chunk = chunk.assign(decade=(chunk['year'] // 10) * 10)
+        self.source_rows += len(chunk)
+
+        for name, keys in BASE_GRAINS.items():
+            partials = self.partials[name]
+            partials.append(chunk.groupby(keys, sort=False)[self.measures].sum())
+            if len(partials) >= self.collapse_every:
+                self.partials[name] = [self._collapse(name)]
+        return self
+
+    def _collapse(self, name):
+        frames = self.partials[name]
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames).groupby(level=list(range(len(BASE_GRAINS[name]))), sort=True).sum()
+
+    def build(self):
+        """Return {grain: DataFrame} with sums, weighted yields and shares"""
+        base = {name: self._collapse(name).sort_index() for name in BASE_GRAINS}
+        sums = {}
+        for name, (keys, source, _) in GRAINS.items():
+            sums[name] = base[source].groupby(level=keys, sort=True).sum()
+        sums['national_decade'] = base['district_decade'].groupby(level='decade', sort=True).sum()
+
+        cube = {}
+        for name, (keys, _, parent) in GRAINS.items():
+            frame = sums[name]
+            derived = {}
+            for crop in crops_of(frame.columns):
+                area, production = f'{crop}_area_1000_ha', f'{crop}_production_1000_tons'
+                if area in frame and production in frame:
+                    derived[f'{crop}_yield_kg_per_ha'] = (
+                        frame[production] / frame[area].where(frame[area] > 0) * 1000)
+                if parent and production in frame:
+                    parent_keys = list(sums[parent].index.names)
+                    parent_total = sums[parent][production].reindex(
+                        frame.index.droplevel([k for k in keys if k not in parent_keys])).to_numpy()
+                    with np.errstate(invalid='ignore', divide='ignore'):
+                        share = frame[production].to_numpy() / parent_total * 100
+                    derived[f'{crop}_production_share_pct'] = np.where(parent_total > 0, share, np.nan)
+            frame = pd.concat([frame, pd.DataFrame(derived, index=frame.index)], axis=1)
+            cube[name] = frame.reset_index()
+        return cube
+
+
+def build_cube(df):
+    """Cube from an in-memory cleaned frame"""
+    return CubeBuilder().update(df).build()
+
+
+def write_cube(cube, output_dir, source=None, source_rows=None, fmt='auto'):
+    """Write each grain as Parquet (or CSV if no Parquet engine) plus manifest.json"""
+    os.makedirs(output_dir, exist_ok=True)
+    if fmt == 'auto':
+        try:
+            import pyarrow  # noqa: F401
+            fmt = 'parquet'
+        except ImportError:
+            fmt = 'csv'
+            logging.warning("pyarrow not installed - writing the cube as CSV (pip install pyarrow)")
+
+    manifest = {
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'source': source,
+        'source_rows': source_rows,
+        'format': fmt,
+        'years': [int(cube['national_year']['year'].min()), int(cube['national_year']['year'].max())],
+        'measures': 'sums of *_area_1000_ha and *_production_1000_tons; '
+                    '*_yield_kg_per_ha = production / area * 1000; '
+                    '*_production_share_pct = % of the parent grain (national/state)',
+        'grains': {},
+    }
+    for name, frame in cube.items():
+        filename = f'{name}.{fmt}'
+        path = os.path.join(output_dir, filename)
+        if fmt == 'parquet':
+            frame.to_parquet(path, index=False, compression='zstd')
+        else:
+            frame.to_csv(path, index=False, float_format='%.10g')
+        keys = GRAINS[name][0]
+        manifest['grains'][name] = {
+            'file': filename,
+            'keys': keys,
+            'rows': len(frame),
+            'columns': len(frame.columns),
+            'bytes': os.path.getsize(path),
+        }
+        logging.info(f"Cube grain {name}: {len(frame):,} rows -> {path}")
+
+    with open(os.path.join(output_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def write_rollups(cube, engine):
+    """Replace the warehouse rollup tables from the cube's state-level grains
+
+    Columns follow fact_production naming so WarehouseSource can answer
+    state x year and state x decade SUM queries from them.
+    """
+    from load_to_sql import FACT_COLUMNS
+
+    fact_names = {cleaned: fact for cleaned, fact in FACT_COLUMNS.items()
+                  if CROP_MEASURE.match(cleaned)}
+    for table, keys in ROLLUP_GRAINS.items():
+        frame = cube[table.replace('agg_', '')]
+        columns = keys + [c for c in fact_names if c in frame.columns]
+        rollup = frame[columns].rename(columns=fact_names)
+        rollup.to_sql(table, engine, if_exists='replace', index=False)
+        logging.info(f"Rollup table {table}: {len(rollup):,} rows")
+
+
+def print_summary(manifest, source_bytes=None):
+    total = sum(g['bytes'] for g in manifest['grains'].values())
+    print("\n" + "="*60)
+    print("CUBE EXPORT SUMMARY")
+    print("="*60)
+    for name, grain in manifest['grains'].items():
+        print(f"{name:16s} {grain['rows']:>8,} rows  {grain['bytes'] / 1024:>10,.1f} KB")
+    print(f"{'total':16s} {'':>13s} {total / 1024:>10,.1f} KB ({manifest['format']})")
+    if source_bytes:
+        print(f"Source CSV: {source_bytes / 1024:,.1f} KB ({source_bytes / max(total, 1):,.0f}x larger)")
+
+
+# Main execution
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+
+    parser = argparse.ArgumentParser(description='Export the pre-aggregated cube for Power BI')
+    parser.add_argument('--input', default=os.path.join(project_root, 'data', 'processed',
+                                                        'agri_data_cleaned.csv'))
+    parser.add_argument('--output-dir', default=os.path.join(project_root, 'data', 'cube'))
+    parser.add_argument('--format', choices=['auto', 'parquet', 'csv'], default='auto')
+    parser.add_argument('--chunk-size', type=int, default=100000)
+    args = parser.parse_args()
+
+    builder = CubeBuilder()
+    for chunk in pd.read_csv(args.input, chunksize=args.chunk_size):
+        builder.update(chunk)
+    manifest = write_cube(builder.build(), args.output_dir, os.path.basename(args.input),
+                          builder.source_rows, args.format)
+    print_summary(manifest, os.path.getsize(args.input))
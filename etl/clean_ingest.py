@@ -9,26 +9,47 @@ import numpy as np
 import os
 from datetime import datetime
 import logging
+from validation import RecordValidator, write_quarantine
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('etl_process.log'),
-        logging.StreamHandler()
-    ]
-)
+# State -> region for dim_state.region and regional rollups (ICRISAT spellings
+# plus current names); states not listed are assigned UNASSIGNED_REGION
+STATE_REGIONS = {
+    'Haryana': 'North', 'Himachal Pradesh': 'North', 'Jammu and Kashmir': 'North',
+    'Punjab': 'North', 'Uttar Pradesh': 'North', 'Uttarakhand': 'North', 'Delhi': 'North',
+    'Andhra Pradesh': 'South', 'Karnataka': 'South', 'Kerala': 'South',
+    'Tamil Nadu': 'South', 'Telangana': 'South', 'Puducherry': 'South',
+    'Assam': 'East', 'Bihar': 'East', 'Jharkhand': 'East', 'Orissa': 'East',
+    'Odisha': 'East', 'West Bengal': 'East', 'Tripura': 'East', 'Manipur': 'East',
+    'Meghalaya': 'East', 'Nagaland': 'East', 'Mizoram': 'East', 'Arunachal Pradesh': 'East',
+    'Gujarat': 'West', 'Maharashtra': 'West', 'Rajasthan': 'West', 'Goa': 'West',
+    'Madhya Pradesh': 'Central', 'Chhattisgarh': 'Central',
+}
+UNASSIGNED_REGION = 'Unassigned'
+
+
+def setup_logging():
+    """Log to the console and etl_process.log (called by the ETL entry points)"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('etl_process.log'),
+            logging.StreamHandler()
+        ]
+    )
 
 class AgriDataCleaner:
     """Clean and standardize agricultural data"""
     
-    def __init__(self, input_path, output_dir='data/processed'):
+    def __init__(self, input_path, output_dir='data/processed', validate=True):
         self.input_path = input_path
         self.output_dir = output_dir
         self.df_raw = None
         self.df_clean = None
         self.cleaning_report = {}
+        self.validator = RecordValidator() if validate else None
+        self.quarantine_path = os.path.join(output_dir, 'quarantined_records.csv')
+        self._quarantine_written = False
         
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
@@ -40,6 +61,7 @@ class AgriDataCleaner:
         logging.info(f"Loaded {len(self.df_raw)} rows and {len(self.df_raw.columns)} columns")
         self.cleaning_report['original_rows'] = len(self.df_raw)
         self.cleaning_report['original_columns'] = len(self.df_raw.columns)
+        self._start_validation()
         return self
     
     def standardize_columns(self):
@@ -124,6 +146,28 @@ class AgriDataCleaner:
         logging.info("Data type validation complete")
         return self
     
+    def _start_validation(self):
+        """Reset rule counts and drop the quarantine file of a previous run"""
+        if self.validator is not None:
+            self.validator.reset()
+        if os.path.exists(self.quarantine_path):
+            os.remove(self.quarantine_path)
+        self._quarantine_written = False
+    
+    def validate_records(self):
+        """Apply the data-quality rules and quarantine failing rows"""
+        if self.validator is None:
+            return self
+        logging.info("Validating records...")
+        
+        self.df_raw, quarantined = self.validator.apply(self.df_raw)
+        if len(quarantined):
+            write_quarantine(quarantined, self.quarantine_path, append=self._quarantine_written)
+            self._quarantine_written = True
+        
+        logging.info(f"Quarantined {len(quarantined)} records")
+        return self
+    
     def add_derived_columns(self):
         """Add useful derived columns"""
         logging.info("Adding derived columns...")
@@ -131,6 +175,9 @@ class AgriDataCleaner:
         # Add decade column
         self.df_raw['decade'] = (self.df_raw['year'] // 10) * 10
         
+        # Add region (North/South/East/West/Central) for the geographic hierarchy
+        self.df_raw['region'] = self.df_raw['state_name'].map(STATE_REGIONS).fillna(UNASSIGNED_REGION)
+        
         # Add season classification (if year data allows)
         self.df_raw['is_recent'] = self.df_raw['year'] >= 2015
         
@@ -163,6 +210,8 @@ class AgriDataCleaner:
         self.df_clean = self.df_raw.copy()
         self.cleaning_report['final_rows'] = len(self.df_clean)
         self.cleaning_report['final_columns'] = len(self.df_clean.columns)
+        if self.validator is not None:
+            self.cleaning_report.update(self.validator.report())
         self.cleaning_report['cleaning_timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         logging.info("Data cleaning complete!")
@@ -175,12 +224,61 @@ class AgriDataCleaner:
         logging.info(f"Cleaned data saved to {output_path}")
         
         # Save cleaning report
+        return self.save_cleaning_report()
+    
+    def iter_clean_chunks(self, chunk_size=50000):
+        """Yield cleaned chunks without materializing the full dataset
+        
+        Each raw chunk goes through the same stages as run_pipeline. Rows
+        already seen in an earlier chunk are dropped by hashing, so the
+        concatenated output matches the in-memory pipeline. Report counts
+        are accumulated across chunks.
+        """
+        logging.info(f"Streaming data from {self.input_path} in chunks of {chunk_size:,}")
+        totals = dict.fromkeys(['original_rows', 'missing_values_handled',
+                                'duplicates_removed', 'invalid_records_removed', 'final_rows'], 0)
+        seen = set()
+        self._start_validation()
+        
+        for chunk in pd.read_csv(self.input_path, encoding='utf-8', chunksize=chunk_size):
+            totals['original_rows'] += len(chunk)
+            self.cleaning_report['original_columns'] = len(chunk.columns)
+            self.df_raw = chunk
+            self.standardize_columns().handle_missing_values().remove_duplicates()
+            
+            # Cross-chunk duplicates: hash rows with numerics widened so int/float chunks agree
+            keys = self.df_raw.copy()
+            numeric_cols = keys.select_dtypes(include=[np.number]).columns
+            keys[numeric_cols] = keys[numeric_cols].astype('float64')
+            hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+            repeated = np.fromiter((h in seen for h in hashes.tolist()), dtype=bool, count=len(hashes))
+            seen.update(hashes.tolist())
+            self.df_raw = self.df_raw[~repeated]
+            self.cleaning_report['duplicates_removed'] += int(repeated.sum())
+            
+            self.validate_data_types().validate_records().add_derived_columns().filter_invalid_records()
+            for key in ('missing_values_handled', 'duplicates_removed', 'invalid_records_removed'):
+                totals[key] += int(self.cleaning_report[key])
+            totals['final_rows'] += len(self.df_raw)
+            self.cleaning_report['final_columns'] = len(self.df_raw.columns)
+            yield self.df_raw
+        
+        self.df_raw = None
+        self.cleaning_report.update(totals)
+        if self.validator is not None:
+            self.cleaning_report.update(self.validator.report())
+        self.cleaning_report['cleaning_timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    def save_cleaning_report(self):
+        """Save the cleaning report"""
         report_path = os.path.join(self.output_dir, 'cleaning_report.txt')
         with open(report_path, 'w') as f:
             f.write("AgriData Cleaning Report\n")
             f.write("="*50 + "\n\n")
             for key, value in self.cleaning_report.items():
                 f.write(f"{key}: {value}\n")
+            if self.validator is not None:
+                self.validator.write_report(f)
         
         logging.info(f"Cleaning report saved to {report_path}")
         return self
@@ -194,6 +292,7 @@ class AgriDataCleaner:
             .handle_missing_values()
             .remove_duplicates()
             .validate_data_types()
+            .validate_records()
             .add_derived_columns()
             .filter_invalid_records()
             .finalize_cleaning()
@@ -204,6 +303,8 @@ class AgriDataCleaner:
 
 # Main execution
 if __name__ == "__main__":
+    setup_logging()
+    
     # Configure paths (relative to project root)
     import os
     
@@ -233,6 +334,11 @@ if __name__ == "__main__":
     cleaner = AgriDataCleaner(INPUT_FILE, OUTPUT_DIR)
     cleaned_data = cleaner.run_pipeline()
     
+    # Pre-aggregated cube for Power BI / dashboards
+    from build_cube import build_cube, write_cube
+    write_cube(build_cube(cleaned_data), os.path.join(project_root, 'data', 'cube'),
+               'agri_data_cleaned.csv', len(cleaned_data))
+    
     # Display summary
     print("\n" + "="*60)
     print("DATA CLEANING SUMMARY")
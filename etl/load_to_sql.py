@@ -5,14 +5,272 @@ Purpose: Load cleaned data into MySQL database
 """
 
 import pandas as pd
-import mysql.connector
-from mysql.connector import Error
+import hashlib
 import logging
-from sqlalchemy import create_engine
 import os
+import sys
+import time
+import asyncio
+
+# cleaned-CSV column -> fact_production column
+FACT_COLUMNS = {
+    'district_id': 'district_id',
+    'year': 'year_id',
+    'rice_area_1000_ha': 'rice_area',
+    'rice_production_1000_tons': 'rice_production',
+    'rice_yield_kg_per_ha': 'rice_yield',
+    'wheat_area_1000_ha': 'wheat_area',
+    'wheat_production_1000_tons': 'wheat_production',
+    'wheat_yield_kg_per_ha': 'wheat_yield',
+    'maize_area_1000_ha': 'maize_area',
+    'maize_production_1000_tons': 'maize_production',
+    'maize_yield_kg_per_ha': 'maize_yield',
+    'sorghum_area_1000_ha': 'sorghum_area',
+    'sorghum_production_1000_tons': 'sorghum_production',
+    'sorghum_yield_kg_per_ha': 'sorghum_yield',
+    'groundnut_area_1000_ha': 'groundnut_area',
+    'groundnut_production_1000_tons': 'groundnut_production',
+    'groundnut_yield_kg_per_ha': 'groundnut_yield',
+    'soybean_area_1000_ha': 'soybean_area',
+    'soybean_production_1000_tons': 'soybean_production',
+    'soybean_yield_kg_per_ha': 'soybean_yield',
+    'sunflower_area_1000_ha': 'sunflower_area',
+    'sunflower_production_1000_tons': 'sunflower_production',
+    'sunflower_yield_kg_per_ha': 'sunflower_yield',
+    'sugarcane_area_1000_ha': 'sugarcane_area',
+    'sugarcane_production_1000_tons': 'sugarcane_production',
+    'sugarcane_yield_kg_per_ha': 'sugarcane_yield',
+    'cotton_area_1000_ha': 'cotton_area',
+    'cotton_production_1000_tons': 'cotton_production',
+    'cotton_yield_kg_per_ha': 'cotton_yield',
+    'oilseeds_area_1000_ha': 'oilseeds_area',
+    'oilseeds_production_1000_tons': 'oilseeds_production',
+    'oilseeds_yield_kg_per_ha': 'oilseeds_yield'
+}
+
+TABLES = ['dim_state', 'dim_district', 'dim_year', 'fact_production']
+
+TABLE_TEMPLATES = [
+    """
+    CREATE TABLE dim_state{suffix} (
+        state_id INT PRIMARY KEY AUTO_INCREMENT,
+        state_code VARCHAR(10) UNIQUE,
+        state_name VARCHAR(100) NOT NULL,
+        region VARCHAR(50),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE dim_district{suffix} (
+        district_id INT PRIMARY KEY AUTO_INCREMENT,
+        district_code VARCHAR(20),
+        district_name VARCHAR(100) NOT NULL,
+        state_id INT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE dim_year{suffix} (
+        year_id INT PRIMARY KEY,
+        decade INT,
+        is_recent BOOLEAN,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE fact_production{suffix} (
+        production_id INT PRIMARY KEY AUTO_INCREMENT,
+        district_id INT,
+        year_id INT,
+        rice_area DECIMAL(12,2),
+        rice_production DECIMAL(12,2),
+        rice_yield DECIMAL(12,2),
+        wheat_area DECIMAL(12,2),
+        wheat_production DECIMAL(12,2),
+        wheat_yield DECIMAL(12,2),
+        maize_area DECIMAL(12,2),
+        maize_production DECIMAL(12,2),
+        maize_yield DECIMAL(12,2),
+        sorghum_area DECIMAL(12,2),
+        sorghum_production DECIMAL(12,2),
+        sorghum_yield DECIMAL(12,2),
+        pearl_millet_area DECIMAL(12,2),
+        pearl_millet_production DECIMAL(12,2),
+        pearl_millet_yield DECIMAL(12,2),
+        groundnut_area DECIMAL(12,2),
+        groundnut_production DECIMAL(12,2),
+        groundnut_yield DECIMAL(12,2),
+        soybean_area DECIMAL(12,2),
+        soybean_production DECIMAL(12,2),
+        soybean_yield DECIMAL(12,2),
+        sunflower_area DECIMAL(12,2),
+        sunflower_production DECIMAL(12,2),
+        sunflower_yield DECIMAL(12,2),
+        sugarcane_area DECIMAL(12,2),
+        sugarcane_production DECIMAL(12,2),
+        sugarcane_yield DECIMAL(12,2),
+        cotton_area DECIMAL(12,2),
+        cotton_production DECIMAL(12,2),
+        cotton_yield DECIMAL(12,2),
+        oilseeds_area DECIMAL(12,2),
+        oilseeds_production DECIMAL(12,2),
+        oilseeds_yield DECIMAL(12,2),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """
+]
+
+# One fact row per district-year; the key resumable loads upsert on
+UPSERT_KEY = 'uq_district_year'
+
+# Secondary indexes, the upsert key and foreign keys, applied after the
+# bulk insert in swap mode
+INDEX_TEMPLATES = [
+    """
+    ALTER TABLE dim_district{suffix}
+        ADD INDEX idx_state_id (state_id),
+        ADD FOREIGN KEY (state_id) REFERENCES dim_state{suffix}(state_id)
+    """,
+    """
+    ALTER TABLE fact_production{suffix}
+        ADD UNIQUE KEY {upsert_key} (district_id, year_id),
+        ADD INDEX idx_year (year_id),
+        ADD FOREIGN KEY (district_id) REFERENCES dim_district{suffix}(district_id),
+        ADD FOREIGN KEY (year_id) REFERENCES dim_year{suffix}(year_id)
+    """
+]
+
+# Warehouse rollups written by build_cube.write_rollups; dropped with the
+# fact table so they can never serve stale sums
+ROLLUP_TABLES = ['agg_state_year', 'agg_state_decade']
+
+# Yield forecasts from analysis/forecast.py, loaded by load_forecasts. They
+# survive reloads: rows are keyed on state and district names, and
+# remap_forecasts re-points district_id once dim_district is rebuilt
+FORECAST_TABLE = 'fact_yield_forecast'
+
+FORECAST_DDL = f"""
+    CREATE TABLE {FORECAST_TABLE} (
+        forecast_id INT PRIMARY KEY AUTO_INCREMENT,
+        district_id INT NOT NULL,
+        state_name VARCHAR(100) NOT NULL,
+        district_name VARCHAR(100) NOT NULL,
+        crop VARCHAR(50) NOT NULL,
+        forecast_year INT NOT NULL,
+        yield_forecast DECIMAL(12,2),
+        yield_lower DECIMAL(12,2),
+        yield_upper DECIMAL(12,2),
+        trend_per_year DECIMAL(12,4),
+        n_years INT,
+        last_year INT,
+        method VARCHAR(10),
+        interval_level DECIMAL(4,3),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE KEY uq_district_crop_year (state_name, district_name, crop, forecast_year),
+        INDEX idx_district_id (district_id),
+        INDEX idx_crop_year (crop, forecast_year)
+    )
+"""
+
+# Run after every full reload: forget forecasts of districts that are gone,
+# then pick up the new district ids by name
+FORECAST_REMAP_QUERIES = [
+    f"""
+    DELETE f FROM {FORECAST_TABLE} f
+    LEFT JOIN dim_state s ON s.state_name = f.state_name
+    LEFT JOIN dim_district d ON d.state_id = s.state_id AND d.district_name = f.district_name
+    WHERE d.district_id IS NULL
+    """,
+    f"""
+    UPDATE {FORECAST_TABLE} f
+    JOIN dim_state s ON s.state_name = f.state_name
+    JOIN dim_district d ON d.state_id = s.state_id AND d.district_name = f.district_name
+    SET f.district_id = d.district_id
+    """
+]
+
+# Columns of one table, for upgrading tables created by older versions in place
+COLUMNS_QUERY = ("SELECT column_name FROM information_schema.columns "
+                 "WHERE table_schema = %s AND table_name = %s")
+
+# yield_forecasts.csv column -> fact_yield_forecast column
+FORECAST_COLUMNS = {
+    'district_id': 'district_id',
+    'state_name': 'state_name',
+    'district_name': 'district_name',
+    'crop': 'crop',
+    'forecast_year': 'forecast_year',
+    'yield_forecast_kg_per_ha': 'yield_forecast',
+    'yield_lower_kg_per_ha': 'yield_lower',
+    'yield_upper_kg_per_ha': 'yield_upper',
+    'trend_kg_per_ha_per_year': 'trend_per_year',
+    'n_years': 'n_years',
+    'last_year': 'last_year',
+    'method': 'method',
+    'interval_level': 'interval_level',
+}
+
+# Committed fact chunks of resumable loads; cleared whenever the fact table is rebuilt
+CHECKPOINT_TABLE = 'etl_load_checkpoint'
+
+CHECKPOINT_QUERIES = [
+    f"""
+    CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+        load_id VARCHAR(64) NOT NULL,
+        chunk_id INT NOT NULL,
+        row_start INT NOT NULL,
+        row_end INT NOT NULL,
+        content_hash CHAR(40) NOT NULL,
+        committed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (load_id, chunk_id)
+    )
+    """,
+    f"DELETE FROM {CHECKPOINT_TABLE}"
+]
+
+# Single-row counter bumped after every successful load; never dropped, so
+# query result caches keyed on it stay valid exactly until the data changes
+DATA_VERSION_TABLE = 'etl_data_version'
+
+DATA_VERSION_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {DATA_VERSION_TABLE} (
+        id TINYINT PRIMARY KEY,
+        version BIGINT NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+"""
+
+DATA_VERSION_BUMP = (f"INSERT INTO {DATA_VERSION_TABLE} (id, version) VALUES (1, 1) "
+                     "ON DUPLICATE KEY UPDATE version = version + 1")
+
+SHADOW_SUFFIX = '__new'
+RETIRED_SUFFIX = '__old'
+
+# Largest relative row-count change per table a swap accepts without --force
+SWAP_MAX_CHANGE = 0.25
+
+
+def drop_queries(suffix=''):
+    """DROP statements for one set of tables, children first"""
+    return [f"DROP TABLE IF EXISTS {table}{suffix}" for table in reversed(TABLES)]
+
+
+def table_ddl(suffix=''):
+    """CREATE TABLE statements for one set of tables"""
+    return [query.format(suffix=suffix) for query in TABLE_TEMPLATES]
+
+
+def index_ddl(suffix=''):
+    """Index and foreign-key statements for one set of tables"""
+    return [query.format(suffix=suffix, upsert_key=UPSERT_KEY) for query in INDEX_TEMPLATES]
+
+
+ROLLUP_DROP_QUERIES = [f"DROP TABLE IF EXISTS {table}" for table in ROLLUP_TABLES]
+
+DROP_QUERIES = drop_queries() + ROLLUP_DROP_QUERIES
+
+CREATE_QUERIES = table_ddl() + index_ddl()
 
-# Setup logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class AgriDataLoader:
     """Load agricultural data into MySQL database"""
@@ -25,9 +283,17 @@ class AgriDataLoader:
         self.password = password
         self.connection = None
         self.engine = None
+        self.pool = None
+        self.table_suffix = ''
+    
+    def _table(self, name):
+        """Physical name of a table in the set currently being loaded"""
+        return name + self.table_suffix
     
     def create_database(self):
         """Create database if not exists"""
+        import mysql.connector
+        from mysql.connector import Error
         try:
             # Connect without database selection
             connection = mysql.connector.connect(
@@ -46,6 +312,9 @@ class AgriDataLoader:
     
     def connect(self):
         """Establish database connection"""
+        import mysql.connector
+        from mysql.connector import Error
+        from sqlalchemy import create_engine
         try:
             self.connection = mysql.connector.connect(
                 host=self.host,
@@ -70,172 +339,175 @@ class AgriDataLoader:
         cursor = self.connection.cursor()
         
         # Drop existing tables
-        drop_tables = [
-            "DROP TABLE IF EXISTS fact_production",
-            "DROP TABLE IF EXISTS dim_district",
-            "DROP TABLE IF EXISTS dim_state",
-            "DROP TABLE IF EXISTS dim_year"
-        ]
-        
-        for query in drop_tables:
+        for query in DROP_QUERIES:
             cursor.execute(query)
             logging.info(f"Executed: {query}")
         
         # Create dimension tables
-        create_queries = [
-            """
-            CREATE TABLE dim_state (
-                state_id INT PRIMARY KEY AUTO_INCREMENT,
-                state_code VARCHAR(10) UNIQUE,
-                state_name VARCHAR(100) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """,
-            """
-            CREATE TABLE dim_district (
-                district_id INT PRIMARY KEY AUTO_INCREMENT,
-                district_code VARCHAR(20),
-                district_name VARCHAR(100) NOT NULL,
-                state_id INT,
-                FOREIGN KEY (state_id) REFERENCES dim_state(state_id),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """,
-            """
-            CREATE TABLE dim_year (
-                year_id INT PRIMARY KEY,
-                decade INT,
-                is_recent BOOLEAN,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """,
-            """
-            CREATE TABLE fact_production (
-                production_id INT PRIMARY KEY AUTO_INCREMENT,
-                district_id INT,
-                year_id INT,
-                rice_area DECIMAL(12,2),
-                rice_production DECIMAL(12,2),
-                rice_yield DECIMAL(12,2),
-                wheat_area DECIMAL(12,2),
-                wheat_production DECIMAL(12,2),
-                wheat_yield DECIMAL(12,2),
-                maize_area DECIMAL(12,2),
-                maize_production DECIMAL(12,2),
-                maize_yield DECIMAL(12,2),
-                sorghum_area DECIMAL(12,2),
-                sorghum_production DECIMAL(12,2),
-                sorghum_yield DECIMAL(12,2),
-                pearl_millet_area DECIMAL(12,2),
-                pearl_millet_production DECIMAL(12,2),
-                pearl_millet_yield DECIMAL(12,2),
-                groundnut_area DECIMAL(12,2),
-                groundnut_production DECIMAL(12,2),
-                groundnut_yield DECIMAL(12,2),
-                soybean_area DECIMAL(12,2),
-                soybean_production DECIMAL(12,2),
-                soybean_yield DECIMAL(12,2),
-                sunflower_area DECIMAL(12,2),
-                sunflower_production DECIMAL(12,2),
-                sunflower_yield DECIMAL(12,2),
-                sugarcane_area DECIMAL(12,2),
-                sugarcane_production DECIMAL(12,2),
-                sugarcane_yield DECIMAL(12,2),
-                cotton_area DECIMAL(12,2),
-                cotton_production DECIMAL(12,2),
-                cotton_yield DECIMAL(12,2),
-                oilseeds_area DECIMAL(12,2),
-                oilseeds_production DECIMAL(12,2),
-                oilseeds_yield DECIMAL(12,2),
-                FOREIGN KEY (district_id) REFERENCES dim_district(district_id),
-                FOREIGN KEY (year_id) REFERENCES dim_year(year_id),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-        ]
-        
-        for query in create_queries:
+        for query in CREATE_QUERIES:
             cursor.execute(query)
             logging.info("Table created successfully")
         
+        # Old checkpoints refer to the dropped fact rows
+        for query in CHECKPOINT_QUERIES:
+            cursor.execute(query)
+        
         self.connection.commit()
         cursor.close()
         logging.info("All tables created successfully")
     
+    def create_shadow_tables(self):
+        """Create empty `__new` tables without secondary indexes, clearing leftovers of a failed run"""
+        cursor = self.connection.cursor()
+        for query in drop_queries(SHADOW_SUFFIX) + drop_queries(RETIRED_SUFFIX):
+            cursor.execute(query)
+        for query in table_ddl(SHADOW_SUFFIX):
+            cursor.execute(query)
+        self.connection.commit()
+        cursor.close()
+        logging.info(f"Shadow tables created with suffix '{SHADOW_SUFFIX}'")
+    
+    def build_indexes(self, suffix=''):
+        """Build secondary indexes and foreign keys once the bulk insert is done"""
+        cursor = self.connection.cursor()
+        for query in index_ddl(suffix):
+            cursor.execute(query)
+        self.connection.commit()
+        cursor.close()
+        logging.info("Indexes and foreign keys built")
+    
+    @staticmethod
+    def source_invariants(csv_file):
+        """Row and distinct district-year counts read straight from the source CSV"""
+        keys = pd.read_csv(csv_file, usecols=['district_code', 'year'], dtype={'district_code': str})
+        return {'rows': len(keys), 'district_years': len(keys.drop_duplicates())}
+    
+    def _existing_tables(self, cursor):
+        """Names of the tables in the warehouse database"""
+        cursor.execute(
+            "SELECT table_name FROM information_schema.tables WHERE table_schema = %s",
+            (self.database,))
+        return {row[0] for row in cursor.fetchall()}
+    
+    def validate_shadow_tables(self, source, max_change=SWAP_MAX_CHANGE):
+        """Check the shadow tables against invariants that do not come from the loaded frame
+        
+        `source` is source_invariants() of the CSV: the fact table must hold
+        one row per source row and per distinct district-year. Every foreign
+        key must resolve, and no table may differ from its live counterpart
+        by more than `max_change` (a fraction; None skips that check).
+        """
+        cursor = self.connection.cursor()
+        problems = []
+        
+        def count(sql):
+            cursor.execute(sql)
+            return cursor.fetchone()[0]
+        
+        shadow = {table: f"{table}{SHADOW_SUFFIX}" for table in TABLES}
+        counts = {table: count(f"SELECT COUNT(*) FROM {name}") for table, name in shadow.items()}
+        if counts['fact_production'] != source['rows']:
+            problems.append(f"fact_production: {counts['fact_production']:,} rows, "
+                            f"source has {source['rows']:,}")
+        district_years = count(f"SELECT COUNT(*) FROM (SELECT DISTINCT district_id, year_id "
+                               f"FROM {shadow['fact_production']}) district_years")
+        if district_years != source['district_years']:
+            problems.append(f"fact_production: {district_years:,} district-years, "
+                            f"source has {source['district_years']:,}")
+        
+        orphans = {
+            'fact_production.district_id': ('fact_production', 'district_id', 'dim_district'),
+            'fact_production.year_id': ('fact_production', 'year_id', 'dim_year'),
+            'dim_district.state_id': ('dim_district', 'state_id', 'dim_state'),
+        }
+        for label, (child, key, parent) in orphans.items():
+            missing = count(f"SELECT COUNT(*) FROM {shadow[child]} c LEFT JOIN {shadow[parent]} p "
+                            f"ON c.{key} = p.{key} WHERE p.{key} IS NULL")
+            if missing:
+                problems.append(f"{label}: {missing:,} rows without a {parent} row")
+        
+        if max_change is not None:
+            existing = self._existing_tables(cursor)
+            for table in TABLES:
+                if table not in existing:
+                    continue
+                live = count(f"SELECT COUNT(*) FROM {table}")
+                if live and abs(counts[table] - live) / live > max_change:
+                    problems.append(f"{table}: {counts[table]:,} rows versus {live:,} live "
+                                    f"(more than {max_change:.0%} change; --force to accept)")
+        cursor.close()
+        
+        if problems:
+            raise ValueError("Shadow table validation failed: " + "; ".join(problems))
+        logging.info("Shadow tables validated against the source and the live tables")
+    
+    def swap_tables(self):
+        """Atomically swap the shadow tables in and drop the previous generation"""
+        cursor = self.connection.cursor()
+        existing = self._existing_tables(cursor)
+        
+        # One RENAME TABLE statement is atomic: readers see the old or the new set, never a mix
+        renames = []
+        for table in TABLES:
+            if table in existing:
+                renames.append(f"{table} TO {table}{RETIRED_SUFFIX}")
+            renames.append(f"{table}{SHADOW_SUFFIX} TO {table}")
+        cursor.execute("RENAME TABLE " + ", ".join(renames))
+        logging.info("Swapped shadow tables into place")
+        
+        for query in drop_queries(RETIRED_SUFFIX) + CHECKPOINT_QUERIES + ROLLUP_DROP_QUERIES:
+            cursor.execute(query)
+        self.connection.commit()
+        cursor.close()
+        logging.info("Previous tables dropped")
+    
     def load_dimension_tables(self, df):
         """Load dimension tables from cleaned data"""
         
         # Load dim_state
-        states_df = df[['state_code', 'state_name']].drop_duplicates()
-        states_df.to_sql('dim_state', self.engine, if_exists='append', index=False)
+        states_df = self.state_rows(df).drop_duplicates()
+        states_df.to_sql(self._table('dim_state'), self.engine, if_exists='append', index=False)
         logging.info(f"Loaded {len(states_df)} states into dim_state")
         
         # Get state_id mapping
-        state_mapping = pd.read_sql("SELECT state_id, state_code FROM dim_state", self.engine)
-        df = df.merge(state_mapping, on='state_code', how='left')
+        state_mapping = pd.read_sql(f"SELECT state_id, state_code FROM {self._table('dim_state')}", self.engine)
+        df = df.assign(state_code=df['state_code'].astype(str)).merge(
+            state_mapping.assign(state_code=state_mapping['state_code'].astype(str)),
+            on='state_code', how='left')
         
         # Load dim_district
         districts_df = df[['district_code', 'district_name', 'state_id']].drop_duplicates()
-        districts_df.to_sql('dim_district', self.engine, if_exists='append', index=False)
+        districts_df.to_sql(self._table('dim_district'), self.engine, if_exists='append', index=False)
         logging.info(f"Loaded {len(districts_df)} districts into dim_district")
         
         # Load dim_year
         years_df = df[['year', 'decade', 'is_recent']].drop_duplicates()
         years_df = years_df.rename(columns={'year': 'year_id'})
-        years_df.to_sql('dim_year', self.engine, if_exists='append', index=False)
+        years_df.to_sql(self._table('dim_year'), self.engine, if_exists='append', index=False)
         logging.info(f"Loaded {len(years_df)} years into dim_year")
         
         return df
     
+    def prepare_fact_frame(self, df, district_mapping):
+        """Attach district ids and rename cleaned columns to fact_production columns"""
+        df = df.drop(columns=['district_id'], errors='ignore')
+        df = df.assign(district_code=df['district_code'].astype(str)).merge(
+            district_mapping.assign(district_code=district_mapping['district_code'].astype(str)),
+            on='district_code', how='left')
+        
+        # Select and rename columns that exist
+        available_cols = {k: v for k, v in FACT_COLUMNS.items() if k in df.columns}
+        return df[list(available_cols.keys())].rename(columns=available_cols)
+    
     def load_fact_table(self, df):
         """Load fact table with production data"""
         
         # Get district_id mapping
         district_mapping = pd.read_sql(
-            "SELECT district_id, district_code FROM dim_district", 
+            f"SELECT district_id, district_code FROM {self._table('dim_district')}", 
             self.engine
         )
-        df = df.merge(district_mapping, on='district_code', how='left')
-        
-        # Prepare fact table data
-        fact_columns = {
-            'district_id': 'district_id',
-            'year': 'year_id',
-            'rice_area_1000_ha': 'rice_area',
-            'rice_production_1000_tons': 'rice_production',
-            'rice_yield_kg_per_ha': 'rice_yield',
-            'wheat_area_1000_ha': 'wheat_area',
-            'wheat_production_1000_tons': 'wheat_production',
-            'wheat_yield_kg_per_ha': 'wheat_yield',
-            'maize_area_1000_ha': 'maize_area',
-            'maize_production_1000_tons': 'maize_production',
-            'maize_yield_kg_per_ha': 'maize_yield',
-            'sorghum_area_1000_ha': 'sorghum_area',
-            'sorghum_production_1000_tons': 'sorghum_production',
-            'sorghum_yield_kg_per_ha': 'sorghum_yield',
-            'groundnut_area_1000_ha': 'groundnut_area',
-            'groundnut_production_1000_tons': 'groundnut_production',
-            'groundnut_yield_kg_per_ha': 'groundnut_yield',
-            'soybean_area_1000_ha': 'soybean_area',
-            'soybean_production_1000_tons': 'soybean_production',
-            'soybean_yield_kg_per_ha': 'soybean_yield',
-            'sunflower_area_1000_ha': 'sunflower_area',
-            'sunflower_production_1000_tons': 'sunflower_production',
-            'sunflower_yield_kg_per_ha': 'sunflower_yield',
-            'sugarcane_area_1000_ha': 'sugarcane_area',
-            'sugarcane_production_1000_tons': 'sugarcane_production',
-            'sugarcane_yield_kg_per_ha': 'sugarcane_yield',
-            'cotton_area_1000_ha': 'cotton_area',
-            'cotton_production_1000_tons': 'cotton_production',
-            'cotton_yield_kg_per_ha': 'cotton_yield',
-            'oilseeds_area_1000_ha': 'oilseeds_area',
-            'oilseeds_production_1000_tons': 'oilseeds_production',
-            'oilseeds_yield_kg_per_ha': 'oilseeds_yield'
-        }
-        
-        # Select and rename columns that exist
-        available_cols = {k: v for k, v in fact_columns.items() if k in df.columns}
-        fact_df = df[list(available_cols.keys())].rename(columns=available_cols)
+        fact_df = self.prepare_fact_frame(df, district_mapping)
         
         # Load to database in chunks
         chunk_size = 10000
@@ -243,28 +515,142 @@ class AgriDataLoader:
         
         for i in range(0, total_rows, chunk_size):
             chunk = fact_df.iloc[i:i+chunk_size]
-            chunk.to_sql('fact_production', self.engine, if_exists='append', index=False)
+            chunk.to_sql(self._table('fact_production'), self.engine, if_exists='append', index=False)
             logging.info(f"Loaded {min(i+chunk_size, total_rows)}/{total_rows} rows")
         
         logging.info(f"Loaded {total_rows} rows into fact_production")
     
+    @staticmethod
+    def state_rows(df):
+        """dim_state columns of a cleaned frame (region is NULL for frames cleaned before it existed)"""
+        if 'region' not in df.columns:
+            df = df.assign(region=None)
+        return df[['state_code', 'state_name', 'region']]
+    
+    @staticmethod
+    def new_dimension_rows(chunk, state_ids, district_ids, years):
+        """Return the states, districts and years in a chunk not yet in the id maps"""
+        chunk = chunk.assign(state_code=chunk['state_code'].astype(str),
+                             district_code=chunk['district_code'].astype(str))
+        states = AgriDataLoader.state_rows(chunk).drop_duplicates('state_code')
+        districts = chunk[['district_code', 'district_name', 'state_code']].drop_duplicates('district_code')
+        new_years = chunk[['year', 'decade', 'is_recent']].drop_duplicates('year')
+        return (states[~states['state_code'].isin(list(state_ids))],
+                districts[~districts['district_code'].isin(list(district_ids))],
+                new_years[~new_years['year'].isin(list(years))])
+    
+    def _id_map(self, table, code_column, id_column):
+        """Read a dimension's code -> surrogate id mapping"""
+        mapping = pd.read_sql(f"SELECT {code_column}, {id_column} FROM {table}", self.engine)
+        return dict(zip(mapping[code_column].astype(str), mapping[id_column]))
+    
+    def load_dimension_chunk(self, df, state_ids, district_ids, years):
+        """Append states, districts and years first seen in this chunk
+        
+        The id maps are updated in place so later chunks only insert
+        genuinely new members.
+        """
+        states, districts, new_years = self.new_dimension_rows(df, state_ids, district_ids, years)
+        if len(states):
+            states.to_sql(self._table('dim_state'), self.engine, if_exists='append', index=False)
+            state_ids.update(self._id_map(self._table('dim_state'), 'state_code', 'state_id'))
+        
+        if len(districts):
+            districts = districts.assign(state_id=districts['state_code'].map(state_ids))
+            districts.drop(columns='state_code').to_sql(self._table('dim_district'), self.engine,
+                                                        if_exists='append', index=False)
+            district_ids.update(self._id_map(self._table('dim_district'), 'district_code', 'district_id'))
+        
+        if len(new_years):
+            new_years.rename(columns={'year': 'year_id'}).to_sql(self._table('dim_year'), self.engine,
+                                                                if_exists='append', index=False)
+            years.update(int(y) for y in new_years['year'])
+    
+    def load_fact_chunk(self, df, district_ids):
+        """Append one cleaned chunk to fact_production"""
+        mapping = pd.DataFrame({'district_code': list(district_ids),
+                                'district_id': list(district_ids.values())})
+        fact_df = self.prepare_fact_frame(df, mapping)
+        fact_df.to_sql(self._table('fact_production'), self.engine, if_exists='append', index=False)
+        return len(fact_df)
+    
     def verify_data_load(self):
         """Verify data was loaded correctly"""
         cursor = self.connection.cursor()
         
-        tables = ['dim_state', 'dim_district', 'dim_year', 'fact_production']
+        tables = TABLES
         
         print("\n" + "="*60)
         print("DATA LOAD VERIFICATION")
         print("="*60)
         
         for table in tables:
-            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            cursor.execute(f"SELECT COUNT(*) FROM {self._table(table)}")
             count = cursor.fetchone()[0]
             print(f"{table}: {count:,} rows")
         
         cursor.close()
     
+    def load_forecasts(self, csv_file):
+        """Replace fact_yield_forecast with the rows of a yield_forecasts.csv"""
+        forecasts = pd.read_csv(csv_file)
+        districts = pd.read_sql(
+            "SELECT d.district_id, s.state_name, d.district_name FROM dim_district d "
+            "JOIN dim_state s ON d.state_id = s.state_id", self.engine
+        ).drop_duplicates(['state_name', 'district_name'])
+        df = forecasts.merge(districts, on=['state_name', 'district_name'], how='inner')
+        if len(df) < len(forecasts):
+            logging.warning(f"{len(forecasts) - len(df)} forecasts skipped: district not in dim_district")
+        
+        cursor = self.connection.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {FORECAST_TABLE}")
+        cursor.execute(FORECAST_DDL)
+        self.connection.commit()
+        cursor.close()
+        
+        df = df[list(FORECAST_COLUMNS)].rename(columns=FORECAST_COLUMNS)
+        df.to_sql(FORECAST_TABLE, self.engine, if_exists='append', index=False, chunksize=10000)
+        logging.info(f"Loaded {len(df)} rows into {FORECAST_TABLE}")
+        self.bump_data_version()
+        return len(df)
+    
+    @staticmethod
+    def forecast_remap_queries(columns):
+        """Statements that re-point stored forecasts at the current dim_district
+        
+        `columns` are the forecast table's columns (empty if it does not
+        exist). A table from before forecasts were keyed on names cannot be
+        remapped and is dropped.
+        """
+        if not columns:
+            return []
+        if 'district_name' not in columns:
+            logging.warning(f"{FORECAST_TABLE} predates name keys; dropped, reload with --forecasts")
+            return [f"DROP TABLE {FORECAST_TABLE}"]
+        return FORECAST_REMAP_QUERIES
+    
+    def remap_forecasts(self):
+        """Keep loaded forecasts valid after dim_district was rebuilt"""
+        cursor = self.connection.cursor()
+        cursor.execute(COLUMNS_QUERY, (self.database, FORECAST_TABLE))
+        columns = {row[0].lower() for row in cursor.fetchall()}
+        for query in self.forecast_remap_queries(columns):
+            cursor.execute(query)
+        self.connection.commit()
+        cursor.close()
+    
+    def bump_data_version(self):
+        """Mark the warehouse contents as changed; returns the new data version"""
+        cursor = self.connection.cursor()
+        cursor.execute(DATA_VERSION_DDL)
+        cursor.execute(DATA_VERSION_BUMP)
+        cursor.execute(f"SELECT version FROM {DATA_VERSION_TABLE} WHERE id = 1")
+        version = cursor.fetchone()[0]
+        self.connection.commit()
+        cursor.close()
+        logging.info(f"Data version bumped to {version}")
+        return version
+    
     def close(self):
         """Close database connection"""
         if self.connection and self.connection.is_connected():
@@ -296,6 +682,8 @@ class AgriDataLoader:
             
             # Verify
             self.verify_data_load()
+            self.remap_forecasts()
+            self.bump_data_version()
             
             logging.info("Data loading pipeline completed successfully!")
             
@@ -305,8 +693,411 @@ class AgriDataLoader:
         finally:
             self.close()
 
+    def run_pipeline_swap(self, csv_file, max_change=SWAP_MAX_CHANGE):
+        """Reload all tables without downtime
+        
+        Data is bulk-loaded into `__new` shadow tables while the live tables
+        keep serving queries; indexes are built once after the insert, the
+        shadow set is validated (see validate_shadow_tables, `max_change`)
+        and renamed into place.
+        """
+        try:
+            self.create_database()
+            
+            if not self.connect():
+                raise Exception("Failed to connect to database")
+            
+            self.create_shadow_tables()
+            self.table_suffix = SHADOW_SUFFIX
+            
+            logging.info(f"Loading data from {csv_file}")
+            df = pd.read_csv(csv_file)
+            
+            df = self.load_dimension_tables(df)
+            self.load_fact_table(df)
+            self.build_indexes(SHADOW_SUFFIX)
+            
+            self.validate_shadow_tables(self.source_invariants(csv_file), max_change)
+            self.table_suffix = ''
+            self.swap_tables()
+            
+            self.verify_data_load()
+            self.remap_forecasts()
+            self.bump_data_version()
+            
+            logging.info("Shadow-table reload completed successfully!")
+            
+        except Exception as e:
+            logging.error(f"Error in swap pipeline, live tables left untouched: {e}")
+            raise
+        finally:
+            self.table_suffix = ''
+            self.close()
+    
+    # ------------------------------------------------------------------
+    # Resumable load
+    # ------------------------------------------------------------------
+    def ensure_tables(self):
+        """Create the schema only if it is missing, keeping existing data and checkpoints"""
+        cursor = self.connection.cursor()
+        existing = self._existing_tables(cursor)
+        if not existing.issuperset(TABLES):
+            missing = [table for table in TABLES if table not in existing]
+            if len(missing) != len(TABLES):
+                raise RuntimeError(f"Partial schema found (missing {missing}); run a full load first")
+            for query in CREATE_QUERIES:
+                cursor.execute(query)
+            logging.info("All tables created successfully")
+        else:
+            self._ensure_region_column(cursor)
+            self._ensure_upsert_key(cursor)
+        cursor.execute(CHECKPOINT_QUERIES[0])
+        self.connection.commit()
+        cursor.close()
+    
+    def _ensure_region_column(self, cursor):
+        """Add dim_state.region to a table created before regions were loaded
+        
+        States already in the table keep a NULL region until the next full load.
+        """
+        cursor.execute(COLUMNS_QUERY, (self.database, 'dim_state'))
+        if 'region' in {row[0].lower() for row in cursor.fetchall()}:
+            return
+        cursor.execute("ALTER TABLE dim_state ADD COLUMN region VARCHAR(50) AFTER state_name")
+        logging.info("Added region column to dim_state")
+    
+    def _ensure_upsert_key(self, cursor):
+        """Add the district-year unique key to a fact_production created without it
+        
+        Without the key ON DUPLICATE KEY UPDATE silently inserts duplicates
+        on resume. Refuses to run if the table already holds duplicates.
+        """
+        cursor.execute(f"SHOW INDEX FROM fact_production WHERE Key_name = '{UPSERT_KEY}'")
+        if cursor.fetchall():
+            return
+        cursor.execute("SELECT COUNT(*) FROM (SELECT 1 FROM fact_production "
+                       "GROUP BY district_id, year_id HAVING COUNT(*) > 1) duplicates")
+        duplicates = cursor.fetchone()[0]
+        if duplicates:
+            raise RuntimeError(f"fact_production has no {UPSERT_KEY} key and {duplicates:,} duplicate "
+                               "district-years; run a full load (or --swap) first")
+        cursor.execute(f"ALTER TABLE fact_production ADD UNIQUE KEY {UPSERT_KEY} (district_id, year_id)")
+        logging.info(f"Added missing {UPSERT_KEY} key to fact_production")
+    
+    def committed_chunks(self, load_id):
+        """Return {chunk_id: content_hash} for chunks already committed under load_id"""
+        cursor = self.connection.cursor()
+        cursor.execute(f"SELECT chunk_id, content_hash FROM {CHECKPOINT_TABLE} WHERE load_id = %s",
+                       (load_id,))
+        committed = dict(cursor.fetchall())
+        cursor.close()
+        return committed
+    
+    @staticmethod
+    def chunk_hash(chunk):
+        """Content hash of a raw CSV chunk, independent of its position in the file"""
+        return hashlib.sha1(pd.util.hash_pandas_object(chunk, index=False).to_numpy().tobytes()).hexdigest()
+    
+    @staticmethod
+    def default_load_id(csv_file):
+        """Identify a load by the input file's name, size and modification time"""
+        stat = os.stat(csv_file)
+        key = f"{os.path.abspath(csv_file)}:{stat.st_size}:{int(stat.st_mtime)}"
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+    
+    def upsert_fact_chunk(self, fact_df, load_id, chunk_id, row_start, content_hash):
+        """Upsert one chunk and record its checkpoint in the same transaction"""
+        columns = list(fact_df.columns)
+        updates = ", ".join(f"{col} = VALUES({col})" for col in columns
+                            if col not in ('district_id', 'year_id'))
+        query = (f"INSERT INTO fact_production ({', '.join(columns)}) "
+                 f"VALUES ({', '.join(['%s'] * len(columns))}) "
+                 f"ON DUPLICATE KEY UPDATE {updates}")
+        
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany(query, self._fact_rows(fact_df))
+            cursor.execute(
+                f"REPLACE INTO {CHECKPOINT_TABLE} (load_id, chunk_id, row_start, row_end, content_hash) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                (load_id, chunk_id, row_start, row_start + len(fact_df), content_hash))
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    def run_pipeline_resumable(self, csv_file, load_id=None, chunk_size=10000):
+        """Load facts chunk by chunk with durable checkpoints
+        
+        Tables are created only if missing. Each chunk is upserted on
+        (district_id, year_id) and checkpointed in one transaction, so a
+        rerun with the same load_id skips chunks already committed with the
+        same content and safely redoes any others.
+        """
+        try:
+            self.create_database()
+            
+            if not self.connect():
+                raise Exception("Failed to connect to database")
+            
+            self.ensure_tables()
+            load_id = load_id or self.default_load_id(csv_file)
+            committed = self.committed_chunks(load_id)
+            logging.info(f"Load {load_id}: {len(committed)} chunks already committed")
+            
+            state_ids = self._id_map('dim_state', 'state_code', 'state_id')
+            district_ids = self._id_map('dim_district', 'district_code', 'district_id')
+            years = set(pd.read_sql("SELECT year_id FROM dim_year", self.engine)['year_id'])
+            
+            row_start = skipped = loaded = 0
+            reader = pd.read_csv(csv_file, chunksize=chunk_size,
+                                 dtype={'state_code': str, 'district_code': str})
+            for chunk_id, chunk in enumerate(reader):
+                content_hash = self.chunk_hash(chunk)
+                if committed.get(chunk_id) == content_hash:
+                    skipped += 1
+                else:
+                    self.load_dimension_chunk(chunk, state_ids, district_ids, years)
+                    mapping = pd.DataFrame({'district_code': list(district_ids),
+                                            'district_id': list(district_ids.values())})
+                    fact_df = self.prepare_fact_frame(chunk, mapping)
+                    self.upsert_fact_chunk(fact_df, load_id, chunk_id, row_start, content_hash)
+                    loaded += 1
+                    logging.info(f"Committed chunk {chunk_id} (rows {row_start:,}-{row_start + len(chunk):,})")
+                row_start += len(chunk)
+            
+            logging.info(f"Load {load_id}: {loaded} chunks loaded, {skipped} skipped as already committed")
+            if loaded:
+                cursor = self.connection.cursor()
+                for query in ROLLUP_DROP_QUERIES:
+                    cursor.execute(query)
+                self.connection.commit()
+                cursor.close()
+            self.verify_data_load()
+            if loaded:
+                self.bump_data_version()
+            
+        except Exception as e:
+            logging.error(f"Error in resumable pipeline (rerun to resume): {e}")
+            raise
+        finally:
+            self.close()
+    
+    # ------------------------------------------------------------------
+    # Asyncio pipeline (requires aiomysql)
+    # ------------------------------------------------------------------
+    async def create_pool(self, minsize=1, maxsize=8):
+        """Create the aiomysql connection pool used by the async pipeline"""
+        try:
+            import aiomysql
+        except ImportError:
+            raise ImportError("Async pipeline requires aiomysql: pip install aiomysql")
+        
+        # Database creation is a one-off statement outside the pool
+        connection = await aiomysql.connect(host=self.host, user=self.user,
+                                            password=self.password)
+        async with connection.cursor() as cursor:
+            await cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database}")
+        connection.close()
+        logging.info(f"Database '{self.database}' created/verified")
+        
+        self.pool = await aiomysql.create_pool(host=self.host, db=self.database, user=self.user,
+                                               password=self.password, minsize=minsize,
+                                               maxsize=maxsize, autocommit=False)
+        return self.pool
+    
+    async def _execute(self, query, params=None, many=False, fetch=False):
+        """Run one statement on a pooled connection and commit"""
+        async with self.pool.acquire() as connection:
+            async with connection.cursor() as cursor:
+                if many:
+                    await cursor.executemany(query, params)
+                else:
+                    await cursor.execute(query, params)
+                rows = await cursor.fetchall() if fetch else None
+            await connection.commit()
+        return rows
+    
+    async def create_tables_async(self):
+        """Create normalized database schema over the pool"""
+        for query in DROP_QUERIES + CREATE_QUERIES + CHECKPOINT_QUERIES:
+            await self._execute(query)
+        logging.info("All tables created successfully")
+    
+    async def _upsert_dimensions(self, chunk, state_ids, district_ids, years):
+        """Insert states, districts and years first seen in this chunk and extend the id maps"""
+        states, districts, new_years = self.new_dimension_rows(chunk, state_ids, district_ids, years)
+        if len(states):
+            await self._execute("INSERT IGNORE INTO dim_state (state_code, state_name, region) "
+                                "VALUES (%s, %s, %s)",
+                                list(states.itertuples(index=False, name=None)), many=True)
+            rows = await self._execute(
+                "SELECT state_code, state_id FROM dim_state WHERE state_code IN ("
+                + ", ".join(["%s"] * len(states)) + ")",
+                list(states['state_code']), fetch=True)
+            state_ids.update(rows)
+        
+        if len(districts):
+            values = [(code, name, state_ids[state]) for code, name, state
+                      in districts.itertuples(index=False, name=None)]
+            await self._execute("INSERT INTO dim_district (district_code, district_name, state_id) "
+                                "VALUES (%s, %s, %s)", values, many=True)
+            rows = await self._execute(
+                "SELECT district_code, district_id FROM dim_district WHERE district_code IN ("
+                + ", ".join(["%s"] * len(districts)) + ")",
+                list(districts['district_code']), fetch=True)
+            district_ids.update(rows)
+        
+        if len(new_years):
+            await self._execute("INSERT IGNORE INTO dim_year (year_id, decade, is_recent) VALUES (%s, %s, %s)",
+                                [(int(y), int(d), bool(r)) for y, d, r
+                                 in new_years.itertuples(index=False, name=None)], many=True)
+            years.update(int(y) for y in new_years['year'])
+    
+    @staticmethod
+    def _fact_rows(fact_df):
+        """Convert a prepared fact frame to DB-API parameter tuples (NaN -> NULL)"""
+        values = fact_df.astype(object).where(fact_df.notna(), None)
+        return list(values.itertuples(index=False, name=None))
+    
+    async def _produce_chunks(self, csv_file, chunk_size, queue, n_writers, timings):
+        """Parse CSV chunks off the event loop, map keys and enqueue fact rows"""
+        loop = asyncio.get_running_loop()
+        reader = pd.read_csv(csv_file, chunksize=chunk_size,
+                             dtype={'state_code': str, 'district_code': str})
+        state_ids, district_ids, years = {}, {}, set()
+        read = None
+        try:
+            while True:
+                started = time.perf_counter()
+                read = loop.run_in_executor(None, next, reader, None)
+                # Shielded so cancellation cannot abandon the worker thread mid-parse
+                chunk = await asyncio.shield(read)
+                if chunk is None:
+                    break
+                parsed = time.perf_counter()
+                await self._upsert_dimensions(chunk, state_ids, district_ids, years)
+                mapped = time.perf_counter()
+                mapping = pd.DataFrame({'district_code': list(district_ids),
+                                        'district_id': list(district_ids.values())})
+                fact_df = self.prepare_fact_frame(chunk, mapping)
+                rows = await loop.run_in_executor(None, self._fact_rows, fact_df)
+                timings['parse'] += (parsed - started) + (time.perf_counter() - mapped)
+                timings['dimensions'] += mapped - parsed
+                await queue.put((list(fact_df.columns), rows))
+        finally:
+            if read is not None and not read.done():
+                # Closing the reader under a running parse crashes the C parser
+                await asyncio.wait([read])
+            reader.close()
+        # Only after a clean finish: on failure the writers are cancelled instead
+        for _ in range(n_writers):
+            await queue.put(None)
+    
+    async def _write_chunks(self, queue, timings):
+        """Drain the queue, inserting each chunk with executemany"""
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            columns, rows = item
+            query = (f"INSERT INTO fact_production ({', '.join(columns)}) "
+                     f"VALUES ({', '.join(['%s'] * len(columns))})")
+            started = time.perf_counter()
+            await self._execute(query, rows, many=True)
+            timings['write'] += time.perf_counter() - started
+            timings['rows'] += len(rows)
+            logging.info(f"Loaded {timings['rows']:,} rows")
+    
+    async def verify_data_load_async(self):
+        """Verify data was loaded correctly, counting all tables concurrently"""
+        results = await asyncio.gather(*(self._execute(f"SELECT COUNT(*) FROM {table}", fetch=True)
+                                         for table in TABLES))
+        
+        print("\n" + "="*60)
+        print("DATA LOAD VERIFICATION")
+        print("="*60)
+        
+        for table, rows in zip(TABLES, results):
+            print(f"{table}: {rows[0][0]:,} rows")
+    
+    async def remap_forecasts_async(self):
+        """Keep loaded forecasts valid after dim_district was rebuilt, over the pool"""
+        rows = await self._execute(COLUMNS_QUERY, (self.database, FORECAST_TABLE), fetch=True)
+        for query in self.forecast_remap_queries({row[0].lower() for row in rows}):
+            await self._execute(query)
+    
+    async def bump_data_version_async(self):
+        """Mark the warehouse contents as changed over the pool"""
+        await self._execute(DATA_VERSION_DDL)
+        await self._execute(DATA_VERSION_BUMP)
+        rows = await self._execute(f"SELECT version FROM {DATA_VERSION_TABLE} WHERE id = 1", fetch=True)
+        logging.info(f"Data version bumped to {rows[0][0]}")
+        return rows[0][0]
+    
+    @staticmethod
+    async def _run_until_first_error(tasks):
+        """Await the producer and writers; on the first failure cancel the rest and re-raise
+        
+        With plain gather() a failed writer left the producer blocked on a
+        full queue forever.
+        """
+        done, pending = set(), set(tasks)
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            if task.exception() is not None:
+                raise task.exception()
+    
+    async def run_pipeline_async(self, csv_file, chunk_size=10000, queue_size=4, writers=4):
+        """Run the loading pipeline with parsing and inserts overlapped
+        
+        A producer parses CSV chunks in a worker thread and maps dimension
+        keys while `writers` tasks insert earlier chunks; the bounded queue
+        keeps at most `queue_size` chunks in memory.
+        """
+        wall_started = time.perf_counter()
+        await self.create_pool(maxsize=writers + 1)
+        try:
+            await self.create_tables_async()
+            
+            logging.info(f"Loading data from {csv_file}")
+            queue = asyncio.Queue(maxsize=queue_size)
+            timings = {'parse': 0.0, 'dimensions': 0.0, 'write': 0.0, 'rows': 0}
+            tasks = [asyncio.ensure_future(self._produce_chunks(csv_file, chunk_size, queue,
+                                                                writers, timings))]
+            tasks += [asyncio.ensure_future(self._write_chunks(queue, timings))
+                      for _ in range(writers)]
+            await self._run_until_first_error(tasks)
+            
+            await self.verify_data_load_async()
+            await self.remap_forecasts_async()
+            await self.bump_data_version_async()
+            
+            wall = time.perf_counter() - wall_started
+            logging.info(f"Parse/map time: {timings['parse']:.2f}s, "
+                         f"dimension upserts: {timings['dimensions']:.2f}s, "
+                         f"write time: {timings['write']:.2f}s across {writers} writers, "
+                         f"wall time: {wall:.2f}s")
+            logging.info("Async data loading pipeline completed successfully!")
+        except Exception as e:
+            logging.error(f"Error in async pipeline: {e}")
+            raise
+        finally:
+            self.pool.close()
+            await self.pool.wait_closed()
+
 # Main execution
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
     # Database configuration
     DB_CONFIG = {
         'host': 'localhost',
@@ -320,4 +1111,20 @@ if __name__ == "__main__":
     
     # Run loader
     loader = AgriDataLoader(**DB_CONFIG)
-    loader.run_pipeline(CLEANED_DATA_PATH)
\ No newline at end of file
+    if '--async' in sys.argv:
+        asyncio.run(loader.run_pipeline_async(CLEANED_DATA_PATH))
+    elif '--swap' in sys.argv:
+        loader.run_pipeline_swap(CLEANED_DATA_PATH,
+                                 max_change=None if '--force' in sys.argv else SWAP_MAX_CHANGE)
+    elif '--resume' in sys.argv:
+        loader.run_pipeline_resumable(CLEANED_DATA_PATH)
+    elif '--forecasts' in sys.argv:
+        # Output of analysis/forecast.py; the warehouse must already be loaded
+        if not loader.connect():
+            raise SystemExit("Failed to connect to database")
+        try:
+            loader.load_forecasts('data/processed/yield_forecasts.csv')
+        finally:
+            loader.close()
+    else:
+        loader.run_pipeline(CLEANED_DATA_PATH)
\ No newline at end of file
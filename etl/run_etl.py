@@ -0,0 +1,235 @@
+"""
+AgriData Explorer - Streaming ETL Entry Point
+File: etl/run_etl.py
+Purpose: Clean raw data and load it into MySQL in one pass, with cleaned
+         chunks handed from the cleaner to the loader through a bounded queue
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from build_cube import CubeBuilder, write_cube, write_rollups
+from clean_ingest import AgriDataCleaner, setup_logging
+from load_to_sql import AgriDataLoader
+
+_DONE = object()
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process in bytes
+
+    Uses getrusage on Unix (ru_maxrss is KB on Linux, bytes on macOS) and
+    the peak working set from GetProcessMemoryInfo on Windows.
+    """
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        get_memory_info = ctypes.windll.psapi.GetProcessMemoryInfo
+        get_memory_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS),
+                                    wintypes.DWORD]
+        current_process = ctypes.windll.kernel32.GetCurrentProcess
+        current_process.restype = wintypes.HANDLE
+        if not get_memory_info(current_process(), ctypes.byref(counters), counters.cb):
+            return 0
+        return counters.PeakWorkingSetSize
+
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StreamingETL:
+    """Producer-consumer pipeline from AgriDataCleaner into AgriDataLoader
+
+    A producer thread runs the cleaning stages chunk by chunk and puts each
+    cleaned chunk on a bounded queue; the main thread upserts new dimension
+    members and appends facts as chunks arrive. At most `queue_size` cleaned
+    chunks are held in memory, and the intermediate CSV is only written when
+    `write_csv` is set.
+    """
+
+    def __init__(self, input_path, db_config, output_dir='data/processed',
+                 chunk_size=50000, queue_size=4, write_csv=False, cube_dir=None, rollups=False):
+        self.cleaner = AgriDataCleaner(input_path, output_dir)
+        self.loader = AgriDataLoader(**db_config)
+        self.chunk_size = chunk_size
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.write_csv = write_csv
+        self.csv_path = os.path.join(output_dir, 'agri_data_cleaned.csv')
+        self.cube = CubeBuilder() if cube_dir or rollups else None
+        self.cube_dir = cube_dir
+        self.rollups = rollups
+        self.error = None
+        self.stats = {'chunks': 0, 'rows': 0, 'clean_seconds': 0.0, 'load_seconds': 0.0,
+                      'peak_chunk_bytes': 0, 'total_clean_bytes': 0}
+
+    def _produce(self):
+        """Clean chunks on a worker thread and hand them to the loader"""
+        try:
+            started = time.perf_counter()
+            for i, chunk in enumerate(self.cleaner.iter_clean_chunks(self.chunk_size)):
+                if self.write_csv:
+                    chunk.to_csv(self.csv_path, mode='w' if i == 0 else 'a',
+                                 header=(i == 0), index=False)
+                if self.cube is not None:
+                    self.cube.update(chunk)
+                nbytes = int(chunk.memory_usage(deep=True).sum())
+                self.stats['peak_chunk_bytes'] = max(self.stats['peak_chunk_bytes'], nbytes)
+                self.stats['total_clean_bytes'] += nbytes
+                self.stats['clean_seconds'] += time.perf_counter() - started
+                self.queue.put(chunk)
+                started = time.perf_counter()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.queue.put(_DONE)
+
+    def _consume(self):
+        """Load chunks as they arrive"""
+        state_ids, district_ids, years = {}, {}, set()
+        while True:
+            chunk = self.queue.get()
+            if chunk is _DONE:
+                break
+            started = time.perf_counter()
+            self.loader.load_dimension_chunk(chunk, state_ids, district_ids, years)
+            self.stats['rows'] += self.loader.load_fact_chunk(chunk, district_ids)
+            self.stats['chunks'] += 1
+            self.stats['load_seconds'] += time.perf_counter() - started
+            logging.info(f"Loaded chunk {self.stats['chunks']} ({self.stats['rows']:,} rows)")
+
+    def run(self):
+        """Run the combined clean-and-load pipeline"""
+        logging.info("Starting streaming ETL pipeline...")
+        wall_started = time.perf_counter()
+        try:
+            self.loader.create_database()
+            if not self.loader.connect():
+                raise Exception("Failed to connect to database")
+            self.loader.create_tables()
+
+            producer = threading.Thread(target=self._produce, name='agri-clean', daemon=True)
+            producer.start()
+            self._consume()
+            producer.join()
+            if self.error is not None:
+                raise self.error
+
+            self.cleaner.save_cleaning_report()
+            self.loader.verify_data_load()
+            
+            if self.cube is not None:
+                cube = self.cube.build()
+                if self.cube_dir:
+                    write_cube(cube, self.cube_dir, os.path.basename(self.cleaner.input_path),
+                               self.cube.source_rows)
+                if self.rollups:
+                    write_rollups(cube, self.loader.engine)
+            self.loader.remap_forecasts()
+            self.loader.bump_data_version()
+        finally:
+            self.stats['wall_seconds'] = time.perf_counter() - wall_started
+            self.stats['peak_rss_bytes'] = peak_rss_bytes()
+            self.loader.close()
+
+        logging.info("Streaming ETL pipeline completed successfully!")
+        return self.stats
+
+    def report(self):
+        """Print timing and memory figures for the run"""
+        s = self.stats
+        mb = 1024 * 1024
+        print("\n" + "="*60)
+        print("STREAMING ETL SUMMARY")
+        print("="*60)
+        print(f"Rows loaded:           {s['rows']:,} in {s['chunks']} chunks")
+        print(f"Cleaning time:         {s['clean_seconds']:.2f}s (producer thread)")
+        print(f"Loading time:          {s['load_seconds']:.2f}s (consumer)")
+        print(f"Wall time:             {s['wall_seconds']:.2f}s "
+              f"(saved {s['clean_seconds'] + s['load_seconds'] - s['wall_seconds']:.2f}s by overlap)")
+        print(f"Peak RSS:              {s['peak_rss_bytes'] / mb:,.1f} MB")
+        print(f"Largest cleaned chunk: {s['peak_chunk_bytes'] / mb:,.1f} MB")
+        print(f"Full cleaned dataset:  {s['total_clean_bytes'] / mb:,.1f} MB "
+              "(held in memory twice by the two-step pipeline)")
+        if not self.write_csv:
+            print("Intermediate CSV:      skipped (no serialize/parse round trip)")
+
+
+def run_two_step(input_path, db_config, output_dir):
+    """Run the original clean-to-CSV then load-from-CSV pipeline for comparison"""
+    started = time.perf_counter()
+    cleaner = AgriDataCleaner(input_path, output_dir)
+    cleaner.run_pipeline()
+    AgriDataLoader(**db_config).run_pipeline(os.path.join(output_dir, 'agri_data_cleaned.csv'))
+    return {'wall_seconds': time.perf_counter() - started, 'peak_rss_bytes': peak_rss_bytes()}
+
+
+def compare_two_step(input_path, db_config, output_dir):
+    """Run the two-step pipeline in a fresh process so its peak RSS is measured on its own"""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(run_two_step, input_path, db_config, output_dir).result()
+
+
+# Main execution
+if __name__ == "__main__":
+    setup_logging()
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+
+    parser = argparse.ArgumentParser(description='Clean and load AgriData in one streaming pass')
+    parser.add_argument('--input', default=os.path.join(project_root, 'data', 'raw',
+                                                        'icrisat_district_data.csv'))
+    parser.add_argument('--output-dir', default=os.path.join(project_root, 'data', 'processed'))
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--queue-size', type=int, default=4)
+    parser.add_argument('--write-csv', action='store_true',
+                        help='also write the cleaned CSV for the notebooks/Power BI')
+    parser.add_argument('--cube-dir', default=os.path.join(project_root, 'data', 'cube'),
+                        help='pre-aggregated cube export for Power BI')
+    parser.add_argument('--no-cube', action='store_true', help='skip the cube export')
+    parser.add_argument('--rollups', action='store_true',
+                        help='also write agg_state_year/agg_state_decade rollup tables')
+    parser.add_argument('--compare', action='store_true',
+                        help='also run the two-step pipeline and report the difference')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--database', default='agridata_db')
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default=os.environ.get('MYSQL_PASSWORD', ''))
+    args = parser.parse_args()
+
+    DB_CONFIG = {'host': args.host, 'database': args.database,
+                 'user': args.user, 'password': args.password}
+
+    etl = StreamingETL(args.input, DB_CONFIG, args.output_dir, args.chunk_size,
+                       args.queue_size, args.write_csv,
+                       cube_dir=None if args.no_cube else args.cube_dir, rollups=args.rollups)
+    etl.run()
+    etl.report()
+
+    if args.compare:
+        baseline = compare_two_step(args.input, DB_CONFIG, args.output_dir)
+        mb = 1024 * 1024
+        print(f"\nTwo-step pipeline:     {baseline['wall_seconds']:.2f}s, "
+              f"peak RSS {baseline['peak_rss_bytes'] / mb:,.1f} MB")
+        print(f"Streaming saved:       {baseline['wall_seconds'] - etl.stats['wall_seconds']:.2f}s, "
+              f"{(baseline['peak_rss_bytes'] - etl.stats['peak_rss_bytes']) / mb:,.1f} MB peak RSS")
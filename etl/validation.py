@@ -0,0 +1,225 @@
+"""
+AgriData Explorer - Data Quality Validation
+File: etl/validation.py
+Purpose: Declarative consistency rules for the cleaned crop measures,
+         evaluated for every crop at once as vectorized masks, with
+         per-rule counts/samples and quarantine of failing rows
+"""
+
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+MEASURE = re.compile(r'^(?P<crop>.+)_(?P<measure>area_1000_ha|production_1000_tons|yield_kg_per_ha)$')
+
+# ICRISAT marks "not available" with -1
+SENTINEL = -1.0
+
+# Area and production are stored in thousands to 2 decimals, so each
+# stored value is within half a unit of this step of the true figure
+STORED_PRECISION = 0.01
+
+# Severity of a rule decides what happens to the rows it flags:
+#   quarantine - row is removed from the cleaned data and written to the quarantine file
+#   repair     - flagged cells are set to 0, like missing values in handle_missing_values,
+#                or, for crop rules with a ``repair`` function, to the value it returns
+#   warn       - counted and sampled only
+SEVERITIES = ('quarantine', 'repair', 'warn')
+
+# scope 'values' tests every measure column; scope 'crop' tests aligned
+# (rows x crops) area/production/yield matrices for crops that have all three.
+# A crop rule's ``repair`` returns (measure, rows x crops replacement values)
+Rule = namedtuple('Rule', ['name', 'severity', 'scope', 'description', 'test', 'repair'],
+                  defaults=(None,))
+
+
+RULES = [
+    Rule('sentinel_value', 'repair', 'values',
+         'value is the -1 "not available" sentinel',
+         lambda m: m.values == SENTINEL),
+    Rule('negative_value', 'quarantine', 'values',
+         'negative area, production or yield (other than the -1 sentinel)',
+         lambda m: (m.values < 0) & (m.values != SENTINEL)),
+    Rule('production_without_area', 'warn', 'crop',
+         'production reported on zero cultivated area',
+         lambda m: (m.production > 0) & (m.area == 0)),
+    Rule('area_without_production', 'warn', 'crop',
+         'area cultivated but zero production (possible crop failure)',
+         lambda m: (m.area > 0) & (m.production == 0)),
+    Rule('yield_mismatch', 'repair', 'crop',
+         'reported yield outside the range production / area * 1000 allows at the stored '
+         'precision (plus tolerance), including a missing (0 or -1) yield; yield recomputed '
+         'from production and area',
+         lambda m: (m.area > 0) & (m.production > 0)
+         & ((m.yield_ < m.yield_low) | (m.yield_ > m.yield_high)),
+         lambda m: ('yield', np.round(m.expected_yield, 2))),
+]
+
+
+class _Measures:
+    """Column matrices the rule tests operate on"""
+
+    def __init__(self, df, value_cols, crops, rel_tol, abs_tol, precision):
+        # Column-major so filtered rows can become a DataFrame block without a copy
+        self.values = np.empty((len(df), len(value_cols)), order='F')
+        for j, col in enumerate(value_cols):
+            self.values[:, j] = df[col].to_numpy(dtype=np.float64)
+        self.positions = {col: i for i, col in enumerate(value_cols)}
+        self.area = self.values[:, [self.positions[c['area']] for c in crops.values()]]
+        self.production = self.values[:, [self.positions[c['production']] for c in crops.values()]]
+        self.yield_ = self.values[:, [self.positions[c['yield']] for c in crops.values()]]
+        # Bounds of production / area * 1000 over every true area and
+        # production that rounds to the stored values, widened by the tolerance
+        half = precision / 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.expected_yield = self.production / self.area * 1000
+            low = (self.production - half) / (self.area + half) * 1000
+            high = np.where(self.area > half, (self.production + half) / (self.area - half) * 1000,
+                            np.inf)
+        self.yield_low = np.maximum(low, 0) * (1 - rel_tol) - abs_tol
+        self.yield_high = high * (1 + rel_tol) + abs_tol
+
+
+class RecordValidator:
+    """Evaluate RULES over cleaned frames and accumulate a validation report
+
+    Each rule runs once per frame on a (rows x columns) matrix covering
+    every crop, so the cost is a handful of array comparisons regardless
+    of the crop count. ``apply`` can be called once or per chunk; counts
+    and samples accumulate until ``reset``.
+    """
+
+    def __init__(self, rules=RULES, rel_tol=0.05, abs_tol=1.0, precision=STORED_PRECISION,
+                 sample_size=5, id_columns=('state_name', 'district_name', 'year')):
+        for rule in rules:
+            if rule.severity not in SEVERITIES:
+                raise ValueError(f"Unknown severity {rule.severity!r} for rule {rule.name}")
+        self.rules = list(rules)
+        self.rel_tol = rel_tol
+        self.abs_tol = abs_tol
+        self.precision = precision
+        self.sample_size = sample_size
+        self.id_columns = list(id_columns)
+        self.reset()
+
+    def reset(self):
+        self.counts = {rule.name: {'rows': 0, 'cells': 0} for rule in self.rules}
+        self.samples = {rule.name: [] for rule in self.rules}
+        self.rows_checked = 0
+        self.rows_quarantined = 0
+        self.cells_repaired = 0
+
+    @staticmethod
+    def measure_columns(columns):
+        """Numeric crop measure columns and {crop: {area, production, yield}} triples"""
+        value_cols, crops = [], {}
+        for col in columns:
+            match = MEASURE.match(col)
+            if match:
+                value_cols.append(col)
+                crops.setdefault(match.group('crop'), {})[match.group('measure').split('_')[0]] = col
+        crops = {crop: cols for crop, cols in crops.items() if len(cols) == 3}
+        return value_cols, crops
+
+    def _sample(self, rule, df, mask, labels):
+        room = self.sample_size - len(self.samples[rule.name])
+        if room <= 0:
+            return
+        rows = np.flatnonzero(mask.any(axis=1))[:room]
+        ids = [c for c in self.id_columns if c in df.columns]
+        for row in rows:
+            record = {c: df[c].iat[row] for c in ids}
+            record = {k: (v.item() if hasattr(v, 'item') else v) for k, v in record.items()}
+            record['columns'] = [labels[j] for j in np.flatnonzero(mask[row])]
+            self.samples[rule.name].append(record)
+
+    def apply(self, df):
+        """Return (valid rows, quarantined rows with a failed_rules column)
+
+        Repair rules are applied to the returned valid rows; quarantined
+        rows are written out as they were received.
+        """
+        value_cols, crops = self.measure_columns(df.columns)
+        self.rows_checked += len(df)
+        if not value_cols or df.empty:
+            return df, df.iloc[:0]
+
+        m = _Measures(df, value_cols, crops, self.rel_tol, self.abs_tol, self.precision)
+        quarantine = np.zeros(len(df), dtype=bool)
+        repair = np.zeros(m.values.shape, dtype=bool)
+        replacement = np.zeros(m.values.shape)
+        failed = []
+        for rule in self.rules:
+            if rule.scope == 'crop' and not crops:
+                continue
+            mask = rule.test(m)
+            labels = value_cols if rule.scope == 'values' else list(crops)
+            rows = mask.any(axis=1)
+            self.counts[rule.name]['rows'] += int(rows.sum())
+            self.counts[rule.name]['cells'] += int(mask.sum())
+            if rows.any():
+                self._sample(rule, df, mask, labels)
+            if rule.severity == 'quarantine':
+                quarantine |= rows
+                failed.append((rule.name, rows))
+            elif rule.severity == 'repair' and rule.scope == 'values':
+                repair |= mask
+                replacement[mask] = 0
+            elif rule.severity == 'repair' and rule.repair is not None:
+                measure, fixed = rule.repair(m)
+                columns = np.array([m.positions[cols[measure]] for cols in crops.values()])
+                rows_hit, crops_hit = np.nonzero(mask)
+                repair[rows_hit, columns[crops_hit]] = True
+                replacement[rows_hit, columns[crops_hit]] = fixed[rows_hit, crops_hit]
+
+        keep = ~quarantine
+        quarantined = df.iloc[:0]
+        if quarantine.any():
+            names = np.array([name for name, _ in failed], dtype=object)
+            hits = np.column_stack([rows[quarantine] for _, rows in failed])
+            quarantined = df[quarantine].assign(failed_rules=[';'.join(names[h]) for h in hits])
+            self.rows_quarantined += len(quarantined)
+
+        if not repair.any():
+            valid = df[keep] if quarantine.any() else df
+        else:
+            # Rebuild the measures as one float block instead of assigning
+            # each repaired column back into the frame
+            values = m.values.T[:, keep].T
+            repaired = repair[keep]
+            self.cells_repaired += int(repaired.sum())
+            values[repaired] = replacement[keep][repaired]
+            others = [c for c in df.columns if c not in m.positions]
+            measures = pd.DataFrame(values, index=df.index[keep], columns=value_cols, copy=False)
+            valid = pd.concat([df.loc[keep, others], measures], axis=1)[df.columns]
+        return valid, quarantined
+
+    def report(self):
+        """Scalar totals for cleaning_report"""
+        report = {
+            'records_validated': self.rows_checked,
+            'records_quarantined': self.rows_quarantined,
+            'cells_repaired': self.cells_repaired,
+        }
+        for rule in self.rules:
+            report[f'rule_{rule.name}'] = (f"{self.counts[rule.name]['rows']} rows, "
+                                           f"{self.counts[rule.name]['cells']} cells ({rule.severity})")
+        return report
+
+    def write_report(self, f):
+        """Write the per-rule descriptions and sample rows to an open report file"""
+        f.write("\nValidation Rules\n")
+        f.write("-"*50 + "\n")
+        for rule in self.rules:
+            counts = self.counts[rule.name]
+            f.write(f"{rule.name} [{rule.severity}]: {counts['rows']} rows, "
+                    f"{counts['cells']} cells - {rule.description}\n")
+            for sample in self.samples[rule.name]:
+                f.write(f"    {sample}\n")
+
+
+def write_quarantine(frame, path, append=False):
+    """Append quarantined rows to the quarantine CSV (header on first write)"""
+    frame.to_csv(path, mode='a' if append else 'w', header=not append, index=False)
@@ -6,6 +6,8 @@ CREATE DATABASE IF NOT EXISTS agridata_db;
 USE agridata_db;
 
 -- Drop existing tables (for clean setup)
+DROP TABLE IF EXISTS etl_load_checkpoint;
+DROP TABLE IF EXISTS fact_yield_forecast;
 DROP TABLE IF EXISTS fact_production;
 DROP TABLE IF EXISTS dim_district;
 DROP TABLE IF EXISTS dim_state;
@@ -166,12 +168,62 @@ CREATE TABLE fact_production (
     FOREIGN KEY (district_id) REFERENCES dim_district(district_id),
     FOREIGN KEY (year_id) REFERENCES dim_year(year_id),
     
-    INDEX idx_district_year (district_id, year_id),
+    UNIQUE KEY uq_district_year (district_id, year_id),  -- one row per district-year; upsert key
     INDEX idx_year (year_id),
     INDEX idx_rice_production (rice_production),
     INDEX idx_wheat_production (wheat_production)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- Next-season yield forecasts per district and crop (analysis/forecast.py,
+-- loaded by etl/load_to_sql.py --forecasts; kept across reloads, with
+-- district_id re-resolved from the names after dim_district is rebuilt)
+CREATE TABLE fact_yield_forecast (
+    forecast_id INT PRIMARY KEY AUTO_INCREMENT,
+    district_id INT NOT NULL,              -- dim_district.district_id
+    state_name VARCHAR(100) NOT NULL,
+    district_name VARCHAR(100) NOT NULL,
+    crop VARCHAR(50) NOT NULL,
+    forecast_year INT NOT NULL,
+    yield_forecast DECIMAL(12,2),          -- Kg per ha
+    yield_lower DECIMAL(12,2),             -- prediction interval bounds
+    yield_upper DECIMAL(12,2),
+    trend_per_year DECIMAL(12,4),          -- fitted Kg per ha change per year
+    n_years INT,                           -- observed years in the fit
+    last_year INT,                         -- last observed year of the series
+    method VARCHAR(10),                    -- 'ols' or 'huber'
+    interval_level DECIMAL(4,3),
+    
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    UNIQUE KEY uq_district_crop_year (state_name, district_name, crop, forecast_year),
+    INDEX idx_district_id (district_id),
+    INDEX idx_crop_year (crop, forecast_year)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- ============================================================================
+-- ETL CONTROL TABLES
+-- ============================================================================
+
+-- One row per fact chunk committed by a resumable load (etl/load_to_sql.py --resume)
+CREATE TABLE etl_load_checkpoint (
+    load_id VARCHAR(64) NOT NULL,
+    chunk_id INT NOT NULL,
+    row_start INT NOT NULL,
+    row_end INT NOT NULL,
+    content_hash CHAR(40) NOT NULL,
+    committed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (load_id, chunk_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Single-row data version, bumped by every successful load and never dropped
+-- (analysis/query_gateway.py keys cached query results on it)
+CREATE TABLE IF NOT EXISTS etl_data_version (
+    id TINYINT PRIMARY KEY,
+    version BIGINT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
 -- ============================================================================
 -- VIEWS FOR COMMON QUERIES
 -- ============================================================================
@@ -0,0 +1,12 @@
+"""
+AgriData Explorer - Test Configuration
+File: tests/conftest.py
+Purpose: Put analysis/ and etl/ on sys.path the way their scripts run
+"""
+
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ('analysis', 'etl'):
+    sys.path.insert(0, os.path.join(PROJECT_ROOT, directory))
@@ -0,0 +1,59 @@
+"""
+AgriData Explorer - Analytics Service Tests
+File: tests/test_analytics_service.py
+Purpose: Bad query parameters are client errors (400), not server errors
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics_service import UNMATCHED_ROUTE, AnalyticsService, HTTPError, route_name
+
+
+@pytest.fixture(scope='module')
+def service(tmp_path_factory):
+    rng = np.random.default_rng(4)
+    rows = [(state, f'{state} {d}', f'{state[0]}{d}', year)
+            for state in ('Bihar', 'Punjab') for d in range(3) for year in range(2000, 2010)]
+    df = pd.DataFrame(rows, columns=['state_name', 'district_name', 'district_code', 'year'])
+    for crop in ('rice', 'wheat', 'oilseeds'):
+        df[f'{crop}_area_1000_ha'] = rng.uniform(1, 100, len(df))
+        df[f'{crop}_production_1000_tons'] = rng.uniform(1, 300, len(df))
+        df[f'{crop}_yield_kg_per_ha'] = rng.uniform(800, 3000, len(df))
+    path = tmp_path_factory.mktemp('data') / 'cleaned.csv'
+    df.to_csv(path, index=False)
+    service = AnalyticsService(str(path))
+    yield service
+    service.executor.shutdown()
+
+
+@pytest.mark.parametrize('path, params, message', [
+    ('/queries/top_states_by_crop',
+     {'crop_name': 'saffron', 'top_n_states': 3, 'start_year': 2000, 'end_year': 2005},
+     "crop 'saffron'"),
+    ('/queries/q3', {'window': 50}, 'outside 2000-2009'),
+    ('/queries/q1', {'limit': 3}, 'unexpected keyword'),
+    ('/aggregate', {'by': 'state_name', 'column': 'rice_area_1000_ha', 'agg': 'bogus'},
+     "Unknown agg 'bogus'"),
+])
+def test_bad_query_parameters_are_400(service, path, params, message):
+    with pytest.raises(HTTPError) as error:
+        service.compute(path, params)
+    assert error.value.status == 400
+    assert message in str(error.value)
+
+
+def test_valid_query_still_answers(service):
+    body = service.compute('/queries/top_states_by_crop',
+                           {'crop_name': 'rice', 'top_n_states': 2, 'start_year': 2000,
+                            'end_year': 2005})
+    assert body.startswith(b'[')
+
+
+def test_latency_is_kept_per_route():
+    assert route_name('/queries/q6') == '/queries/q6'
+    assert route_name('/eda/eda_7/') == '/eda/eda_7'
+    assert route_name('/aggregate') == '/aggregate'
+    for path in ('/queries/nope', '/eda/q1', '/favicon.ico', '/a/b/c'):
+        assert route_name(path) == UNMATCHED_ROUTE
@@ -0,0 +1,42 @@
+"""
+AgriData Explorer - Aggregation Cache Tests
+File: tests/test_caching.py
+Purpose: Cached aggregations must match pandas groupby, including NaN keys,
+         and the hit rate must count only result lookups
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from caching import AggregationCache
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'state_name': ['A', 'B', np.nan, 'B', 'A', np.nan],
+        'year': [2000, 2000, 2000, 2001, 2001, 2001],
+        'rice': [1.0, 2.0, 3.0, np.nan, 5.0, 6.0],
+    })
+
+
+@pytest.mark.parametrize('aggfunc', ['sum', 'count', 'mean', 'max'])
+def test_nan_group_keys_are_dropped_like_pandas(df, aggfunc):
+    cache = AggregationCache(df)
+    expected = df.groupby('state_name')['rice'].agg(aggfunc)
+    pd.testing.assert_series_equal(cache.aggregate('state_name', 'rice', aggfunc), expected,
+                                   check_names=False)
+
+    filtered = cache.aggregate('state_name', 'rice', aggfunc, where={'year': 2001})
+    expected = df[df['year'] == 2001].groupby('state_name')['rice'].agg(aggfunc)
+    pd.testing.assert_series_equal(filtered, expected, check_names=False)
+
+
+def test_hit_rate_counts_only_results(df):
+    cache = AggregationCache(df)
+    cache.aggregate('state_name', 'rice')
+    cache.aggregate('state_name', 'rice', 'mean')
+    cache.aggregate('state_name', 'rice')
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
@@ -0,0 +1,43 @@
+"""
+AgriData Explorer - Geographic Index Tests
+File: tests/test_geo_index.py
+Purpose: Rows with NaN region, state or district labels must not be filed
+         under a real member
+"""
+
+import numpy as np
+import pandas as pd
+
+from caching import AggregationCache
+from geo_index import GeoIndex
+
+
+def frame():
+    return pd.DataFrame({
+        'region': ['North', 'North', np.nan, 'North', 'South', 'South'],
+        'state_name': ['A', 'B', np.nan, 'B', 'C', 'C'],
+        'district_name': ['x', 'y', 'z', np.nan, 'w', 'v'],
+        'rice': [1.0, 2.0, 4.0, 8.0, 16.0, 32.0],
+    })
+
+
+def test_nan_labels_have_no_range():
+    index = GeoIndex(frame())
+    assert index.members('state') == ['A', 'B', 'C']
+    assert index.members('district') == [('A', 'x'), ('B', 'y'), ('C', 'v'), ('C', 'w')]
+    assert index.rows('state', 'B').tolist() == [1, 3]
+    assert index.rows('district', ('B', 'y')).tolist() == [1]
+
+
+def test_rollups_and_filters_match_pandas():
+    df = frame()
+    index = GeoIndex(df)
+    for level, keys in (('region', 'region'), ('state', 'state_name'),
+                        ('district', ['state_name', 'district_name'])):
+        pd.testing.assert_series_equal(index.rollup('rice', level), df.groupby(keys)['rice'].sum(),
+                                       check_names=False)
+
+    cache = AggregationCache(df, geo_index=index)
+    result = cache.aggregate('district_name', 'rice', where={'state_name': 'B'})
+    expected = df[df['state_name'] == 'B'].groupby('district_name')['rice'].sum()
+    pd.testing.assert_series_equal(result, expected, check_names=False)
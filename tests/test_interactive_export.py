@@ -0,0 +1,39 @@
+"""
+AgriData Explorer - Interactive Export Tests
+File: tests/test_interactive_export.py
+Purpose: Every scatter mode of the area-vs-production chart gets titled axes
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import comprehensive_eda
+from interactive_export import InteractiveExporter
+
+
+@pytest.mark.parametrize('scatter_mode', ['density', 'lttb'])
+def test_area_vs_production_axes_titled(tmp_path, scatter_mode):
+    rng = np.random.default_rng(2)
+    rows = 200
+    df = pd.DataFrame({
+        'year': rng.integers(1990, 2010, rows),
+        'state_name': rng.choice(['Bihar', 'Punjab'], rows),
+        'district_name': [f'D{i}' for i in range(rows)],
+    })
+    for crop in ('rice', 'wheat', 'maize'):
+        df[f'{crop}_area_1000_ha'] = rng.uniform(1, 100, rows)
+        df[f'{crop}_production_1000_tons'] = df[f'{crop}_area_1000_ha'] * rng.uniform(1, 3, rows)
+        df[f'{crop}_yield_kg_per_ha'] = df[f'{crop}_production_1000_tons'] / df[f'{crop}_area_1000_ha'] * 1000
+    path = tmp_path / 'data.csv'
+    df.to_csv(path, index=False)
+
+    visualizer = comprehensive_eda.AgriEDAVisualizer(str(path))
+    exporter = InteractiveExporter(visualizer, output_dir=str(tmp_path), max_points=50,
+                                   scatter_mode=scatter_mode)
+    fig = exporter.area_vs_production()
+
+    assert len(fig.data) == 3
+    for i in ('', '2', '3'):
+        assert fig.layout[f'xaxis{i}'].title.text == 'Area (1000 ha)'
+        assert fig.layout[f'yaxis{i}'].title.text == 'Production (1000 tons)'
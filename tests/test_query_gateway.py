@@ -0,0 +1,77 @@
+"""
+AgriData Explorer - Query Gateway Tests
+File: tests/test_query_gateway.py
+Purpose: Data-version reads must tell a pre-versioning warehouse from an
+         unreachable one, and answers of a replaced version are not cached
+"""
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from query_gateway import QueryGateway
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'warehouse.db'}")
+    yield engine
+    engine.dispose()
+
+
+def set_version(engine, version):
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE IF NOT EXISTS etl_data_version "
+                                "(id INTEGER PRIMARY KEY, version INTEGER NOT NULL)"))
+        connection.execute(text("INSERT OR REPLACE INTO etl_data_version VALUES (1, :v)"),
+                           {'v': version})
+
+
+def fail_connect(*args, **kwargs):
+    raise OperationalError("SELECT version FROM etl_data_version", {}, Exception("connection lost"))
+
+
+def test_missing_version_table_reads_as_zero(engine):
+    gateway = QueryGateway(engine=engine)
+    assert gateway.data_version() == 0
+    set_version(engine, 4)
+    assert gateway.data_version(refresh=True) == 4
+    assert gateway.invalidations == 1
+
+
+def test_outage_keeps_last_version_and_cache(engine, monkeypatch):
+    set_version(engine, 3)
+    gateway = QueryGateway(engine=engine)
+    key = ('q1', (), gateway.data_version())
+    gateway.cache.put(key, pd.DataFrame({'value': [1.0]}))
+
+    monkeypatch.setattr(engine, 'connect', fail_connect)
+    assert gateway.data_version(refresh=True) == 3
+    assert gateway.cache.get(key) is not None
+    assert gateway.stats()['invalidations'] == 0
+    assert gateway.stats()['version_errors'] == 1
+
+
+def test_outage_before_first_read_raises(engine, monkeypatch):
+    gateway = QueryGateway(engine=engine)
+    monkeypatch.setattr(engine, 'connect', fail_connect)
+    with pytest.raises(OperationalError):
+        gateway.data_version()
+
+
+def test_result_of_an_outdated_flight_is_not_cached(engine, monkeypatch):
+    set_version(engine, 1)
+    gateway = QueryGateway(engine=engine, version_ttl=0)
+    execute = gateway._execute
+
+    def execute_during_load(sql, params):
+        result = execute(sql, params)
+        set_version(engine, 2)
+        gateway.data_version(refresh=True)
+        return result
+
+    monkeypatch.setattr(gateway, '_execute', execute_during_load)
+    result = gateway._fetch('q', 'SELECT 1 AS value', {})
+    assert result['value'].tolist() == [1]
+    assert len(gateway.cache) == 0 and not gateway._inflight
@@ -0,0 +1,64 @@
+"""
+AgriData Explorer - Query Layer Tests
+File: tests/test_query_layer.py
+Purpose: Cube-based queries must return the same numbers as their SQL
+         versions, and growth windows must stay inside the data
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from query_layer import AgriQueries
+from timeseries import DistrictTimeSeries
+
+
+@pytest.fixture
+def df():
+    rows = [(state, f'{state} {d}', year)
+            for state in ('Bihar', 'Punjab') for d in range(2) for year in range(2010, 2021)]
+    df = pd.DataFrame(rows, columns=['state_name', 'district_name', 'year'])
+    step = np.arange(len(df))
+    df['wheat_yield_kg_per_ha'] = 1000.0 + step * 123.45
+    df['oilseeds_production_1000_tons'] = 10.0 + step * 0.37
+    df['cotton_production_1000_tons'] = 5.0 + step * 1.11
+    return df
+
+
+def test_cagr_window_longer_than_the_series_is_rejected(df):
+    ts = DistrictTimeSeries(df, crops=['wheat'], measure='yield')
+    assert np.isfinite(ts.cagr(window=10)).all()
+    for window in (11, 0):
+        with pytest.raises(ValueError):
+            ts.cagr(window=window)
+
+
+def test_cube_queries_match_exact_arithmetic(df):
+    queries = AgriQueries(df)
+    q2 = queries.wheat_yield_increase_districts()
+    expected = df[df['year'] == 2020].set_index('district_name')['wheat_yield_kg_per_ha'] \
+        - df[df['year'] == 2015].set_index('district_name')['wheat_yield_kg_per_ha']
+    assert (q2.set_index('district_name')['yield_increase']
+            == expected.reindex(q2['district_name'])).all()
+
+    q3 = queries.oilseed_growth_states()
+    recent = df[df['year'] > 2015].groupby('state_name')['oilseeds_production_1000_tons'].sum()
+    assert (q3.set_index('state_name')['recent_5yr_production']
+            == recent.reindex(q3['state_name'])).all()
+
+    q5 = queries.cotton_yoy_growth()
+    totals = df.groupby(['state_name', 'year'])['cotton_production_1000_tons'].sum()
+    assert (q5.set_index(['state_name', 'year'])['total_cotton_production']
+            == totals.reindex(pd.MultiIndex.from_frame(q5[['state_name', 'year']]))).all()
+
+
+def test_groundnut_rank_gives_ties_the_same_rank():
+    df = pd.DataFrame({
+        'state_name': ['A'] * 5, 'district_name': list('vwxyz'), 'year': [2020] * 5,
+        'groundnut_area_1000_ha': [1.0] * 5,
+        'groundnut_production_1000_tons': [5.0, 9.0, 5.0, 7.0, 9.0],
+        'groundnut_yield_kg_per_ha': [1000.0] * 5,
+    })
+    result = AgriQueries(df).groundnut_top_districts(n=4)
+    assert result['groundnut_production'].tolist() == [9.0, 9.0, 7.0, 5.0]
+    assert result['production_rank'].tolist() == [1, 1, 3, 4]
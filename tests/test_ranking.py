@@ -0,0 +1,52 @@
+"""
+AgriData Explorer - Ranking Engine Tests
+File: tests/test_ranking.py
+Purpose: top_n_per_group must follow SQL RANK() on ties, and both selection
+         paths of top_n_positions must agree
+"""
+
+import numpy as np
+import pandas as pd
+
+import ranking
+from ranking import top_n_per_group, top_n_positions
+
+
+def test_ties_share_a_rank_and_survive_the_cut():
+    df = pd.DataFrame({
+        'year': [2015] * 5 + [2016] * 3,
+        'state_name': ['A', 'B', 'C', 'D', 'E', 'A', 'B', 'C'],
+        'rice': [50.0, 40.0, 40.0, 30.0, 30.0, 10.0, np.nan, 10.0],
+    })
+    result = top_n_per_group(df, 'year', 'rice', 3)
+
+    # Same rows and ranks as RANK() OVER (PARTITION BY year ORDER BY rice DESC) <= 3
+    expected_rank = df.groupby('year')['rice'].rank(method='min', ascending=False)
+    expected = df[expected_rank <= 3].assign(rank=expected_rank[expected_rank <= 3].astype(int))
+    assert result['state_name'].tolist() == expected['state_name'].tolist()
+    assert result['rank'].tolist() == [1, 2, 2, 1, 1]
+
+
+def test_sorted_path_matches_dense_path():
+    rng = np.random.default_rng(3)
+    values = rng.integers(0, 6, (400, 2)).astype(np.float64)
+    values[rng.random(values.shape) < 0.1] = np.nan
+    codes = rng.integers(0, 12, 400)
+    counts = np.bincount(codes, minlength=12)
+
+    dense = ranking._dense_top_n(values, codes, 4, 12, counts, int(counts.max()))
+    sorted_ = ranking._sorted_top_n(values, codes, 4, 12, counts)
+    np.testing.assert_array_equal(dense, sorted_)
+
+
+def test_one_huge_group_avoids_the_dense_block(monkeypatch):
+    def no_dense(*args):
+        raise AssertionError("dense block used for a skewed grouping")
+
+    monkeypatch.setattr(ranking, '_dense_top_n', no_dense)
+    codes = np.r_[np.zeros(10_000, dtype=np.int64), np.arange(1, 5_001)]
+    values = np.arange(len(codes), dtype=np.float64)
+    positions = top_n_positions(values, codes, 2)
+    assert positions.shape == (5_001, 2)
+    assert positions[0].tolist() == [9_999, 9_998]
+    assert positions[1].tolist() == [10_000, -1]
@@ -0,0 +1,41 @@
+"""
+AgriData Explorer - Rendering Tests
+File: tests/test_rendering.py
+Purpose: Reused figure templates must not carry state from one chart to the next
+"""
+
+import numpy as np
+import pandas as pd
+
+import comprehensive_eda
+
+
+def test_pair_template_reused_after_pie(tmp_path, monkeypatch):
+    """eda_12 reuses eda_2's 'pair' template; the pie's equal aspect must not leak into it"""
+    monkeypatch.setattr(comprehensive_eda, 'OUTPUT_DIR', str(tmp_path))
+    rng = np.random.default_rng(0)
+    states = ['Andhra Pradesh', 'Madhya Pradesh', 'Maharashtra', 'Rajasthan', 'Karnataka', 'Gujarat']
+    df = pd.DataFrame({
+        'year': np.tile([2015, 2016], len(states)),
+        'state_name': np.repeat(states, 2),
+        'district_name': np.repeat([f'D{i}' for i in range(len(states))], 2),
+        'wheat_production_1000_tons': rng.uniform(10, 100, 2 * len(states)),
+        'soybean_production_1000_tons': rng.uniform(10, 100, 2 * len(states)),
+        'soybean_yield_kg_per_ha': rng.uniform(800, 1500, 2 * len(states)),
+    })
+    path = tmp_path / 'data.csv'
+    df.to_csv(path, index=False)
+
+    visualizer = comprehensive_eda.AgriEDAVisualizer(str(path))
+    visualizer.eda_2_top5_wheat_states()
+    visualizer.eda_12_soybean_top5_yield()
+
+    figure = visualizer.renderer.templates['pair']
+    production, yields = figure.axes
+    assert yields.get_aspect() == 'auto'
+    assert yields.get_frame_on()
+    # Both bar panels get the same share of the figure
+    renderer = figure.canvas.get_renderer()
+    widths = [ax.get_window_extent(renderer).width for ax in (production, yields)]
+    assert np.isclose(widths[0], widths[1], rtol=0.05)
+    assert (tmp_path / '12_soybean_top5_yield.png').exists()
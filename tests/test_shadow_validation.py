@@ -0,0 +1,79 @@
+"""
+AgriData Explorer - Shadow Table Validation Tests
+File: tests/test_shadow_validation.py
+Purpose: validate_shadow_tables must catch loads that disagree with the
+         source CSV, leave orphan keys or shrink the live tables
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from load_to_sql import SHADOW_SUFFIX, AgriDataLoader
+
+
+def build_tables(connection, suffix, n_districts=3, years=(2015, 2016), extra_fact=()):
+    """Minimal star schema with one fact row per district-year"""
+    pd.DataFrame({'state_id': [1], 'state_code': ['S1'], 'state_name': ['Punjab']}
+                 ).to_sql(f'dim_state{suffix}', connection, index=False)
+    pd.DataFrame({'district_id': range(1, n_districts + 1), 'state_id': 1}
+                 ).to_sql(f'dim_district{suffix}', connection, index=False)
+    pd.DataFrame({'year_id': list(years)}).to_sql(f'dim_year{suffix}', connection, index=False)
+    fact = [(d, y) for d in range(1, n_districts + 1) for y in years] + list(extra_fact)
+    pd.DataFrame(fact, columns=['district_id', 'year_id']
+                 ).to_sql(f'fact_production{suffix}', connection, index=False)
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    loader = AgriDataLoader()
+    loader.connection = sqlite3.connect(':memory:')
+
+    def existing_tables(cursor):
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        return {row[0] for row in cursor.fetchall()}
+
+    monkeypatch.setattr(loader, '_existing_tables', existing_tables)
+    yield loader
+    loader.connection.close()
+
+
+def source_csv(tmp_path, rows):
+    path = tmp_path / 'cleaned.csv'
+    pd.DataFrame(rows, columns=['district_code', 'year']).to_csv(path, index=False)
+    return AgriDataLoader.source_invariants(path)
+
+
+def test_consistent_shadow_tables_pass(loader, tmp_path):
+    build_tables(loader.connection, SHADOW_SUFFIX)
+    build_tables(loader.connection, '')
+    source = source_csv(tmp_path, [(f'D{d}', y) for d in range(1, 4) for y in (2015, 2016)])
+    loader.validate_shadow_tables(source)
+
+
+def test_duplicated_fact_rows_fail_against_the_source(loader, tmp_path):
+    # A district code mapped to two ids doubles its fact rows
+    build_tables(loader.connection, SHADOW_SUFFIX, extra_fact=[(1, 2015)])
+    source = source_csv(tmp_path, [(f'D{d}', y) for d in range(1, 4) for y in (2015, 2016)])
+    with pytest.raises(ValueError, match='7 rows, source has 6'):
+        loader.validate_shadow_tables(source)
+
+
+def test_orphan_keys_fail(loader, tmp_path):
+    build_tables(loader.connection, SHADOW_SUFFIX, extra_fact=[(9, 2015), (1, 1990)])
+    source = source_csv(tmp_path, [(f'D{d}', y) for d in range(1, 4) for y in (2015, 2016)]
+                        + [('D9', 2015), ('D1', 1990)])
+    with pytest.raises(ValueError) as error:
+        loader.validate_shadow_tables(source)
+    assert 'fact_production.district_id: 1 rows' in str(error.value)
+    assert 'fact_production.year_id: 1 rows' in str(error.value)
+
+
+def test_large_change_from_live_tables_needs_force(loader, tmp_path):
+    build_tables(loader.connection, SHADOW_SUFFIX, n_districts=1)
+    build_tables(loader.connection, '', n_districts=3)
+    source = source_csv(tmp_path, [('D1', 2015), ('D1', 2016)])
+    with pytest.raises(ValueError, match='2 rows versus 6 live'):
+        loader.validate_shadow_tables(source)
+    loader.validate_shadow_tables(source, max_change=None)
@@ -0,0 +1,59 @@
+"""
+AgriData Explorer - Validation Tests
+File: tests/test_validation.py
+Purpose: Data-quality rules flag or repair crop cells without dropping valid rows
+"""
+
+import pandas as pd
+
+from validation import RecordValidator
+
+
+def frame(area, production, yield_, **extra):
+    return pd.DataFrame({
+        'state_name': ['A'] * len(area), 'district_name': ['D'] * len(area),
+        'year': range(2000, 2000 + len(area)),
+        'rice_area_1000_ha': area, 'rice_production_1000_tons': production,
+        'rice_yield_kg_per_ha': yield_,
+        'wheat_area_1000_ha': [1.0] * len(area), 'wheat_production_1000_tons': [2.0] * len(area),
+        'wheat_yield_kg_per_ha': [2000.0] * len(area), **extra,
+    })
+
+
+def test_small_area_rounding_is_not_a_mismatch():
+    # 10 ha and 20 t stored as 0.01 / 0.02: the true yield can be anywhere in ~1000-3000 kg/ha
+    valid, quarantined = RecordValidator().apply(frame([0.01], [0.02], [1400.0]))
+    assert len(valid) == 1 and quarantined.empty
+    assert valid['rice_yield_kg_per_ha'].iat[0] == 1400.0
+
+
+def test_yield_mismatch_repairs_the_cell_and_keeps_the_row():
+    validator = RecordValidator()
+    valid, quarantined = validator.apply(frame([50.0, 40.0], [100.0, 60.0], [500.0, 1500.0]))
+    assert quarantined.empty
+    assert valid['rice_yield_kg_per_ha'].tolist() == [2000.0, 1500.0]
+    # The other crops of the repaired row are untouched
+    assert valid['wheat_production_1000_tons'].tolist() == [2.0, 2.0]
+    assert validator.counts['yield_mismatch'] == {'rows': 1, 'cells': 1}
+    assert validator.cells_repaired == 1
+
+
+def test_production_without_area_is_only_flagged():
+    validator = RecordValidator()
+    valid, quarantined = validator.apply(frame([0.0], [3.0], [0.0]))
+    assert len(valid) == 1 and quarantined.empty
+    assert validator.counts['production_without_area']['cells'] == 1
+
+
+def test_negative_values_are_still_quarantined_and_sentinels_repaired():
+    valid, quarantined = RecordValidator().apply(frame([-5.0, -1.0], [1.0, 1.0], [0.0, 0.0]))
+    assert quarantined['failed_rules'].tolist() == ['negative_value']
+    assert valid['rice_area_1000_ha'].tolist() == [0.0]
+
+
+def test_missing_yield_with_area_and_production_is_recomputed():
+    validator = RecordValidator()
+    valid, quarantined = validator.apply(frame([50.0, 50.0], [100.0, 100.0], [0.0, -1.0]))
+    assert quarantined.empty
+    assert valid['rice_yield_kg_per_ha'].tolist() == [2000.0, 2000.0]
+    assert validator.counts['yield_mismatch'] == {'rows': 2, 'cells': 2}
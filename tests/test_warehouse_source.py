@@ -0,0 +1,108 @@
+"""
+AgriData Explorer - Warehouse Source Tests
+File: tests/test_warehouse_source.py
+Purpose: SQL push-down against a SQLite star schema must match the in-memory
+         EDA path
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+import comprehensive_eda
+from ranking import top_n
+from warehouse_source import WarehouseSource
+
+STATES = ['Bihar', 'Punjab', 'Uttar Pradesh', 'West Bengal']
+YEARS = [2014, 2015, 2016]
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    """(sqlite URL, cleaned-style frame) holding the same rows"""
+    rng = np.random.default_rng(1)
+    districts = pd.DataFrame({
+        'district_id': np.arange(1, 13),
+        'district_code': [f'D{i}' for i in range(1, 13)],
+        'district_name': [f'District {i}' for i in range(1, 13)],
+        'state_id': np.repeat(np.arange(1, 5), 3),
+    })
+    fact = pd.DataFrame({
+        'district_id': np.repeat(districts['district_id'], len(YEARS)),
+        'year_id': np.tile(YEARS, len(districts)),
+    })
+    # Large, nearly constant areas: uncentred moment sums lose all precision here
+    fact['rice_area'] = 1e6 + rng.normal(0, 1, len(fact))
+    fact['rice_production'] = 3 * fact['rice_area'] + rng.normal(0, 1, len(fact))
+    fact['rice_yield'] = rng.uniform(1000, 3000, len(fact))
+    fact['wheat_area'] = rng.uniform(1, 50, len(fact))
+    fact['wheat_production'] = rng.uniform(1, 100, len(fact)).round(0)
+    fact['wheat_yield'] = rng.uniform(1000, 3000, len(fact))
+
+    url = f"sqlite:///{tmp_path / 'warehouse.db'}"
+    engine = create_engine(url)
+    pd.DataFrame({'state_id': np.arange(1, 5), 'state_code': [f'S{i}' for i in range(1, 5)],
+                  'state_name': STATES, 'region': ['East', 'North', 'North', 'East']}
+                 ).to_sql('dim_state', engine, index=False)
+    districts.to_sql('dim_district', engine, index=False)
+    pd.DataFrame({'year_id': YEARS, 'decade': [2010] * 3, 'is_recent': [False, True, True]}
+                 ).to_sql('dim_year', engine, index=False)
+    fact.to_sql('fact_production', engine, index=False)
+    engine.dispose()
+
+    df = fact.merge(districts, on='district_id')
+    df['state_name'] = np.array(STATES)[df['state_id'] - 1]
+    df = df.rename(columns={'year_id': 'year'})
+    for crop in ('rice', 'wheat'):
+        df = df.rename(columns={f'{crop}_area': f'{crop}_area_1000_ha',
+                                f'{crop}_production': f'{crop}_production_1000_tons',
+                                f'{crop}_yield': f'{crop}_yield_kg_per_ha'})
+    return url, df
+
+
+def test_top_n_matches_in_memory_ranking(warehouse):
+    url, df = warehouse
+    source = WarehouseSource(url=url)
+    column = 'wheat_production_1000_tons'
+
+    expected = top_n(df.groupby('state_name')[column].sum(), 3)
+    pd.testing.assert_series_equal(source.top_n('state_name', column, 3), expected)
+
+    in_punjab = df[df['state_name'] == 'Punjab']
+    expected = top_n(in_punjab.groupby('district_name')[column].sum(), 2)
+    result = source.top_n('district_name', column, 2, where={'state_name': 'Punjab'})
+    pd.testing.assert_series_equal(result, expected)
+
+
+def test_correlations_centred_for_large_values(warehouse):
+    url, df = warehouse
+    source = WarehouseSource(url=url)
+    x, y = df['rice_area_1000_ha'], df['rice_production_1000_tons']
+
+    result = source.correlations(['rice'])
+    assert result['rice'] == pytest.approx(np.corrcoef(x, y)[0, 1], rel=1e-9)
+
+    by_state = source.correlations(['rice'], by='state_name')
+    for state, r in by_state['rice'].items():
+        rows = df['state_name'] == state
+        assert r == pytest.approx(np.corrcoef(x[rows], y[rows])[0, 1], rel=1e-9)
+
+
+def test_visualizer_ranks_in_the_warehouse(warehouse, tmp_path, monkeypatch):
+    url, df = warehouse
+    monkeypatch.setattr(comprehensive_eda, 'OUTPUT_DIR', str(tmp_path / 'charts'))
+    calls = []
+    original = WarehouseSource.top_n
+
+    def spy(self, *args, **kwargs):
+        calls.append(args)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(WarehouseSource, 'top_n', spy)
+    visualizer = comprehensive_eda.AgriEDAVisualizer.from_warehouse(url)
+    top7 = visualizer.eda_1_top7_rice_states()
+
+    assert calls == [('state_name', 'rice_production_1000_tons', 7)]
+    expected = top_n(df.groupby('state_name')['rice_production_1000_tons'].sum(), 7)
+    pd.testing.assert_series_equal(top7, expected)